@@ -1,7 +1,16 @@
+from typing import Optional
+
+from autobotAI_cache.backends.async_base import AsyncBaseBackend
+from autobotAI_cache.backends.async_mongo import AsyncMongoDBBackend
+from autobotAI_cache.backends.async_redis import AsyncRedisBackend
 from autobotAI_cache.backends.base import BaseBackend
+from autobotAI_cache.backends.disk import DiskBackend
 from autobotAI_cache.backends.memory import MemoryBackend
 from autobotAI_cache.backends.mongo import MongoDBBackend
+from autobotAI_cache.backends.object_memory import ObjectMemoryBackend
 from autobotAI_cache.backends.redis import RedisBackend
+from autobotAI_cache.backends.shared_memory import SharedMemoryBackend
+from autobotAI_cache.backends.tiered import TieredBackend
 
 
 class BackendRegistry:
@@ -13,9 +22,19 @@ class BackendRegistry:
         "memory": MemoryBackend,
         "redis": RedisBackend,
         "mongo": MongoDBBackend,
+        "shared_memory": SharedMemoryBackend,
+        "disk": DiskBackend,
+        "object_memory": ObjectMemoryBackend,
+        "tiered": TieredBackend,
         # Add more backends here
     }
 
+    # Native asyncio variants, other backends are adapted from their sync instance
+    _async_backends = {
+        "redis": AsyncRedisBackend,
+        "mongo": AsyncMongoDBBackend,
+    }
+
     @classmethod
     def get_backend(cls, backend_name: str) -> BaseBackend:
         """
@@ -28,3 +47,16 @@ class BackendRegistry:
         if backend_name not in cls._backends:
             raise ValueError(f"Backend '{backend_name}' is not registered.")
         return cls._backends[backend_name]
+
+    @classmethod
+    def get_async_backend(cls, backend_name: str) -> Optional[AsyncBaseBackend]:
+        """
+        Returns the class of the native asyncio variant of the specified backend.
+
+        :param backend_name: Name of the backend
+        :return: Class of the asyncio backend, or None if the backend has no native variant
+        :raises ValueError: If the specified backend is not registered
+        """
+        if backend_name not in cls._backends:
+            raise ValueError(f"Backend '{backend_name}' is not registered.")
+        return cls._async_backends.get(backend_name)
@@ -0,0 +1,207 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Optional
+
+from autobotAI_cache.backends.base import BaseBackend
+from autobotAI_cache.core.exceptions import CacheMissError
+from autobotAI_cache.core.models import CacheScope, UserContext
+
+
+class AsyncBaseBackend(ABC):
+    """
+    Abstract base class for asyncio cache backend implementations.
+
+    Mirrors BaseBackend with coroutines, see it for the semantics of every method.
+    """
+
+    # Backends that keep Python objects as they are, callers skip serialization for them
+    stores_objects = False
+    # Backends implementing acquire_lock/release_lock, used to coalesce misses across nodes
+    supports_locks = False
+    # Backends that can be created from the BACKEND_OPTIONS of their sync variant
+    accepts_sync_options = True
+
+    @abstractmethod
+    async def get(self, key: str, collection_name: str = None) -> bytes:
+        """
+        Retrieve a value from the cache by its key.
+
+        :param key: Cache key to look up
+        :param collection_name: Name of the collection to query
+        :return: The cached value as bytes
+        :raises CacheMissError: If the key is not found in the cache
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(
+        self, key: str, value: bytes, ttl: int = None, collection_name: str = None
+    ) -> None:
+        """
+        Store a value in the cache with an optional TTL (Time-To-Live).
+
+        :param key: Cache key to store the value under
+        :param value: Serialized data to cache
+        :param ttl: Time-to-live in seconds. If None, the value will not expire
+        :param collection_name: Name of the collection to store in
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, key: str, collection_name: str = None) -> None:
+        """
+        Delete a value from the cache by its key.
+
+        :param key: Cache key to delete
+        :param collection_name: Name of the collection to delete from
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def clear(
+        self,
+        collection_name: str = None,
+        context: Optional[UserContext] = None,
+        scope: CacheScope = CacheScope.ORGANIZATION.value,
+    ) -> None:
+        """
+        Clear items from the cache, optionally filtered by collection.
+
+        :param collection_name: Name of collection to clear. If None, clears all collections
+        :param context: Optional user context
+        :param scope: Cache scope level (e.g. ORGANIZATION, USER)
+        """
+        raise NotImplementedError
+
+    async def get_many(self, keys: Iterable[str], collection_name: str = None) -> Dict[str, bytes]:
+        """
+        Retrieve several values from the cache at once.
+
+        :param keys: Cache keys to look up
+        :param collection_name: Name of the collection to query
+        :return: Mapping of the found keys to their values, missing and expired keys are left out
+        """
+        found = {}
+        for key in keys:
+            try:
+                found[key] = await self.get(key, collection_name=collection_name)
+            except CacheMissError:
+                pass
+        return found
+
+    async def set_many(
+        self, items: Dict[str, bytes], ttl: int = None, collection_name: str = None
+    ) -> None:
+        """
+        Store several values in the cache at once, all with the same TTL.
+
+        :param items: Mapping of cache keys to serialized values
+        :param ttl: Time-to-live in seconds. If None, the values will not expire
+        :param collection_name: Name of the collection to store in
+        """
+        for key, value in items.items():
+            await self.set(key, value, ttl=ttl, collection_name=collection_name)
+
+    async def delete_many(self, keys: Iterable[str], collection_name: str = None) -> None:
+        """
+        Delete several values from the cache at once, keys that aren't cached are ignored.
+
+        :param keys: Cache keys to delete
+        :param collection_name: Name of the collection to delete from
+        """
+        for key in keys:
+            try:
+                await self.delete(key, collection_name=collection_name)
+            except CacheMissError:
+                pass
+
+    async def acquire_lock(self, key: str, ttl: float, collection_name: str = None) -> Optional[str]:
+        """
+        Try to take a lease on a key, shared by every process using the backend.
+
+        :param key: Cache key to lock
+        :param ttl: Seconds after which the lease is released if its holder didn't release it
+        :param collection_name: Name of the collection of the key
+        :return: Token identifying the holder, or None if another holder has the lease
+        """
+        raise NotImplementedError
+
+    async def release_lock(self, key: str, token: str, collection_name: str = None) -> None:
+        """
+        Release a lease taken with acquire_lock, unless it expired and was taken by another holder.
+
+        :param key: Cache key that was locked
+        :param token: Token returned by acquire_lock
+        :param collection_name: Name of the collection of the key
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release connections held by the backend"""
+
+
+class InlineAsyncBackend(AsyncBaseBackend):
+    """
+    Asyncio interface over a sync backend that never waits on I/O, such as the memory backend.
+
+    Operations are called directly on the event loop: they only take short in-process locks,
+    so handing them to a thread would cost more than it saves. Sync and async callers share
+    the same cached data.
+    """
+
+    def __init__(self, backend: BaseBackend):
+        self.backend = backend
+        self.stores_objects = backend.stores_objects
+        self.supports_locks = backend.supports_locks
+
+    async def _call(self, method, *args, **kwargs) -> Any:
+        return method(*args, **kwargs)
+
+    async def get(self, key: str, collection_name: str = None) -> bytes:
+        return await self._call(self.backend.get, key, collection_name=collection_name)
+
+    async def set(
+        self, key: str, value: bytes, ttl: int = None, collection_name: str = None
+    ) -> None:
+        await self._call(self.backend.set, key, value, ttl=ttl, collection_name=collection_name)
+
+    async def delete(self, key: str, collection_name: str = None) -> None:
+        await self._call(self.backend.delete, key, collection_name=collection_name)
+
+    async def clear(
+        self,
+        collection_name: str = None,
+        context: Optional[UserContext] = None,
+        scope: CacheScope = CacheScope.ORGANIZATION.value,
+    ) -> None:
+        await self._call(
+            self.backend.clear, collection_name=collection_name, context=context, scope=scope
+        )
+
+    async def get_many(self, keys: Iterable[str], collection_name: str = None) -> Dict[str, bytes]:
+        return await self._call(self.backend.get_many, list(keys), collection_name=collection_name)
+
+    async def set_many(
+        self, items: Dict[str, bytes], ttl: int = None, collection_name: str = None
+    ) -> None:
+        await self._call(self.backend.set_many, items, ttl=ttl, collection_name=collection_name)
+
+    async def delete_many(self, keys: Iterable[str], collection_name: str = None) -> None:
+        await self._call(self.backend.delete_many, list(keys), collection_name=collection_name)
+
+    async def acquire_lock(self, key: str, ttl: float, collection_name: str = None) -> Optional[str]:
+        return await self._call(self.backend.acquire_lock, key, ttl, collection_name=collection_name)
+
+    async def release_lock(self, key: str, token: str, collection_name: str = None) -> None:
+        await self._call(self.backend.release_lock, key, token, collection_name=collection_name)
+
+
+class ThreadedAsyncBackend(InlineAsyncBackend):
+    """
+    Asyncio interface over a sync backend doing blocking I/O, such as the disk backend.
+
+    Operations run in the default thread pool so they don't stall the event loop.
+    """
+
+    async def _call(self, method, *args, **kwargs) -> Any:
+        return await asyncio.to_thread(method, *args, **kwargs)
@@ -0,0 +1,201 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+
+import pymongo
+from pymongo import AsyncMongoClient, DeleteOne
+from pymongo.asynchronous.collection import AsyncCollection
+
+from autobotAI_cache.backends.async_base import AsyncBaseBackend
+from autobotAI_cache.backends.mongo import INDEXES, LOCKS_COLLECTION, MongoDocumentsMixin
+from autobotAI_cache.core.exceptions import CacheMissError
+from autobotAI_cache.core.models import CacheScope
+
+
+class AsyncMongoDBBackend(MongoDocumentsMixin, AsyncBaseBackend):
+    """
+    Asyncio variant of MongoDBBackend built on pymongo's AsyncMongoClient.
+
+    Documents are stored in the same layout, so sync and async services can share collections.
+    Collections and indexes are ensured once per collection rather than on every call.
+    """
+
+    supports_locks = True
+    # BACKEND_OPTIONS hold a sync MongoClient
+    accepts_sync_options = False
+
+    def __init__(
+        self,
+        mongo_client: AsyncMongoClient,
+        db_name: str = "mongo_memoize",
+        max_entries: Optional[int] = None,
+    ):
+        self.mongo_client = mongo_client
+        self.db_name = db_name
+        self.max_entries = max_entries
+        self._db = mongo_client[db_name]
+        # collection name -> whether it is capped
+        self._ready: Dict[str, bool] = {}
+        self._ready_lock = asyncio.Lock()
+        self._locks_ready = False
+
+    async def _get_collection(self, collection_name: str) -> AsyncCollection:
+        """Collection with its indexes ensured"""
+        if collection_name not in self._ready:
+            async with self._ready_lock:
+                if collection_name not in self._ready:
+                    if collection_name not in await self._db.list_collection_names():
+                        await self._db.create_collection(
+                            collection_name, **self._collection_options()
+                        )
+                    collection = self._db[collection_name]
+                    for keys, options in INDEXES:
+                        await collection.create_index(keys, **options)
+                    options = await collection.options()
+                    self._ready[collection_name] = options.get("capped", False)
+        return self._db[collection_name]
+
+    async def get(self, key: str, collection_name: str) -> Any:
+        collection = await self._get_collection(collection_name)
+        query = self._build_query(key)
+
+        doc = await collection.find_one(query)
+        if not doc:
+            raise CacheMissError(f"Key '{key}' not found")
+
+        if self._is_expired(doc):
+            await collection.delete_one(query)
+            raise CacheMissError(f"Key '{key}' expired")
+
+        return doc["value"]
+
+    async def get_many(self, keys: Iterable[str], collection_name: str) -> Dict[str, Any]:
+        """Fetch several keys with a single $in query on the key hashes"""
+        wanted, query = self._build_many_query(keys)
+        if query is None:
+            return {}
+        collection = await self._get_collection(collection_name)
+
+        docs = await collection.find(query).to_list(None)
+        found, expired_ids = self._collect_many(docs, wanted)
+        if expired_ids:
+            await collection.delete_many({"_id": {"$in": expired_ids}})
+        return {key: value for key, (value, _) in found.items()}
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        collection_name: str = None,
+    ) -> None:
+        collection = await self._get_collection(collection_name)
+        capped = self._ready[collection_name]
+        document = self._build_document(key, value, ttl, datetime.now(timezone.utc))
+        query = self._build_replace_query(document)
+
+        try:
+            # Documents of capped collections can't be replaced by documents of another size
+            if capped:
+                await collection.delete_one(query)
+                await collection.insert_one(document)
+            else:
+                await collection.replace_one(query, document, upsert=True)
+        except pymongo.errors.PyMongoError as e:
+            self._report_write_error(e)
+
+        if self.max_entries is not None and not capped:
+            await self._enforce_max_entries(collection)
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        collection_name: str = None,
+    ) -> None:
+        """Upsert several documents with a single bulk_write, overwriting existing keys"""
+        if not items:
+            return
+        collection = await self._get_collection(collection_name)
+        capped = self._ready[collection_name]
+
+        requests = self._build_writes(items, ttl, datetime.now(timezone.utc), capped)
+        try:
+            await collection.bulk_write(requests, ordered=capped)
+        except pymongo.errors.PyMongoError as e:
+            self._report_write_error(e)
+
+        if self.max_entries is not None and not capped:
+            await self._enforce_max_entries(collection)
+
+    async def _enforce_max_entries(self, collection: AsyncCollection) -> None:
+        try:
+            count = await collection.count_documents({})
+            if count > self.max_entries:
+                oldest_ids = [
+                    doc["_id"]
+                    async for doc in collection.find({}, {"_id": 1})
+                    .sort("created_at", 1)
+                    .limit(count - self.max_entries)
+                ]
+                if oldest_ids:
+                    await collection.delete_many({"_id": {"$in": oldest_ids}})
+        except pymongo.errors.PyMongoError as e:
+            print(f"Error enforcing max entries: {e}")
+
+    async def delete(self, key: str, collection_name: str) -> None:
+        collection = await self._get_collection(collection_name)
+        result = await collection.delete_one(self._build_query(key))
+        if result.deleted_count == 0:
+            raise CacheMissError(f"Key '{key}' not found")
+
+    async def delete_many(self, keys: Iterable[str], collection_name: str = None) -> None:
+        """Delete several keys with a single unordered bulk_write"""
+        requests = [DeleteOne(self._build_query(key)) for key in keys]
+        if not requests:
+            return
+        collection = await self._get_collection(collection_name)
+        await collection.bulk_write(requests, ordered=False)
+
+    async def _get_locks_collection(self) -> AsyncCollection:
+        locks = self._db[LOCKS_COLLECTION]
+        if not self._locks_ready:
+            await locks.create_index([("expire_at", pymongo.ASCENDING)], expireAfterSeconds=0)
+            self._locks_ready = True
+        return locks
+
+    async def acquire_lock(self, key: str, ttl: float, collection_name: str = None) -> Optional[str]:
+        """Insert a lease document, or take over the lease if its holder let it expire"""
+        locks = await self._get_locks_collection()
+        lock_id = self._get_lock_id(key, collection_name)
+        now = datetime.now(timezone.utc)
+        lease = self._build_lease(ttl, now)
+        try:
+            await locks.insert_one({"_id": lock_id, **lease})
+            return lease["token"]
+        except pymongo.errors.DuplicateKeyError:
+            # The TTL monitor only runs every minute, expired leases can still be present
+            taken = await locks.find_one_and_update(
+                {"_id": lock_id, "expire_at": {"$lte": now}}, {"$set": lease}
+            )
+            return lease["token"] if taken else None
+
+    async def release_lock(self, key: str, token: str, collection_name: str = None) -> None:
+        """Delete the lease document if it is still ours"""
+        locks = await self._get_locks_collection()
+        await locks.delete_one({"_id": self._get_lock_id(key, collection_name), "token": token})
+
+    async def clear(
+        self,
+        collection_name: str = None,
+        context=None,
+        scope: CacheScope = CacheScope.ORGANIZATION,
+    ) -> None:
+        query = self._build_clear_query(context, scope)
+        # Leases of in-flight computations aren't cached results
+        collections = [collection_name] if collection_name else [
+            name for name in await self._db.list_collection_names() if name != LOCKS_COLLECTION
+        ]
+        for collection in collections:
+            await self._db[collection].delete_many(query)
+            print(f"Cache cleared for collection: {collection}")
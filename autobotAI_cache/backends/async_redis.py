@@ -0,0 +1,171 @@
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import redis.asyncio
+
+from autobotAI_cache.backends.async_base import AsyncBaseBackend
+from autobotAI_cache.backends.redis import (
+    RELEASE_LOCK_SCRIPT,
+    SET_AND_TRIM_SCRIPT,
+    RedisKeyspaceMixin,
+)
+from autobotAI_cache.core.models import CacheScope, UserContext
+
+
+class AsyncRedisBackend(RedisKeyspaceMixin, AsyncBaseBackend):
+    """Asyncio variant of RedisBackend built on redis.asyncio, accepting the same options"""
+
+    supports_locks = True
+
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        max_entries: Optional[int] = None,
+        scan_count: int = 1000,
+        eviction: str = "fifo",
+        **kwargs,
+    ):
+        """
+        Initialize asyncio Redis client
+
+        :param max_entries: Maximum number of entries per collection
+        :param scan_count: COUNT hint of the SCAN calls used by clear, i.e. keys examined per round trip
+        :param eviction: Entries evicted beyond max_entries, 'fifo' (oldest write) or 'lru' (least recently read)
+        """
+        self._init_options(max_entries, scan_count, eviction)
+        self.client = redis.asyncio.Redis(host=host, port=port, db=db, **kwargs)
+        self._set_and_trim = self.client.register_script(SET_AND_TRIM_SCRIPT)
+        self._release_lock = self.client.register_script(RELEASE_LOCK_SCRIPT)
+
+    async def get(self, key: str, collection_name: str) -> bytes:
+        """Get a value from cache by key"""
+        namespaced_key = self._get_namespaced_key(key, collection_name)
+        if self._reads_refresh_recency:
+            # Refresh the recency of the key in the same round trip
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_reads(pipe, [namespaced_key], collection_name)
+            value = (await pipe.execute())[0][0]
+        else:
+            value = await self.client.get(namespaced_key)
+        if value is None:
+            raise self._miss(key, collection_name)
+        return value
+
+    async def set(self, key: str, value: Any, collection_name: str, ttl: int = None) -> None:
+        """Set a value in cache with optional TTL"""
+        namespaced_key = self._get_namespaced_key(key, collection_name)
+
+        # Enforce max_entries limit if specified, the index is trimmed by the same script
+        if self.max_entries is not None:
+            await self._set_and_trim(
+                keys=self._set_and_trim_keys(namespaced_key, collection_name),
+                args=self._set_and_trim_args(value, ttl, time.time()),
+            )
+            return
+
+        # Set with or without TTL based on the provided value
+        if ttl:
+            await self.client.setex(namespaced_key, timedelta(seconds=ttl), value)
+        else:
+            await self.client.set(namespaced_key, value)
+
+    async def delete(self, key: str, collection_name: str) -> None:
+        """Delete a value from cache by key"""
+        namespaced_key = self._get_namespaced_key(key, collection_name)
+        if self.max_entries is not None:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.delete(namespaced_key)
+            self._unindex_members(pipe, [namespaced_key], collection_name)
+            result = (await pipe.execute())[0]
+        else:
+            result = await self.client.delete(namespaced_key)
+        if result == 0:
+            raise self._miss(key, collection_name)
+
+    async def get_many(self, keys: Iterable[str], collection_name: str) -> Dict[str, bytes]:
+        """Get several values with a single MGET"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        namespaced_keys = [self._get_namespaced_key(key, collection_name) for key in keys]
+        if self._reads_refresh_recency:
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_reads(pipe, namespaced_keys, collection_name)
+            values = (await pipe.execute())[0]
+        else:
+            values = await self.client.mget(namespaced_keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    async def set_many(
+        self, items: Dict[str, Any], ttl: int = None, collection_name: str = None
+    ) -> None:
+        """Set several values in one pipelined round trip"""
+        if not items:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        if self.max_entries is not None:
+            for keys, args in self._trimmed_writes(items, ttl, collection_name):
+                await self._set_and_trim(keys=keys, args=args, client=pipe)
+        else:
+            self._queue_writes(pipe, items, ttl, collection_name)
+        await pipe.execute()
+
+    async def delete_many(self, keys: Iterable[str], collection_name: str = None) -> None:
+        """Delete several values with a single UNLINK"""
+        namespaced_keys = [self._get_namespaced_key(key, collection_name) for key in keys]
+        if not namespaced_keys:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        pipe.unlink(*namespaced_keys)
+        if self.max_entries is not None:
+            self._unindex_members(pipe, namespaced_keys, collection_name)
+        await pipe.execute()
+
+    async def acquire_lock(self, key: str, ttl: float, collection_name: str = None) -> Optional[str]:
+        """Take the lease with SET NX PX"""
+        token = self._new_lock_token()
+        if await self.client.set(
+            self._get_lock_key(key, collection_name), token, nx=True, px=int(ttl * 1000)
+        ):
+            return token
+        return None
+
+    async def release_lock(self, key: str, token: str, collection_name: str = None) -> None:
+        """Delete the lease if it is still ours, in a script so the check and delete are atomic"""
+        await self._release_lock(keys=[self._get_lock_key(key, collection_name)], args=[token])
+
+    async def clear(
+        self,
+        collection_name: str = None,
+        context: Optional[UserContext] = None,
+        scope: CacheScope = CacheScope.ORGANIZATION.value,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Clear the cache for a specific collection and scope, one SCAN page at a time like RedisBackend.clear.
+
+        :param progress: Called with the running number of removed keys after each page
+        :return: Number of keys removed
+        """
+        pattern = self._get_namespaced_pattern(collection_name, context, scope)
+        removed = 0
+        cursor, keys = await self.client.scan(0, match=pattern, count=self.scan_count)
+        while keys or cursor:
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_clear_page(pipe, keys, cursor, pattern, collection_name)
+            results = await pipe.execute()
+            if keys:
+                removed += results[0]
+                if progress is not None:
+                    progress(removed)
+            cursor, keys = results[-1] if cursor else (0, [])
+
+        self._report_cleared(pattern, removed)
+        return removed
+
+    async def close(self) -> None:
+        """Close the client connection pool"""
+        await self.client.aclose()
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 
+from autobotAI_cache.core.exceptions import CacheMissError
 from autobotAI_cache.core.models import CacheScope, UserContext
 
 
@@ -9,6 +10,13 @@ class BaseBackend(ABC):
     Abstract base class for all cache backend implementations
     """
 
+    # Backends that keep Python objects as they are, callers skip serialization for them
+    stores_objects = False
+    # Backends whose operations never wait on I/O, asyncio callers use them on the event loop
+    in_process = False
+    # Backends implementing acquire_lock/release_lock, used to coalesce misses across nodes
+    supports_locks = False
+
     @abstractmethod
     def get(
         self,
@@ -89,3 +97,139 @@ class BaseBackend(ABC):
         :raises CacheError: For backend errors like connection issues or clearing failures
         """
         raise NotImplementedError
+
+    def get_many(
+        self,
+        keys: Iterable[str],
+        collection_name: str = None
+    ) -> Dict[str, bytes]:
+        """
+        Retrieve several values from the cache at once.
+
+        Backends override this to fetch all keys in one round trip, the default looks the keys
+        up one by one.
+
+        :param keys: Cache keys to look up
+        :param collection_name: Name of the collection to query
+        :return: Mapping of the found keys to their values, missing and expired keys are left out
+        :raises CacheError: For backend errors like connection issues
+        """
+        found = {}
+        for key in keys:
+            try:
+                found[key] = self.get(key, collection_name=collection_name)
+            except CacheMissError:
+                pass
+        return found
+
+    def get_with_ttl(
+        self,
+        key: str,
+        collection_name: str = None
+    ) -> Tuple[bytes, Optional[float]]:
+        """
+        Retrieve a value from the cache together with the time it has left.
+
+        Backends that know when their entries expire override this, the default reports the
+        remaining time as unknown.
+
+        :param key: Cache key to look up
+        :param collection_name: Name of the collection to query
+        :return: The cached value and the seconds until it expires, None if it doesn't expire or
+            the backend can't tell
+        :raises CacheMissError: If the key is not found in the cache
+        :raises CacheError: For backend errors like connection issues
+        """
+        return self.get(key, collection_name=collection_name), None
+
+    def get_many_with_ttl(
+        self,
+        keys: Iterable[str],
+        collection_name: str = None
+    ) -> Dict[str, Tuple[bytes, Optional[float]]]:
+        """
+        Retrieve several values from the cache at once, together with the time they have left.
+
+        :param keys: Cache keys to look up
+        :param collection_name: Name of the collection to query
+        :return: Mapping of the found keys to their value and remaining seconds, see get_with_ttl
+        :raises CacheError: For backend errors like connection issues
+        """
+        found = self.get_many(keys, collection_name=collection_name)
+        return {key: (value, None) for key, value in found.items()}
+
+    def set_many(
+        self,
+        items: Dict[str, bytes],
+        ttl: int = None,
+        collection_name: str = None
+    ) -> None:
+        """
+        Store several values in the cache at once, all with the same TTL.
+
+        :param items: Mapping of cache keys to serialized values
+        :param ttl: Time-to-live in seconds. If None, the values will not expire
+        :param collection_name: Name of the collection to store in
+        :raises CacheError: For backend errors like connection issues or storage failures
+        """
+        for key, value in items.items():
+            self.set(key, value, ttl=ttl, collection_name=collection_name)
+
+    def delete_many(
+        self,
+        keys: Iterable[str],
+        collection_name: str = None
+    ) -> None:
+        """
+        Delete several values from the cache at once, keys that aren't cached are ignored.
+
+        :param keys: Cache keys to delete
+        :param collection_name: Name of the collection to delete from
+        :raises CacheError: For backend errors like connection issues or deletion failures
+        """
+        for key in keys:
+            try:
+                self.delete(key, collection_name=collection_name)
+            except CacheMissError:
+                pass
+
+    def acquire_lock(
+        self,
+        key: str,
+        ttl: float,
+        collection_name: str = None
+    ) -> Optional[str]:
+        """
+        Try to take a lease on a key, shared by every process using the backend.
+
+        Only implemented by backends with `supports_locks`.
+
+        :param key: Cache key to lock
+        :param ttl: Seconds after which the lease is released if its holder didn't release it
+        :param collection_name: Name of the collection of the key
+        :return: Token identifying the holder, or None if another holder has the lease
+        """
+        raise NotImplementedError
+
+    def release_lock(
+        self,
+        key: str,
+        token: str,
+        collection_name: str = None
+    ) -> None:
+        """
+        Release a lease taken with acquire_lock, unless it expired and was taken by another holder.
+
+        :param key: Cache key that was locked
+        :param token: Token returned by acquire_lock
+        :param collection_name: Name of the collection of the key
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Release resources held by the backend.
+
+        Called when the configuration replaces the backend instance. Backends that own
+        connections, threads or in-process data should override this.
+        """
@@ -0,0 +1,287 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from autobotAI_cache.backends.base import BaseBackend
+from autobotAI_cache.core.exceptions import CacheBackendError, CacheMissError
+from autobotAI_cache.core.models import CacheScope, UserContext
+from autobotAI_cache.utils.helpers import get_context_scope_string
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expire_at REAL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (collection, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_entries_expire_at ON cache_entries (expire_at)
+    WHERE expire_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS cache_entries_accessed_at ON cache_entries (accessed_at);
+CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO cache_size (id, bytes) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS cache_entries_insert AFTER INSERT ON cache_entries BEGIN
+    UPDATE cache_size SET bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entries_delete AFTER DELETE ON cache_entries BEGIN
+    UPDATE cache_size SET bytes = bytes - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entries_update AFTER UPDATE OF size ON cache_entries BEGIN
+    UPDATE cache_size SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+END;
+"""
+
+# Reads only refresh accessed_at when it is older than this, to avoid a write per hit
+ACCESS_RESOLUTION = 60
+# Rows removed per statement while purging expired entries or evicting
+BATCH_SIZE = 64
+# Keys per IN (...) lookup, below SQLite's limit on bound parameters
+LOOKUP_CHUNK_SIZE = 500
+
+
+class DiskBackend(BaseBackend):
+    """
+    Persistent cache backend storing serialized values in a local SQLite database in WAL mode.
+
+    Entries survive process restarts and the file can be shared by every process on the host.
+    When `max_bytes` is set, the least recently read entries are evicted once the stored values
+    exceed it. The total size is maintained by triggers so it stays exact across processes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        timeout: float = 5.0,
+    ):
+        self.path = path or os.path.join(tempfile.gettempdir(), "autobotai_cache.sqlite3")
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        try:
+            self._connection().executescript(SCHEMA)
+        except sqlite3.Error as e:
+            raise CacheBackendError(f"Failed to initialize disk cache '{self.path}': {e}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection, SQLite connections must not be shared between threads"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def close(self) -> None:
+        """Close the connections of every thread"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def get(self, key: str, collection_name: str) -> bytes:
+        return self.get_with_ttl(key, collection_name)[0]
+
+    def get_with_ttl(self, key: str, collection_name: str) -> Tuple[bytes, Optional[float]]:
+        connection = self._connection()
+        try:
+            row = connection.execute(
+                "SELECT value, expire_at, accessed_at FROM cache_entries WHERE collection = ? AND key = ?",
+                (collection_name, key),
+            ).fetchone()
+            if row is None:
+                raise CacheMissError(f"Key '{key}' not found")
+
+            value, expire_at, accessed_at = row
+            now = time.time()
+            if expire_at is not None and expire_at <= now:
+                connection.execute(
+                    "DELETE FROM cache_entries WHERE collection = ? AND key = ? AND expire_at <= ?",
+                    (collection_name, key, now),
+                )
+                raise CacheMissError(f"Key '{key}' expired")
+
+            if now - accessed_at > ACCESS_RESOLUTION:
+                connection.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE collection = ? AND key = ?",
+                    (now, collection_name, key),
+                )
+            return value, expire_at - now if expire_at is not None else None
+        except sqlite3.Error as e:
+            raise CacheBackendError(f"Disk cache read failed: {e}")
+
+    def get_many(self, keys: Iterable[str], collection_name: str) -> Dict[str, bytes]:
+        """Look keys up with IN (...) queries of up to LOOKUP_CHUNK_SIZE keys"""
+        found = self.get_many_with_ttl(keys, collection_name)
+        return {key: value for key, (value, _) in found.items()}
+
+    def get_many_with_ttl(
+        self, keys: Iterable[str], collection_name: str
+    ) -> Dict[str, Tuple[bytes, Optional[float]]]:
+        keys = list(keys)
+        connection = self._connection()
+        now = time.time()
+        found = {}
+        stale = []
+        try:
+            for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+                rows = connection.execute(
+                    "SELECT key, value, expire_at, accessed_at FROM cache_entries "
+                    f"WHERE collection = ? AND key IN ({', '.join('?' * len(chunk))})",
+                    (collection_name, *chunk),
+                ).fetchall()
+                for key, value, expire_at, accessed_at in rows:
+                    if expire_at is not None and expire_at <= now:
+                        continue
+                    found[key] = (value, expire_at - now if expire_at is not None else None)
+                    if now - accessed_at > ACCESS_RESOLUTION:
+                        stale.append((now, collection_name, key))
+            if stale:
+                connection.executemany(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE collection = ? AND key = ?",
+                    stale,
+                )
+        except sqlite3.Error as e:
+            raise CacheBackendError(f"Disk cache read failed: {e}")
+        return found
+
+    def set(self, key: str, value: bytes, collection_name: str, ttl: int = None) -> None:
+        now = time.time()
+        expire_at = now + ttl if ttl is not None else None
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            # Can never fit, drop the old value so it isn't served stale
+            self.delete(key, collection_name)
+            return
+
+        self._write([(collection_name, key, value, len(value), expire_at, now)], now)
+
+    def set_many(
+        self, items: Dict[str, bytes], ttl: int = None, collection_name: str = None
+    ) -> None:
+        """Store several values in a single transaction"""
+        now = time.time()
+        expire_at = now + ttl if ttl is not None else None
+        rows = []
+        oversized = []
+        for key, value in items.items():
+            if self.max_bytes is not None and len(value) > self.max_bytes:
+                oversized.append(key)
+            else:
+                rows.append((collection_name, key, value, len(value), expire_at, now))
+        if oversized:
+            self.delete_many(oversized, collection_name)
+        if rows:
+            self._write(rows, now)
+
+    def _write(self, rows: List[tuple], now: float) -> None:
+        """Upsert rows, then purge and evict, in one write transaction"""
+        connection = self._connection()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                # An upsert rather than INSERT OR REPLACE, whose implicit delete skips the size trigger
+                connection.executemany(
+                    "INSERT INTO cache_entries "
+                    "(collection, key, value, size, expire_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (collection, key) DO UPDATE SET value = excluded.value, "
+                    "size = excluded.size, expire_at = excluded.expire_at, accessed_at = excluded.accessed_at",
+                    rows,
+                )
+                self._purge_expired(connection, now)
+                if self.max_bytes is not None:
+                    self._enforce_max_bytes(connection)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            raise CacheBackendError(f"Disk cache write failed: {e}")
+
+    def _purge_expired(self, connection: sqlite3.Connection, now: float) -> None:
+        """Remove a small batch of expired entries, amortizing expiry over writes"""
+        connection.execute(
+            "DELETE FROM cache_entries WHERE (collection, key) IN ("
+            "SELECT collection, key FROM cache_entries WHERE expire_at <= ? LIMIT ?)",
+            (now, BATCH_SIZE),
+        )
+
+    def _stored_bytes(self, connection: sqlite3.Connection) -> int:
+        return connection.execute("SELECT bytes FROM cache_size WHERE id = 0").fetchone()[0]
+
+    def _enforce_max_bytes(self, connection: sqlite3.Connection) -> None:
+        """Evict least recently read entries until the stored values fit in max_bytes"""
+        excess = self._stored_bytes(connection) - self.max_bytes
+        while excess > 0:
+            candidates = connection.execute(
+                "SELECT collection, key, size FROM cache_entries ORDER BY accessed_at LIMIT ?",
+                (BATCH_SIZE,),
+            ).fetchall()
+            if not candidates:
+                break
+            victims = []
+            for collection, key, size in candidates:
+                victims.append((collection, key))
+                excess -= size
+                if excess <= 0:
+                    break
+            connection.executemany(
+                "DELETE FROM cache_entries WHERE collection = ? AND key = ?", victims
+            )
+
+    def delete(self, key: str, collection_name: str) -> None:
+        try:
+            self._connection().execute(
+                "DELETE FROM cache_entries WHERE collection = ? AND key = ?",
+                (collection_name, key),
+            )
+        except sqlite3.Error as e:
+            raise CacheBackendError(f"Disk cache delete failed: {e}")
+
+    def delete_many(self, keys: Iterable[str], collection_name: str = None) -> None:
+        try:
+            self._connection().executemany(
+                "DELETE FROM cache_entries WHERE collection = ? AND key = ?",
+                [(collection_name, key) for key in keys],
+            )
+        except sqlite3.Error as e:
+            raise CacheBackendError(f"Disk cache delete failed: {e}")
+
+    def clear(
+        self,
+        collection_name: str = None,
+        context: Optional[UserContext] = None,
+        scope: CacheScope = CacheScope.ORGANIZATION.value,
+    ) -> None:
+        context_scope_str = get_context_scope_string(context, scope)
+        conditions, params = [], []
+        if collection_name:
+            conditions.append("collection = ?")
+            params.append(collection_name)
+        if scope != CacheScope.GLOBAL.value:
+            # Organization scope strings look like 'root_user_id:', user scope 'root_user_id:user_id'
+            prefix = context_scope_str if context_scope_str.endswith(":") else f"{context_scope_str}:"
+            # A key range instead of LIKE so the primary key index is used
+            conditions.append("key >= ? AND key < ?")
+            params.extend([prefix, prefix[:-1] + chr(ord(":") + 1)])
+        query = "DELETE FROM cache_entries"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        try:
+            self._connection().execute(query, params)
+        except sqlite3.Error as e:
+            raise CacheBackendError(f"Disk cache clear failed: {e}")
@@ -0,0 +1,259 @@
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class EvictionPolicy(ABC):
+    """
+    Abstract base class for eviction policies used by the in-memory backends.
+
+    A policy only tracks keys; the backend owns the values. Every hook must run in O(1)
+    (amortized) time because it is called while the collection lock is held.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.capacity = capacity
+
+    @abstractmethod
+    def on_insert(self, key: str) -> None:
+        """Record a newly stored key"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def on_access(self, key: str) -> None:
+        """Record a cache hit (or an overwrite) of an existing key"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def on_remove(self, key: str) -> None:
+        """Forget a key that was deleted, expired or evicted"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def victim(self) -> Optional[str]:
+        """Return the key that should be evicted next, or None if nothing is tracked"""
+        raise NotImplementedError
+
+
+class FIFOPolicy(EvictionPolicy):
+    """Evicts keys in insertion order, reads do not affect the order"""
+
+    def __init__(self, capacity: Optional[int] = None):
+        super().__init__(capacity)
+        self._order: OrderedDict = OrderedDict()
+
+    def on_insert(self, key: str) -> None:
+        self._order[key] = None
+
+    def on_access(self, key: str) -> None:
+        pass
+
+    def on_remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> Optional[str]:
+        return next(iter(self._order), None)
+
+
+class LRUPolicy(FIFOPolicy):
+    """Evicts the least recently used key"""
+
+    def on_access(self, key: str) -> None:
+        if key in self._order:
+            self._order.move_to_end(key)
+
+
+class LFUPolicy(EvictionPolicy):
+    """
+    Evicts the least frequently used key, ties are broken by insertion order.
+
+    Uses frequency buckets so every operation is O(1).
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        super().__init__(capacity)
+        self._freq: Dict[str, int] = {}
+        self._buckets: Dict[int, OrderedDict] = {}
+        self._min_freq = 0
+
+    def _unlink(self, key: str, freq: int) -> None:
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+
+    def on_insert(self, key: str) -> None:
+        if key in self._freq:
+            self.on_access(key)
+            return
+        self._freq[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_freq = 1
+
+    def on_access(self, key: str) -> None:
+        freq = self._freq.get(key)
+        if freq is None:
+            return
+        self._unlink(key, freq)
+        if self._min_freq == freq and freq not in self._buckets:
+            self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def on_remove(self, key: str) -> None:
+        freq = self._freq.pop(key, None)
+        if freq is not None:
+            self._unlink(key, freq)
+
+    def victim(self) -> Optional[str]:
+        if not self._buckets:
+            return None
+        if self._min_freq not in self._buckets:
+            # Only happens after removals, which never lower the minimum
+            self._min_freq = min(self._buckets)
+        return next(iter(self._buckets[self._min_freq]))
+
+
+class CountMinSketch:
+    """
+    Approximate frequency counter with 4-bit saturating counters and periodic aging.
+
+    Counters are halved once `sample_size` increments have been recorded so the sketch
+    follows changes in popularity instead of accumulating history forever.
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+    def __init__(self, width: int = 1024):
+        self.width = 1 << max(4, (width - 1).bit_length())
+        self._mask = self.width - 1
+        self._table = array("B", bytes(self.width * self.DEPTH))
+        self._sample_size = 10 * self.width
+        self._additions = 0
+
+    def _indexes(self, key: str):
+        h = hash(key)
+        for row, seed in enumerate(self._SEEDS):
+            mixed = (h ^ seed) * 0x2545F4914F6CDD1D
+            yield row * self.width + ((mixed ^ (mixed >> 29)) & self._mask)
+
+    def increment(self, key: str) -> None:
+        table = self._table
+        for index in self._indexes(key):
+            if table[index] < self.MAX_COUNT:
+                table[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def frequency(self, key: str) -> int:
+        table = self._table
+        return min(table[index] for index in self._indexes(key))
+
+    def _age(self) -> None:
+        table = self._table
+        for index in range(len(table)):
+            table[index] >>= 1
+        self._additions //= 2
+
+
+class TinyLFUPolicy(EvictionPolicy):
+    """
+    Window TinyLFU eviction policy.
+
+    New keys enter a small LRU window (1% of the cache). Keys leaving the window join the
+    probation segment of a segmented LRU and are only kept over the probation victim when a
+    count-min sketch says they are requested more often. Hits in probation promote keys to
+    the protected segment (80% of the main cache).
+    """
+
+    WINDOW_RATIO = 0.01
+    PROTECTED_RATIO = 0.8
+
+    def __init__(self, capacity: Optional[int] = None):
+        super().__init__(capacity)
+        self._window: OrderedDict = OrderedDict()
+        self._probation: OrderedDict = OrderedDict()
+        self._protected: OrderedDict = OrderedDict()
+        self._sketch = CountMinSketch(capacity or 1024)
+        # The key that last left the window, it competes with the probation LRU key
+        self._candidate: Optional[str] = None
+
+    def _size(self) -> int:
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+    def _window_max(self) -> int:
+        return max(1, int((self.capacity or self._size()) * self.WINDOW_RATIO))
+
+    def _protected_max(self) -> int:
+        main = (self.capacity or self._size()) - self._window_max()
+        return max(1, int(main * self.PROTECTED_RATIO))
+
+    def on_insert(self, key: str) -> None:
+        if key in self._window or key in self._probation or key in self._protected:
+            self.on_access(key)
+            return
+        self._sketch.increment(key)
+        self._window[key] = None
+        while len(self._window) > self._window_max():
+            candidate, _ = self._window.popitem(last=False)
+            self._probation[candidate] = None
+            self._candidate = candidate
+
+    def on_access(self, key: str) -> None:
+        self._sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._probation:
+            del self._probation[key]
+            self._protected[key] = None
+            while len(self._protected) > self._protected_max():
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+
+    def on_remove(self, key: str) -> None:
+        self._window.pop(key, None)
+        self._probation.pop(key, None)
+        self._protected.pop(key, None)
+        if key == self._candidate:
+            self._candidate = None
+
+    def victim(self) -> Optional[str]:
+        if self._probation:
+            # Keys demoted from protected also join the probation tail, they aren't candidates
+            victim = next(iter(self._probation))
+            candidate = self._candidate
+            if candidate in self._probation and candidate != victim and (
+                self._sketch.frequency(candidate) <= self._sketch.frequency(victim)
+            ):
+                return candidate
+            return victim
+        if self._protected:
+            return next(iter(self._protected))
+        return next(iter(self._window), None)
+
+
+EVICTION_POLICIES = {
+    "fifo": FIFOPolicy,
+    "lru": LRUPolicy,
+    "lfu": LFUPolicy,
+    "tinylfu": TinyLFUPolicy,
+}
+
+
+def get_eviction_policy(name: str) -> type:
+    """
+    Returns the class of the specified eviction policy.
+
+    :param name: Name of the policy ('fifo', 'lru', 'lfu' or 'tinylfu')
+    :return: Class of the policy
+    :raises ValueError: If the policy name is unknown
+    """
+    if name not in EVICTION_POLICIES:
+        raise ValueError(f"Invalid eviction policy: {name}")
+    return EVICTION_POLICIES[name]
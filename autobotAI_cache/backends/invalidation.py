@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import redis
+
+from autobotAI_cache.backends.base import BaseBackend
+from autobotAI_cache.core.models import CacheScope, UserContext
+from autobotAI_cache.utils.helpers import get_context_scope_string
+
+
+class _ScopeContext:
+    """Context rebuilt from a scope string received from another node"""
+
+    def __init__(self, scope_str: str):
+        root_user_id, _, user_id = scope_str.partition(":")
+        self.user_context = UserContext(root_user={"id": root_user_id}, user={"id": user_id})
+
+
+class RedisInvalidationBus:
+    """
+    Broadcasts invalidations of a local cache to the other processes over Redis pub/sub.
+
+    Every process sharing a channel publishes the keys it deletes or overwrites and the scopes
+    it clears, and drops the same keys and scopes from its own `local` backend when another
+    process publishes them. Invalidations are batched: they are collected for `flush_interval`
+    seconds and published as one message, with duplicate keys and keys covered by a clear of
+    their whole collection coalesced away.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        local: BaseBackend,
+        channel: str = "autobotai-cache:invalidations",
+        flush_interval: float = 0.005,
+        max_batch: int = 1000,
+        on_invalidate: Optional[Callable[[Optional[str], Optional[List[str]]], None]] = None,
+    ):
+        """
+        :param client: Redis client used to publish and subscribe
+        :param local: In-process backend the invalidations of other processes are applied to
+        :param channel: Pub/sub channel shared by the processes
+        :param flush_interval: Seconds invalidations are collected before they are published
+        :param max_batch: Number of pending keys that triggers a publish without waiting
+        :param on_invalidate: Called with the collection and keys of each invalidation of another
+            process, keys being None for clears, before it is applied to `local`
+        """
+        self.client = client
+        self.local = local
+        self.channel = channel
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.on_invalidate = on_invalidate
+        # Identifies this process' messages, which it doesn't apply again
+        self.origin = uuid.uuid4().hex
+
+        self._condition = threading.Condition()
+        self._deletes: Dict[str, Set[str]] = {}
+        self._clears: Set[tuple] = set()
+        self._pending = 0
+        self._stop = threading.Event()
+
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(channel)
+        self._publisher = threading.Thread(
+            target=self._publish_loop, name="autobotai-cache-invalidation-publisher", daemon=True
+        )
+        self._subscriber = threading.Thread(
+            target=self._subscribe_loop, name="autobotai-cache-invalidation-subscriber", daemon=True
+        )
+        self._publisher.start()
+        self._subscriber.start()
+
+    def delete(self, keys: Iterable[str], collection_name: str) -> None:
+        """Queue the invalidation of keys on the other processes"""
+        with self._condition:
+            pending = self._deletes.setdefault(collection_name, set())
+            before = len(pending)
+            pending.update(keys)
+            self._pending += len(pending) - before
+            self._condition.notify()
+
+    def clear(
+        self,
+        collection_name: Optional[str] = None,
+        context: Optional[UserContext] = None,
+        scope: CacheScope = CacheScope.ORGANIZATION.value,
+    ) -> None:
+        """Queue a scope clear on the other processes"""
+        scope = CacheScope(scope).value
+        scope_str = None if scope == CacheScope.GLOBAL.value else get_context_scope_string(context, scope)
+        with self._condition:
+            self._clears.add((collection_name, scope, scope_str))
+            self._pending += 1
+            self._condition.notify()
+
+    def _take_batch(self) -> Optional[dict]:
+        """Pending invalidations as a message, coalesced, or None if there are none"""
+        if not self._pending:
+            return None
+        cleared = {
+            collection for collection, scope, _ in self._clears if scope == CacheScope.GLOBAL.value
+        }
+        deletes = {
+            collection: sorted(keys)
+            for collection, keys in self._deletes.items()
+            # A clear of every collection or of this one makes key deletes redundant
+            if keys and None not in cleared and collection not in cleared
+        }
+        message = {"origin": self.origin, "deletes": deletes, "clears": list(self._clears)}
+        self._deletes = {}
+        self._clears = set()
+        self._pending = 0
+        return message
+
+    def flush(self) -> None:
+        """Publish the pending invalidations now"""
+        with self._condition:
+            message = self._take_batch()
+        if message is not None:
+            self.client.publish(self.channel, json.dumps(message))
+
+    def _publish_loop(self) -> None:
+        while not self._stop.is_set():
+            with self._condition:
+                while not self._pending and not self._stop.is_set():
+                    self._condition.wait()
+                # Let invalidations of the same burst join the batch
+                deadline = time.monotonic() + self.flush_interval
+                while self._pending < self.max_batch and not self._stop.is_set():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            try:
+                self.flush()
+            except redis.RedisError as e:
+                print(f"Error publishing cache invalidations: {e}")
+
+    def _subscribe_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                message = self._pubsub.get_message(timeout=0.1)
+            except redis.RedisError as e:
+                print(f"Error reading cache invalidations: {e}")
+                self._stop.wait(1)
+                continue
+            if message is None:
+                continue
+            try:
+                self.apply(json.loads(message["data"]))
+            except Exception as e:
+                print(f"Error applying cache invalidations: {e}")
+
+    def apply(self, message: dict) -> None:
+        """Drop the keys and scopes of a message published by another process from the local backend"""
+        if message.get("origin") == self.origin:
+            return
+        for collection_name, scope, scope_str in message.get("clears", []):
+            if self.on_invalidate is not None:
+                self.on_invalidate(collection_name, None)
+            context = _ScopeContext(scope_str) if scope_str is not None else None
+            self.local.clear(collection_name=collection_name, context=context, scope=scope)
+        for collection_name, keys in message.get("deletes", {}).items():
+            if self.on_invalidate is not None:
+                self.on_invalidate(collection_name, keys)
+            self.local.delete_many(keys, collection_name=collection_name)
+
+    def close(self) -> None:
+        """Publish what is pending and stop listening"""
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        self._publisher.join()
+        self._subscriber.join()
+        try:
+            self.flush()
+        finally:
+            self._pubsub.close()
+
@@ -1,75 +1,622 @@
+import heapq
 import threading
 import time
-from typing import Dict, Optional
-from collections import OrderedDict
+import weakref
+from array import array
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from autobotAI_cache.backends.base import BaseBackend
+from autobotAI_cache.backends.eviction import EvictionPolicy, get_eviction_policy
 from autobotAI_cache.core.exceptions import CacheMissError
 from autobotAI_cache.core.models import CacheScope, UserContext
 from autobotAI_cache.utils.helpers import get_context_scope_string
 
 
+STAT_NAMES = ("hits", "misses", "evictions", "expirations", "rejections")
+
+# Number of keys removed per lock hold while clearing a scope
+CLEAR_BATCH_SIZE = 256
+
+# Value of unused compact slots, None can be a cached object
+_FREE = object()
+
+
+def _scope_tokens(key: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Organization and user tokens of a scoped key.
+
+    Keys look like 'root_user_id::hash' or 'root_user_id:user_id:hash', so the organization
+    token is the first component and the user token the first two.
+    """
+    parts = key.split(":", 2)
+    if len(parts) < 2:
+        return None, None
+    if len(parts) == 2:
+        return parts[0], None
+    return parts[0], f"{parts[0]}:{parts[1]}"
+
+
+class _Segment:
+    """
+    One independently locked partition of a collection.
+
+    Writes take the segment lock. Reads look entries up without it and append to a read
+    buffer, which is replayed into the eviction policy and counters by whichever thread
+    next holds the lock.
+    """
+
+    # Readers try to drain the buffer once it holds this many records
+    READ_BUFFER_THRESHOLD = 32
+
+    __slots__ = (
+        "lock", "entries", "policy", "expiry_heap", "bytes", "stats", "read_buffer",
+        "org_index", "user_index", "max_entries", "max_bytes", "max_entry_bytes", "sizeof",
+    )
+
+    def __init__(
+        self,
+        policy: EvictionPolicy,
+        max_entries: Optional[int],
+        max_bytes: Optional[int],
+        max_entry_bytes: Optional[int],
+        sizeof: Callable[[Any], int] = len,
+    ):
+        self.lock = threading.Lock()
+        # entries = {key: (value, expire_time)}
+        self.entries: Dict[str, tuple] = {}
+        self.policy = policy
+        # Min-heap of (expire_time, key) so cleanup only touches due entries.
+        # Overwritten and deleted keys leave stale heap items that are skipped when popped.
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.bytes = 0
+        self.stats = dict.fromkeys(STAT_NAMES, 0)
+        # Hit keys, or None for misses, waiting to be applied under the lock
+        self.read_buffer = deque()
+        # Scope token -> keys, so clearing one tenant only visits that tenant's entries
+        self.org_index: Dict[str, set] = {}
+        self.user_index: Dict[str, set] = {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        # Size of a stored value counted against max_bytes
+        self.sizeof = sizeof
+
+    def record_read(self, key: Optional[str], cleanup: bool) -> None:
+        """Buffer a hit or miss and opportunistically drain without waiting for the lock"""
+        self.read_buffer.append(key)
+        if len(self.read_buffer) >= self.READ_BUFFER_THRESHOLD and self.lock.acquire(blocking=False):
+            try:
+                self.drain_reads()
+                if cleanup:
+                    self.cleanup_expired()
+            finally:
+                self.lock.release()
+
+    def drain_reads(self) -> None:
+        """Apply buffered reads to the policy and counters, caller must hold the lock"""
+        buffer = self.read_buffer
+        stats = self.stats
+        while buffer:
+            key = buffer.popleft()
+            if key is None:
+                stats["misses"] += 1
+            else:
+                stats["hits"] += 1
+                self.touch(key)
+
+    def lookup(self, key: str) -> Optional[tuple]:
+        """(value, expire_time) of a key without locking, or None"""
+        return self.entries.get(key)
+
+    def touch(self, key: str) -> None:
+        """Record an access in the eviction order, caller must hold the lock"""
+        self.policy.on_access(key)
+
+    def _stored_size(self, key: str) -> Optional[int]:
+        entry = self.entries.get(key)
+        return self.sizeof(entry[0]) if entry is not None else None
+
+    def _victim(self) -> Optional[str]:
+        return self.policy.victim()
+
+    def _write(self, key: str, value: bytes, expire_time: Optional[float], exists: bool) -> None:
+        if not exists:
+            self.policy.on_insert(key)
+        self.entries[key] = (value, expire_time)
+        if expire_time is not None:
+            self.schedule_expiry(key, expire_time)
+
+    def discard(self, key: str) -> Optional[tuple]:
+        """Remove an entry and its bookkeeping, caller must hold the lock"""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= self.sizeof(entry[0])
+            self.policy.on_remove(key)
+            self._unindex(key)
+        return entry
+
+    def _index(self, key: str) -> None:
+        org, user = _scope_tokens(key)
+        if org is not None:
+            self.org_index.setdefault(org, set()).add(key)
+        if user is not None:
+            self.user_index.setdefault(user, set()).add(key)
+
+    def _unindex(self, key: str) -> None:
+        org, user = _scope_tokens(key)
+        for index, token in ((self.org_index, org), (self.user_index, user)):
+            keys = index.get(token)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[token]
+
+    def clear_scope(self, token: str, user_scope: bool) -> None:
+        """Remove every key of an organization or user token in small batches"""
+        index = self.user_index if user_scope else self.org_index
+        while True:
+            # Release the lock between batches so writers of other tenants aren't stalled
+            with self.lock:
+                keys = index.get(token)
+                if not keys:
+                    return
+                batch = [keys.pop() for _ in range(min(CLEAR_BATCH_SIZE, len(keys)))]
+                for key in batch:
+                    self.discard(key)
+
+    def expire(self, key: str, entry: tuple) -> None:
+        """Drop an entry a reader found expired, unless it has been replaced meanwhile"""
+        with self.lock:
+            if self.entries.get(key) is entry:
+                self.discard(key)
+                self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+
+    def schedule_expiry(self, key: str, expire_time: float) -> None:
+        """Add a key to the expiry index, caller must hold the lock"""
+        heap = self.expiry_heap
+        heapq.heappush(heap, (expire_time, key))
+        # Rebuild once stale items dominate so the heap stays proportional to the segment
+        if len(heap) > 2 * len(self.entries) + 64:
+            heap[:] = [
+                (entry_expire, entry_key)
+                for entry_key, (_, entry_expire) in self.entries.items()
+                if entry_expire is not None
+            ]
+            heapq.heapify(heap)
+
+    def cleanup_expired(self, limit: Optional[int] = None) -> int:
+        """Remove expired entries, only visiting entries that are due. Caller must hold the lock"""
+        now = time.time()
+
+        heap = self.expiry_heap
+        if not heap or heap[0][0] > now:
+            return 0
+
+        entries = self.entries
+        expired = 0
+        while heap and heap[0][0] <= now and (limit is None or expired < limit):
+            expire_time, key = heapq.heappop(heap)
+            entry = entries.get(key)
+            # Skip stale index items left behind by overwrites and deletes
+            if entry is None or entry[1] != expire_time:
+                continue
+            self.discard(key)
+            expired += 1
+        self.stats["expirations"] += expired
+        return expired
+
+    def store(self, key: str, value: bytes, expire_time: Optional[float]) -> None:
+        """Insert or overwrite an entry enforcing the limits, caller must hold the lock"""
+        size = self.sizeof(value)
+
+        # Oversized values are not admitted, the previous value is dropped so it isn't served stale
+        if (
+            (self.max_entry_bytes is not None and size > self.max_entry_bytes)
+            or (self.max_bytes is not None and size > self.max_bytes)
+        ):
+            self.discard(key)
+            self.stats["rejections"] += 1
+            return
+
+        previous = self._stored_size(key)
+        exists = previous is not None
+        growth = size - (previous or 0)
+
+        # Enforce max entries and max bytes limits using the configured eviction policy
+        while (
+            (
+                self.max_entries
+                and not exists
+                and len(self.entries) >= self.max_entries
+            )
+            or (
+                self.max_bytes is not None
+                and self.bytes + growth > self.max_bytes
+            )
+        ):
+            victim = self._victim()
+            if victim is None:
+                break
+            self.discard(victim)
+            if victim == key:
+                exists = False
+                growth = size
+            else:
+                self.stats["evictions"] += 1
+
+        if exists:
+            self.touch(key)
+        else:
+            self._index(key)
+        self._write(key, value, expire_time, exists)
+        self.bytes += growth
+
+
+class _CompactSegment(_Segment):
+    """
+    Segment storing entries in parallel columns instead of one tuple per key.
+
+    `entries` maps a key to a slot number. Values and keys live in lists, expiry times in an
+    array('d') and the FIFO/LRU order in a doubly linked list threaded through two array('l')
+    columns. Expiry is indexed by a coarse timing wheel of one-second ticks holding slot numbers.
+    Per entry this avoids the (value, expire_time) tuple, its float, the policy's OrderedDict
+    node and the expiry heap tuple, so there are far fewer objects to allocate and collect.
+    """
+
+    __slots__ = (
+        "lru", "keys", "values", "expires", "prev", "next", "head", "tail", "free",
+        "wheel", "wheel_ticks", "wheel_size",
+    )
+
+    def __init__(
+        self,
+        lru: bool,
+        max_entries: Optional[int],
+        max_bytes: Optional[int],
+        max_entry_bytes: Optional[int],
+        sizeof: Callable[[Any], int] = len,
+    ):
+        super().__init__(None, max_entries, max_bytes, max_entry_bytes, sizeof)
+        self.lru = lru
+        # entries = {key: slot}
+        self.keys: List[Optional[str]] = []
+        self.values: list = []
+        # 0.0 means the entry never expires
+        self.expires = array("d")
+        self.prev = array("l")
+        self.next = array("l")
+        self.head = -1
+        self.tail = -1
+        self.free: List[int] = []
+        # tick -> slots expiring before it, ticks are kept in a heap
+        self.wheel: Dict[int, List[int]] = {}
+        self.wheel_ticks: List[int] = []
+        self.wheel_size = 0
+
+    def lookup(self, key: str) -> Optional[tuple]:
+        slot = self.entries.get(key)
+        if slot is None:
+            return None
+        value = self.values[slot]
+        expire_time = self.expires[slot]
+        # The slot may have been freed and reused by a writer meanwhile, keys are cleared
+        # before and set before the value on reuse, so re-checking the owner detects it
+        if value is _FREE or self.keys[slot] != key:
+            return None
+        return value, expire_time
+
+    def _link(self, slot: int) -> None:
+        self.prev[slot] = self.tail
+        self.next[slot] = -1
+        if self.tail == -1:
+            self.head = slot
+        else:
+            self.next[self.tail] = slot
+        self.tail = slot
+
+    def _unlink(self, slot: int) -> None:
+        prev, nxt = self.prev[slot], self.next[slot]
+        if prev == -1:
+            self.head = nxt
+        else:
+            self.next[prev] = nxt
+        if nxt == -1:
+            self.tail = prev
+        else:
+            self.prev[nxt] = prev
+
+    def touch(self, key: str) -> None:
+        if self.lru:
+            slot = self.entries.get(key)
+            if slot is not None and slot != self.tail:
+                self._unlink(slot)
+                self._link(slot)
+
+    def _stored_size(self, key: str) -> Optional[int]:
+        slot = self.entries.get(key)
+        return self.sizeof(self.values[slot]) if slot is not None else None
+
+    def _victim(self) -> Optional[str]:
+        return self.keys[self.head] if self.head != -1 else None
+
+    def _write(self, key: str, value: bytes, expire_time: Optional[float], exists: bool) -> None:
+        if exists:
+            slot = self.entries[key]
+        else:
+            if self.free:
+                slot = self.free.pop()
+            else:
+                slot = len(self.keys)
+                self.keys.append(None)
+                self.values.append(_FREE)
+                self.expires.append(0.0)
+                self.prev.append(-1)
+                self.next.append(-1)
+            self.keys[slot] = key
+            self._link(slot)
+        self.values[slot] = value
+        self.expires[slot] = expire_time or 0.0
+        if not exists:
+            self.entries[key] = slot
+        if expire_time is not None:
+            self._schedule_slot(slot, expire_time)
+
+    def _schedule_slot(self, slot: int, expire_time: float) -> None:
+        tick = int(expire_time) + 1
+        bucket = self.wheel.get(tick)
+        if bucket is None:
+            bucket = self.wheel[tick] = []
+            heapq.heappush(self.wheel_ticks, tick)
+        bucket.append(slot)
+        self.wheel_size += 1
+        # Rebuild once stale items from overwrites and deletes dominate
+        if self.wheel_size > 2 * len(self.entries) + 64:
+            self.wheel.clear()
+            self.wheel_ticks.clear()
+            self.wheel_size = 0
+            for live_slot in self.entries.values():
+                if self.expires[live_slot]:
+                    self._schedule_slot(live_slot, self.expires[live_slot])
+
+    def discard(self, key: str) -> Optional[tuple]:
+        slot = self.entries.pop(key, None)
+        if slot is None:
+            return None
+        # Clear the owner first so lock-free readers of this slot notice the change
+        self.keys[slot] = None
+        value = self.values[slot]
+        self.values[slot] = _FREE
+        self._unlink(slot)
+        self.free.append(slot)
+        self.bytes -= self.sizeof(value)
+        self._unindex(key)
+        return value, self.expires[slot]
+
+    def expire(self, key: str, entry: tuple) -> None:
+        with self.lock:
+            slot = self.entries.get(key)
+            expire_time = self.expires[slot] if slot is not None else 0.0
+            if expire_time and expire_time <= time.time():
+                self.discard(key)
+                self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+
+    def cleanup_expired(self, limit: Optional[int] = None) -> int:
+        now = time.time()
+        ticks = self.wheel_ticks
+        expired = 0
+        while ticks and ticks[0] <= now and (limit is None or expired < limit):
+            tick = ticks[0]
+            bucket = self.wheel[tick]
+            while bucket and (limit is None or expired < limit):
+                slot = bucket.pop()
+                self.wheel_size -= 1
+                key = self.keys[slot]
+                # Skip slots that were freed, or reused or overwritten with a later expiry
+                expire_time = self.expires[slot]
+                if key is None or not expire_time or expire_time > now:
+                    continue
+                self.discard(key)
+                expired += 1
+            if not bucket:
+                heapq.heappop(ticks)
+                del self.wheel[tick]
+        self.stats["expirations"] += expired
+        return expired
+
+
 class MemoryBackend(BaseBackend):
-    """Thread-safe in-memory cache backend with per-collection locking and efficient cleanup"""
-    
-    def __init__(self, max_entries=None):
-        # store = {collection_name: {key: (value, expire_time)}}
-        self._store: Dict[str, Dict[str, tuple]] = {}
-        # Use separate locks per collection for better concurrency
-        self._collection_locks: Dict[str, threading.RLock] = {}
-        self._collection_locks_lock = threading.Lock()
-        
+    """
+    Thread-safe in-memory cache backend.
+
+    Each collection is split into `shards` segments by key hash. Every segment has its own lock,
+    eviction policy and expiry index, and cache hits are served without taking any lock.
+
+    With `compact=True` entries are stored in per-segment columns rather than one tuple per key,
+    which roughly halves the overhead per entry and keeps the entries out of the garbage
+    collector. Compact storage supports the 'fifo' and 'lru' eviction policies.
+    """
+
+    COMPACT_EVICTION = ("fifo", "lru")
+    in_process = True
+
+    def __init__(
+        self,
+        max_entries=None,
+        eviction: str = "fifo",
+        janitor_interval: Optional[float] = None,
+        janitor_budget: int = 1000,
+        max_bytes: Optional[int] = None,
+        max_entry_bytes: Optional[int] = None,
+        shards: int = 1,
+        compact: bool = False,
+    ):
+        # store = {collection_name: [segment, ...]}
+        self._store: Dict[str, List[_Segment]] = {}
+        # Only taken when a collection is created
+        self._store_lock = threading.Lock()
+
+        if shards < 1:
+            raise ValueError("shards must be a positive integer")
+        # Every segment needs a share of at least 1 of each limit, or it couldn't store anything
+        for limit in (max_entries, max_bytes):
+            if limit:
+                shards = min(shards, limit)
+        self.shards = shards
+        # Limits apply per collection and are split between its segments
         self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.eviction = eviction
+        self._policy_cls = get_eviction_policy(eviction)
+        if compact and eviction not in self.COMPACT_EVICTION:
+            raise ValueError(f"Compact storage does not support the '{eviction}' eviction policy")
+        self.compact = compact
         self._last_cleanup = time.time()
 
-    def _get_collection_lock(self, collection_name: str) -> threading.RLock:
-        """Get or create a lock for a specific collection"""
-        with self._collection_locks_lock:
-            if collection_name not in self._collection_locks:
-                self._collection_locks[collection_name] = threading.RLock()
-            return self._collection_locks[collection_name]
-    
-    def _cleanup_expired(self, collection_name: str):
-        """Remove expired entries from a collection"""
-        now = time.time()
-            
-        collection = self._store.get(collection_name, {})
-        expired_keys = [
-            key for key, (_, expire_time) in collection.items()
-            if expire_time and expire_time <= now
-        ]
-        for key in expired_keys:
-            collection.pop(key, None)
-        
-        if not collection:
-            with self._collection_locks_lock:
-                self._collection_locks.pop(collection_name, None)
-        
-        self._last_cleanup = now
+        # Optional background reaper, while it runs expiry work is kept off the request path
+        self.janitor_interval = janitor_interval
+        self.janitor_budget = janitor_budget
+        self._janitor: Optional[threading.Thread] = None
+        self._janitor_stop = threading.Event()
+        if janitor_interval:
+            self._start_janitor()
+
+    def _start_janitor(self) -> None:
+        """Start the background thread that evicts expired entries"""
+        self._janitor = threading.Thread(
+            target=self._janitor_loop,
+            args=(weakref.ref(self), self._janitor_stop, self.janitor_interval),
+            name="autobotai-cache-janitor",
+            daemon=True,
+        )
+        self._janitor.start()
+
+    @staticmethod
+    def _janitor_loop(backend_ref, stop: threading.Event, interval: float) -> None:
+        # Only a weak reference is held between passes so an unused backend can be collected
+        while not stop.wait(interval):
+            backend = backend_ref()
+            if backend is None:
+                return
+            backend.reap_expired()
+            del backend
+
+    def reap_expired(self, budget: Optional[int] = None) -> int:
+        """
+        Evict expired entries across all collections.
+
+        :param budget: Maximum number of entries to evict in this pass. Defaults to janitor_budget
+        :return: Number of entries evicted
+        """
+        remaining = budget if budget is not None else self.janitor_budget
+        removed = 0
+        for segments in list(self._store.values()):
+            for segment in segments:
+                if remaining <= 0:
+                    break
+                with segment.lock:
+                    count = segment.cleanup_expired(limit=remaining)
+                removed += count
+                remaining -= count
+        self._last_cleanup = time.time()
+        return removed
+
+    def close(self) -> None:
+        """Stop the janitor thread and release all cached data"""
+        self._janitor_stop.set()
+        if self._janitor is not None and self._janitor is not threading.current_thread():
+            self._janitor.join()
+        self._janitor = None
+        self._store.clear()
+
+    def _split(self, limit: Optional[int], index: int) -> Optional[int]:
+        """Share of a per-collection limit of the segment at index, the shares add up to the limit"""
+        if limit is None:
+            return None
+        share, remainder = divmod(limit, self.shards)
+        return share + 1 if index < remainder else share
+
+    def _get_segments(self, collection_name: str) -> List[_Segment]:
+        """Get or create the segments of a collection"""
+        segments = self._store.get(collection_name)
+        if segments is None:
+            with self._store_lock:
+                segments = self._store.get(collection_name)
+                if segments is None:
+                    segments = self._store[collection_name] = [
+                        self._new_segment(index) for index in range(self.shards)
+                    ]
+        return segments
+
+    @staticmethod
+    def _value_size(value) -> int:
+        """Size of a stored value counted against max_bytes"""
+        return len(value)
+
+    def _new_segment(self, index: int) -> _Segment:
+        max_entries = self._split(self.max_entries, index)
+        max_bytes = self._split(self.max_bytes, index)
+        if self.compact:
+            return _CompactSegment(
+                self.eviction == "lru", max_entries, max_bytes, self.max_entry_bytes, self._value_size
+            )
+        return _Segment(
+            self._policy_cls(max_entries), max_entries, max_bytes, self.max_entry_bytes, self._value_size
+        )
+
+    def _get_segment(self, collection_name: str, key: str) -> _Segment:
+        """Segment responsible for a key"""
+        segments = self._get_segments(collection_name)
+        if len(segments) == 1:
+            return segments[0]
+        return segments[hash(key) % len(segments)]
+
+    def stats(self, collection_name: str = None) -> Dict[str, int]:
+        """
+        Return hit, miss, eviction, expiration and rejection counters along with the stored bytes.
+
+        :param collection_name: Collection to report on. If None, counters of all collections are summed
+        :return: Dictionary of counter name to value
+        """
+        if collection_name:
+            collections = [self._store.get(collection_name, [])]
+        else:
+            collections = list(self._store.values())
+        totals = dict.fromkeys(STAT_NAMES, 0)
+        totals["bytes"] = 0
+        for segments in collections:
+            for segment in segments:
+                with segment.lock:
+                    segment.drain_reads()
+                    for stat, value in segment.stats.items():
+                        totals[stat] += value
+                    totals["bytes"] += segment.bytes
+        return totals
 
     def get(
         self,
         key: str,
         collection_name: str,
     ) -> bytes:
-        collection_name = collection_name
-        
-        with self._get_collection_lock(collection_name):
-            self._cleanup_expired(collection_name)
-            
-            if collection_name not in self._store:
-                raise CacheMissError(f"Key '{key}' not found")
-                
-            collection = self._store[collection_name]
-            if key not in collection:
-                raise CacheMissError(f"Key '{key}' not found")
-                
-            value, expire_time = collection[key]
-            if expire_time and time.time() > expire_time:
-                collection.pop(key)
-                raise CacheMissError(f"Key '{key}' expired")
-                
-            return value
+        segment = self._get_segment(collection_name, key)
+        cleanup = self._janitor is None
+
+        # Lock-free lookup, a dict read is atomic and entries are never mutated in place
+        entry = segment.lookup(key)
+        if entry is None:
+            segment.record_read(None, cleanup)
+            raise CacheMissError(f"Key '{key}' not found")
+
+        value, expire_time = entry
+        if expire_time and time.time() > expire_time:
+            segment.expire(key, entry)
+            raise CacheMissError(f"Key '{key}' expired")
+
+        segment.record_read(key, cleanup)
+        return value
 
     def set(
         self,
@@ -78,25 +625,71 @@ class MemoryBackend(BaseBackend):
         collection_name: str,
         ttl: int = None,
     ) -> None:
-        collection_name = collection_name
         expire_time = time.time() + ttl if ttl is not None else None
-        
-        with self._get_collection_lock(collection_name):
-            if collection_name not in self._store:
-                self._store[collection_name] = OrderedDict()
-            
-            collection = self._store[collection_name]
-            
-            # Enforce max entries limit using FIFO
-            if (
-                self.max_entries 
-                and len(collection) >= self.max_entries 
-                and key not in collection
-            ):
-                collection.popitem(last=False)
-            
-            collection[key] = (value, expire_time)
-            self._cleanup_expired(collection_name)
+        segment = self._get_segment(collection_name, key)
+
+        with segment.lock:
+            segment.drain_reads()
+            segment.store(key, value, expire_time)
+            if self._janitor is None:
+                segment.cleanup_expired()
+
+    def _group_by_segment(self, collection_name: str, keys: Iterable[str]) -> Dict[_Segment, list]:
+        """Keys grouped by the segment responsible for them, so each lock is taken once"""
+        groups: Dict[_Segment, list] = {}
+        for key in keys:
+            groups.setdefault(self._get_segment(collection_name, key), []).append(key)
+        return groups
+
+    def get_many(
+        self,
+        keys: Iterable[str],
+        collection_name: str,
+    ) -> Dict[str, bytes]:
+        cleanup = self._janitor is None
+        now = time.time()
+        found = {}
+        for key in keys:
+            segment = self._get_segment(collection_name, key)
+            entry = segment.lookup(key)
+            if entry is None:
+                segment.record_read(None, cleanup)
+                continue
+            value, expire_time = entry
+            if expire_time and now > expire_time:
+                segment.expire(key, entry)
+                continue
+            segment.record_read(key, cleanup)
+            found[key] = value
+        return found
+
+    def set_many(
+        self,
+        items: Dict[str, bytes],
+        ttl: int = None,
+        collection_name: str = None,
+    ) -> None:
+        expire_time = time.time() + ttl if ttl is not None else None
+        for segment, keys in self._group_by_segment(collection_name, items).items():
+            with segment.lock:
+                segment.drain_reads()
+                for key in keys:
+                    segment.store(key, items[key], expire_time)
+                if self._janitor is None:
+                    segment.cleanup_expired()
+
+    def delete_many(
+        self,
+        keys: Iterable[str],
+        collection_name: str = None,
+    ) -> None:
+        collection_name = collection_name or "default"
+        for segment, segment_keys in self._group_by_segment(collection_name, keys).items():
+            with segment.lock:
+                for key in segment_keys:
+                    segment.discard(key)
+                if self._janitor is None:
+                    segment.cleanup_expired()
 
     def delete(
         self,
@@ -104,11 +697,12 @@ class MemoryBackend(BaseBackend):
         collection_name: str
     ) -> None:
         collection_name = collection_name or "default"
-        
-        with self._get_collection_lock(collection_name):
-            if collection_name in self._store:
-                self._store[collection_name].pop(key, None)
-            self._cleanup_expired(collection_name)
+        segment = self._get_segment(collection_name, key)
+
+        with segment.lock:
+            segment.discard(key)
+            if self._janitor is None:
+                segment.cleanup_expired()
 
     def clear(
         self,
@@ -119,13 +713,11 @@ class MemoryBackend(BaseBackend):
         context_scope_str = get_context_scope_string(context, scope)
         collections = [collection_name] if collection_name else list(self._store.keys())
         for collection_name in collections:
-            with self._get_collection_lock(collection_name):
-                if scope == CacheScope.GLOBAL.value:
-                    self._store.pop(collection_name, None)
-                    with self._collection_locks_lock:
-                        self._collection_locks.pop(collection_name, None)
-                    continue
-                self._store[collection_name] = OrderedDict({
-                    k: v for k, v in self._store.get(collection_name, {}).items()
-                    if not k.startswith(context_scope_str)
-                })
\ No newline at end of file
+            if scope == CacheScope.GLOBAL.value:
+                self._store.pop(collection_name, None)
+                continue
+            # Organization scope strings look like 'root_user_id:', user scope 'root_user_id:user_id'
+            user_scope = scope == CacheScope.USER.value
+            token = context_scope_str if user_scope else context_scope_str.rstrip(":")
+            for segment in self._store.get(collection_name, []):
+                segment.clear_scope(token, user_scope)
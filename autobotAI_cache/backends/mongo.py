@@ -1,7 +1,8 @@
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 import pymongo
-from pymongo import MongoClient
+from pymongo import DeleteOne, InsertOne, MongoClient, ReplaceOne
 from pymongo.errors import ConnectionFailure
 from autobotAI_cache.backends.base import BaseBackend
 from autobotAI_cache.core.exceptions import CacheMissError
@@ -9,7 +10,200 @@ from autobotAI_cache.core.models import CacheScope, UserContext
 from autobotAI_cache.utils.helpers import get_context_scope_string
 
 
-class MongoDBBackend(BaseBackend):
+# (keys, options) of the indexes every cache collection has
+INDEXES = [
+    (
+        [
+            ("key_hash", pymongo.ASCENDING),
+            ("root_user_id", pymongo.ASCENDING),
+            ("user_id", pymongo.ASCENDING),
+        ],
+        {"unique": True, "sparse": True},
+    ),
+    ([("expire_at", pymongo.ASCENDING)], {"expireAfterSeconds": 0}),
+    ([("created_at", pymongo.ASCENDING)], {}),
+]
+
+# Collection holding the lease documents of acquire_lock, expired leases are removed by a TTL index
+LOCKS_COLLECTION = "__locks__"
+
+
+class MongoDocumentsMixin:
+    """Document layout shared by the sync and asyncio MongoDB backends"""
+
+    def _collection_options(self) -> dict:
+        """Options of create_collection"""
+        if self.max_entries is None:
+            # Create regular (non-capped) collection
+            return {}
+        # Create capped collection with both size and max parameters
+        return {
+            "capped": True,
+            "size": self.max_entries * 1024,  # Size in bytes
+            "max": self.max_entries,
+        }
+
+    def _parse_key(
+        self, key: str
+    ) -> tuple[str, Optional[str], Optional[str], CacheScope]:
+        parts = [part for part in key.split(":", 2) if part]
+        if len(parts) == 3:  # root_user_id:user_id:key_hash
+            return parts[2], parts[0], parts[1], CacheScope.USER
+        elif len(parts) == 2:
+            if parts[0] == CacheScope.GLOBAL.value:  # global:key_hash
+                return parts[1], None, None, CacheScope.GLOBAL
+            return (
+                parts[1],
+                parts[0],
+                None,
+                CacheScope.ORGANIZATION,
+            )  # root_user_id::key_hash
+
+    def _build_query(self, key: str) -> dict:
+        """Query matching the document of a key in its scope"""
+        key_hash, root_user_id, user_id, scope = self._parse_key(key)
+
+        query = {"key_hash": key_hash}
+        if scope == CacheScope.GLOBAL:
+            pass
+        elif scope == CacheScope.ORGANIZATION:
+            query.update(
+                {"root_user_id": root_user_id}
+            )
+        else:  # USER scope
+            query.update(
+                {
+                    "root_user_id": root_user_id,
+                    "user_id": user_id,
+                }
+            )
+        return query
+
+    def _build_document(self, key: str, value: Any, ttl: Optional[int], now: datetime) -> dict:
+        """Document stored for a key"""
+        key_hash, root_user_id, user_id, _ = self._parse_key(key)
+        expire_at = now + timedelta(seconds=ttl) if ttl is not None else None
+
+        document = {
+            "key_hash": key_hash,
+            "value": value,
+            "created_at": now,
+            "expire_at": expire_at,
+        }
+        if root_user_id:
+            document["root_user_id"] = root_user_id
+        if user_id:
+            document["user_id"] = user_id
+        return document
+
+    def _build_replace_query(self, document: dict) -> dict:
+        """Query matching the stored document of the same key as document, to replace it"""
+        # Missing scope fields match null, so global keys don't match organization documents
+        return {name: document.get(name) for name in ("key_hash", "root_user_id", "user_id")}
+
+    def _build_writes(
+        self, items: Dict[str, Any], ttl: Optional[int], now: datetime, capped: bool
+    ) -> list:
+        """
+        Bulk write requests storing items over the current documents of their keys. Documents of
+        capped collections can't be replaced by documents of another size, they are deleted and
+        inserted again instead, which needs an ordered bulk write
+        """
+        requests = []
+        for key, value in items.items():
+            document = self._build_document(key, value, ttl, now)
+            query = self._build_replace_query(document)
+            if capped:
+                requests += [DeleteOne(query), InsertOne(document)]
+            else:
+                requests.append(ReplaceOne(query, document, upsert=True))
+        return requests
+
+    def _build_many_query(self, keys: Iterable[str]) -> Tuple[dict, Optional[dict]]:
+        """
+        Key of each (key_hash, root_user_id, user_id) of keys, and the $in query on their key
+        hashes, None without keys
+        """
+        wanted = {}
+        for key in keys:
+            key_hash, root_user_id, user_id, _ = self._parse_key(key)
+            wanted[(key_hash, root_user_id, user_id)] = key
+        if not wanted:
+            return wanted, None
+        hashes = list({key_hash for key_hash, _, _ in wanted})
+        return wanted, {"key_hash": {"$in": hashes}}
+
+    def _collect_many(
+        self, docs: Iterable[dict], wanted: dict
+    ) -> Tuple[Dict[str, Tuple[Any, Optional[float]]], list]:
+        """
+        Value and remaining TTL of each key found by the query of _build_many_query, and the
+        _id of the expired documents
+        """
+        found = {}
+        expired_ids = []
+        for doc in docs:
+            # Other tenants may cache the same hash, only exact scope matches are returned
+            key = wanted.get((doc["key_hash"], doc.get("root_user_id"), doc.get("user_id")))
+            if key is None:
+                continue
+            if self._is_expired(doc):
+                expired_ids.append(doc["_id"])
+                continue
+            found[key] = (doc["value"], self._remaining_ttl(doc))
+        return found, expired_ids
+
+    @staticmethod
+    def _report_write_error(error: pymongo.errors.PyMongoError) -> None:
+        if isinstance(error, pymongo.errors.BulkWriteError):
+            print(f"Error inserting cache: {error.details.get('writeErrors', [])}")
+        else:
+            print(f"Error inserting cache: {error}")
+
+    def _build_clear_query(self, context, scope: CacheScope) -> dict:
+        """Query matching the documents of an organization or user"""
+        context_scope_str = get_context_scope_string(context, scope)
+        query = {}
+        if scope == CacheScope.ORGANIZATION:
+            query["root_user_id"] = context_scope_str.split(":")[0]
+        elif scope == CacheScope.USER:
+            query["root_user_id"] = context_scope_str.split(":")[0]
+            query["user_id"] = context_scope_str.split(":")[1]
+        return query
+
+    @staticmethod
+    def _get_lock_id(key: str, collection_name: str) -> str:
+        """_id of the lease document of a cache key"""
+        return f"{collection_name}:{key}"
+
+    @staticmethod
+    def _build_lease(ttl: float, now: datetime) -> dict:
+        """Fields of a new lease, its token identifies the holder"""
+        return {"token": uuid.uuid4().hex, "expire_at": now + timedelta(seconds=ttl)}
+
+    @staticmethod
+    def _is_expired(doc: dict) -> bool:
+        expire_at = doc.get("expire_at")
+        if expire_at:
+            if isinstance(expire_at, datetime) and expire_at.tzinfo is None:
+                expire_at = expire_at.replace(tzinfo=timezone.utc)
+            return expire_at < datetime.now(timezone.utc)
+        return False
+
+    @staticmethod
+    def _remaining_ttl(doc: dict) -> Optional[float]:
+        """Seconds until a document expires, None if it doesn't"""
+        expire_at = doc.get("expire_at")
+        if not expire_at:
+            return None
+        if isinstance(expire_at, datetime) and expire_at.tzinfo is None:
+            expire_at = expire_at.replace(tzinfo=timezone.utc)
+        return (expire_at - datetime.now(timezone.utc)).total_seconds()
+
+
+class MongoDBBackend(MongoDocumentsMixin, BaseBackend):
+    supports_locks = True
+
     def __init__(
         self,
         mongo_client: MongoClient,
@@ -23,6 +217,7 @@ class MongoDBBackend(BaseBackend):
         self.max_entries = max_entries
         self._collection = None
         self._db = None
+        self._locks_ready = False
         self._ensure_db()
 
     def _is_client_active(self, client: MongoClient) -> bool:
@@ -48,85 +243,51 @@ class MongoDBBackend(BaseBackend):
         collection = self._db[collection_name]
 
         if collection.name not in self._db.list_collection_names():
-            if self.max_entries is None:
-                # Create regular (non-capped) collection
-                self._db.create_collection(collection.name)
-            else:
-                # Create capped collection with both size and max parameters
-                self._db.create_collection(
-                    collection.name,
-                    capped=True,
-                    size=self.max_entries * 1024,  # Size in bytes
-                    max=self.max_entries,
-                )
+            self._db.create_collection(collection.name, **self._collection_options())
 
         # Ensure all required indexes exist
-        collection.create_index(
-            [
-                ("key_hash", pymongo.ASCENDING),
-                ("root_user_id", pymongo.ASCENDING),
-                ("user_id", pymongo.ASCENDING),
-            ],
-            unique=True,
-            sparse=True,
-        )
-
-        collection.create_index(
-            [("expire_at", pymongo.ASCENDING)], expireAfterSeconds=0
-        )
-        collection.create_index([("created_at", pymongo.ASCENDING)])
+        for keys, options in INDEXES:
+            collection.create_index(keys, **options)
 
         self._collection = collection
 
-    def _parse_key(
-        self, key: str
-    ) -> tuple[str, Optional[str], Optional[str], CacheScope]:
-        parts = [part for part in key.split(":", 2) if part]
-        if len(parts) == 3:  # root_user_id:user_id:key_hash
-            return parts[2], parts[0], parts[1], CacheScope.USER
-        elif len(parts) == 2:
-            if parts[0] == CacheScope.GLOBAL.value:  # global:key_hash
-                return parts[1], None, None, CacheScope.GLOBAL
-            return (
-                parts[1],
-                parts[0],
-                None,
-                CacheScope.ORGANIZATION,
-            )  # root_user_id::key_hash
-
     def get(self, key: str, collection_name: str) -> Any:
-        self._ensure_collection_and_indexes(collection_name)
+        return self.get_with_ttl(key, collection_name)[0]
 
-        key_hash, root_user_id, user_id, scope = self._parse_key(key)
+    def get_with_ttl(self, key: str, collection_name: str) -> Tuple[Any, Optional[float]]:
+        """Get a value and the seconds left until the expire_at of its document"""
+        self._ensure_collection_and_indexes(collection_name)
 
-        query = {"key_hash": key_hash}
-        if scope == CacheScope.GLOBAL:
-            pass
-        elif scope == CacheScope.ORGANIZATION:
-            query.update(
-                {"root_user_id": root_user_id}
-            )
-        else:  # USER scope
-            query.update(
-                {
-                    "root_user_id": root_user_id,
-                    "user_id": user_id
-                }
-            )
+        query = self._build_query(key)
 
         doc = self._collection.find_one(query)
         if not doc:
             raise CacheMissError(f"Key '{key}' not found")
 
-        expire_at = doc.get("expire_at")
-        if expire_at:
-            if isinstance(expire_at, datetime) and expire_at.tzinfo is None:
-                expire_at = expire_at.replace(tzinfo=timezone.utc)
-            if expire_at < datetime.now(timezone.utc):
-                self._collection.delete_one(query)
-                raise CacheMissError(f"Key '{key}' expired")
+        if self._is_expired(doc):
+            self._collection.delete_one(query)
+            raise CacheMissError(f"Key '{key}' expired")
+
+        return doc["value"], self._remaining_ttl(doc)
 
-        return doc["value"]
+    def get_many(self, keys: Iterable[str], collection_name: str) -> Dict[str, Any]:
+        """Fetch several keys with a single $in query on the key hashes"""
+        found = self.get_many_with_ttl(keys, collection_name)
+        return {key: value for key, (value, _) in found.items()}
+
+    def get_many_with_ttl(
+        self, keys: Iterable[str], collection_name: str
+    ) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """get_many, together with the seconds left until the expire_at of each document"""
+        wanted, query = self._build_many_query(keys)
+        if query is None:
+            return {}
+        self._ensure_collection_and_indexes(collection_name)
+
+        found, expired_ids = self._collect_many(self._collection.find(query), wanted)
+        if expired_ids:
+            self._collection.delete_many({"_id": {"$in": expired_ids}})
+        return found
 
     def set(
         self,
@@ -136,35 +297,48 @@ class MongoDBBackend(BaseBackend):
         collection_name: str = None,
     ) -> None:
         self._ensure_collection_and_indexes(collection_name)
+        capped = self._is_capped()
 
-        key_hash, root_user_id, user_id, scope = self._parse_key(key)
+        document = self._build_document(key, value, ttl, datetime.now(timezone.utc))
+        query = self._build_replace_query(document)
 
-        now = datetime.now(timezone.utc)
-        expire_at = now + timedelta(seconds=ttl) if ttl is not None else None
+        try:
+            # Overwrites the current document, i.e. of a result refreshed before it expired
+            if capped:
+                self._collection.delete_one(query)
+                self._collection.insert_one(document)
+            else:
+                self._collection.replace_one(query, document, upsert=True)
+        except pymongo.errors.PyMongoError as e:
+            self._report_write_error(e)
 
-        # Build the document to insert
-        document = {
-            "key_hash": key_hash,
-            "value": value,
-            "created_at": now,
-            "expire_at": expire_at,
-        }
-        if root_user_id:
-            document["root_user_id"] = root_user_id
-        if user_id:
-            document["user_id"] = user_id
+        if self.max_entries is not None and not capped:
+            self._enforce_max_entries()
 
+    def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        collection_name: str = None,
+    ) -> None:
+        """Upsert several documents with a single bulk_write, overwriting existing keys"""
+        if not items:
+            return
+        self._ensure_collection_and_indexes(collection_name)
+        capped = self._is_capped()
+
+        requests = self._build_writes(items, ttl, datetime.now(timezone.utc), capped)
         try:
-            self._collection.insert_one(document)
-        except pymongo.errors.DuplicateKeyError:
-            # This should not happen since get() ensures absence
-            print(f"Key '{key}' already exists. Insertion skipped.")
+            self._collection.bulk_write(requests, ordered=capped)
         except pymongo.errors.PyMongoError as e:
-            print(f"Error inserting cache: {e}")
+            self._report_write_error(e)
+
+        if self.max_entries is not None and not capped:
+            self._enforce_max_entries()
 
-        if self.max_entries is not None:
-            if not self._collection.options().get("capped", False):
-                self._enforce_max_entries()
+    def _is_capped(self) -> bool:
+        """Whether the current collection is capped, collections are only capped with max_entries"""
+        return self.max_entries is not None and self._collection.options().get("capped", False)
 
     def _enforce_max_entries(self) -> None:
         try:
@@ -187,26 +361,46 @@ class MongoDBBackend(BaseBackend):
     def delete(self, key: str, collection_name: str) -> None:
         self._ensure_collection_and_indexes(collection_name)
 
-        key_hash, root_user_id, user_id, scope = self._parse_key(key)
+        result = self._collection.delete_one(self._build_query(key))
+        if result.deleted_count == 0:
+            raise CacheMissError(f"Key '{key}' not found")
 
-        query = {"key_hash": key_hash}
-        if scope == CacheScope.GLOBAL:
-            pass
-        elif scope == CacheScope.ORGANIZATION:
-            query.update(
-                {"root_user_id": root_user_id}
-            )
-        else:  # USER scope
-            query.update(
-                {
-                    "root_user_id": root_user_id,
-                    "user_id": user_id,
-                }
+    def delete_many(self, keys: Iterable[str], collection_name: str = None) -> None:
+        """Delete several keys with a single unordered bulk_write"""
+        requests = [DeleteOne(self._build_query(key)) for key in keys]
+        if not requests:
+            return
+        self._ensure_collection_and_indexes(collection_name)
+        self._collection.bulk_write(requests, ordered=False)
+
+    def _get_locks_collection(self):
+        locks = self._db[LOCKS_COLLECTION]
+        if not self._locks_ready:
+            locks.create_index([("expire_at", pymongo.ASCENDING)], expireAfterSeconds=0)
+            self._locks_ready = True
+        return locks
+
+    def acquire_lock(self, key: str, ttl: float, collection_name: str = None) -> Optional[str]:
+        """Insert a lease document, or take over the lease if its holder let it expire"""
+        locks = self._get_locks_collection()
+        lock_id = self._get_lock_id(key, collection_name)
+        now = datetime.now(timezone.utc)
+        lease = self._build_lease(ttl, now)
+        try:
+            locks.insert_one({"_id": lock_id, **lease})
+            return lease["token"]
+        except pymongo.errors.DuplicateKeyError:
+            # The TTL monitor only runs every minute, expired leases can still be present
+            taken = locks.find_one_and_update(
+                {"_id": lock_id, "expire_at": {"$lte": now}}, {"$set": lease}
             )
+            return lease["token"] if taken else None
 
-        result = self._collection.delete_one(query)
-        if result.deleted_count == 0:
-            raise CacheMissError(f"Key '{key}' not found")
+    def release_lock(self, key: str, token: str, collection_name: str = None) -> None:
+        """Delete the lease document if it is still ours"""
+        self._get_locks_collection().delete_one(
+            {"_id": self._get_lock_id(key, collection_name), "token": token}
+        )
 
     def clear(
         self,
@@ -214,16 +408,12 @@ class MongoDBBackend(BaseBackend):
         context = None,
         scope: CacheScope = CacheScope.ORGANIZATION,
     ) -> None:
-        context_scope_str = get_context_scope_string(context, scope)
-        collections = [collection_name] if collection_name else self._db.list_collection_names()
+        query = self._build_clear_query(context, scope)
+        # Leases of in-flight computations aren't cached results
+        collections = [collection_name] if collection_name else [
+            name for name in self._db.list_collection_names() if name != LOCKS_COLLECTION
+        ]
         for collection in collections:
-            query = {}
-            if scope == CacheScope.ORGANIZATION:
-                query["root_user_id"] = context_scope_str.split(":")[0]
-            elif scope == CacheScope.USER:
-                query["root_user_id"] = context_scope_str.split(":")[0]
-                query["user_id"] = context_scope_str.split(":")[1]
-            
             self._collection = self._db[collection]
             self._collection.delete_many(query)
             print(f"Cache cleared for collection: {collection}")
@@ -0,0 +1,83 @@
+import copy
+from typing import Any, Dict, Iterable, Optional
+
+from autobotAI_cache.backends.memory import MemoryBackend
+
+
+COPY_MODES = {
+    "none": None,
+    "shallow": copy.copy,
+    "deep": copy.deepcopy,
+}
+
+
+class ObjectMemoryBackend(MemoryBackend):
+    """
+    In-memory cache backend storing live Python objects instead of serialized bytes.
+
+    Hits return the cached object without unpickling it. `copy_on_read` controls what callers
+    receive:
+
+    - 'none': the cached object itself. Callers must not mutate it
+    - 'shallow': a copy.copy() of the cached object
+    - 'deep': a copy.deepcopy() of the cached object. The stored value is deep copied as well,
+      so mutating the object a function returned doesn't change the cache
+
+    Sizes of objects aren't known, so only `max_entries` limits the cache.
+    """
+
+    stores_objects = True
+
+    def __init__(self, copy_on_read: str = "none", **options):
+        if copy_on_read not in COPY_MODES:
+            raise ValueError(f"Invalid copy_on_read mode: {copy_on_read}")
+        if options.get("max_bytes") is not None or options.get("max_entry_bytes") is not None:
+            raise ValueError("ObjectMemoryBackend does not support max_bytes or max_entry_bytes")
+        super().__init__(**options)
+        self.copy_on_read = copy_on_read
+        self._copy = COPY_MODES[copy_on_read]
+
+    @staticmethod
+    def _value_size(value) -> int:
+        return 0
+
+    def get(
+        self,
+        key: str,
+        collection_name: str,
+    ) -> Any:
+        value = super().get(key, collection_name)
+        if self._copy is not None:
+            return self._copy(value)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        collection_name: str,
+        ttl: Optional[int] = None,
+    ) -> None:
+        if self.copy_on_read == "deep":
+            value = copy.deepcopy(value)
+        super().set(key, value, collection_name, ttl)
+
+    def get_many(
+        self,
+        keys: Iterable[str],
+        collection_name: str,
+    ) -> Dict[str, Any]:
+        found = super().get_many(keys, collection_name)
+        if self._copy is not None:
+            return {key: self._copy(value) for key, value in found.items()}
+        return found
+
+    def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        collection_name: str = None,
+    ) -> None:
+        if self.copy_on_read == "deep":
+            items = {key: copy.deepcopy(value) for key, value in items.items()}
+        super().set_many(items, ttl, collection_name)
@@ -1,93 +1,391 @@
+import time
+import uuid
 import redis
 from datetime import timedelta
-from typing import Optional, Any
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 from autobotAI_cache.backends.base import BaseBackend
 from autobotAI_cache.core.exceptions import CacheMissError
 from autobotAI_cache.core.models import CacheScope, UserContext
 from autobotAI_cache.utils.helpers import get_context_scope_string
 
 
-class RedisBackend(BaseBackend):
+# Stores a value, records it in the collection indexes and trims the index, atomically.
+# KEYS: namespaced key, index key, expiry index key. ARGV: value, ttl in ms (0 for none), score
+# (the current time), max entries, 1 to keep the score of an existing key (insertion order) or
+# 0 to refresh it (LRU)
+SET_AND_TRIM_SCRIPT = """
+local existed = redis.call('EXISTS', KEYS[1])
+local now = tonumber(ARGV[3])
+if tonumber(ARGV[2]) > 0 then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    redis.call('ZADD', KEYS[3], now + tonumber(ARGV[2]) / 1000, KEYS[1])
+else
+    redis.call('SET', KEYS[1], ARGV[1])
+    redis.call('ZREM', KEYS[3], KEYS[1])
+end
+if existed == 1 and ARGV[5] == '1' then
+    redis.call('ZADD', KEYS[2], 'NX', ARGV[3], KEYS[1])
+else
+    redis.call('ZADD', KEYS[2], ARGV[3], KEYS[1])
+end
+-- Drop the keys Redis already expired from the index, they must not count as entries
+local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now)
+for i = 1, #expired, 1000 do
+    redis.call('ZREM', KEYS[2], unpack(expired, i, math.min(i + 999, #expired)))
+end
+if #expired > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now)
+end
+local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[4])
+if excess > 0 then
+    local popped = redis.call('ZPOPMIN', KEYS[2], excess)
+    for i = 1, #popped, 2 do
+        redis.call('UNLINK', popped[i])
+        redis.call('ZREM', KEYS[3], popped[i])
+    end
+end
+return excess
+"""
+
+# Deletes a lock only if it is still held by the given token.
+# KEYS: lock key. ARGV: token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+EVICTION_POLICIES = ("fifo", "lru")
+
+
+class RedisKeyspaceMixin:
+    """Options and key layout shared by the sync and asyncio Redis backends"""
+
+    def _init_options(self, max_entries: Optional[int], scan_count: int, eviction: str) -> None:
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Invalid eviction policy: {eviction}")
+        self.max_entries = max_entries
+        self.scan_count = scan_count
+        self.eviction = eviction
+
+    def _set_and_trim_args(self, value: Any, ttl: Optional[int], score: float) -> list:
+        """ARGV of SET_AND_TRIM_SCRIPT"""
+        return [
+            value,
+            int(ttl * 1000) if ttl else 0,
+            score,
+            self.max_entries,
+            1 if self.eviction == "fifo" else 0,
+        ]
+
+    def _get_namespaced_key(self, key: str, collection_name: str) -> str:
+        """Generate a namespaced key for Redis storage"""
+        return f"{collection_name}:{key}"
+
+    def _get_index_key(self, collection_name: str) -> str:
+        """Sorted set of the collection's keys scored by write or read time"""
+        return f"{collection_name}:__index__"
+
+    def _get_expiry_key(self, collection_name: str) -> str:
+        """Sorted set of the collection's keys that have a TTL, scored by expiry time"""
+        return f"{collection_name}:__expiry__"
+
+    def _set_and_trim_keys(self, namespaced_key: str, collection_name: str) -> list:
+        """KEYS of SET_AND_TRIM_SCRIPT"""
+        return [
+            namespaced_key,
+            self._get_index_key(collection_name),
+            self._get_expiry_key(collection_name),
+        ]
+
+    def _get_lock_key(self, key: str, collection_name: str) -> str:
+        """Key of the lease taken on a cache key"""
+        return f"{collection_name}:__lock__:{key}"
+
+    @staticmethod
+    def _new_lock_token() -> str:
+        return uuid.uuid4().hex
+
+    def _unindex(self, pipe, keys: list, collection_name: Optional[str]) -> None:
+        """Queue the removal of cleared keys from their collection indexes"""
+        by_collection = {}
+        for key in keys:
+            if collection_name is None:
+                name = key.decode() if isinstance(key, bytes) else key
+                by_collection.setdefault(name.split(":", 1)[0], []).append(key)
+            else:
+                by_collection.setdefault(collection_name, []).append(key)
+        for name, members in by_collection.items():
+            self._unindex_members(pipe, members, name)
+
+    def _unindex_members(self, pipe, members: list, collection_name: str) -> None:
+        """Queue the removal of namespaced keys from the indexes of their collection"""
+        pipe.zrem(self._get_index_key(collection_name), *members)
+        pipe.zrem(self._get_expiry_key(collection_name), *members)
+
+    @property
+    def _reads_refresh_recency(self) -> bool:
+        """Whether reads move keys to the end of the index, for LRU eviction"""
+        return self.max_entries is not None and self.eviction == "lru"
+
+    def _queue_reads(
+        self, pipe, namespaced_keys: list, collection_name: str, with_ttl: bool = False
+    ) -> None:
+        """Queue an MGET of namespaced keys, their PTTLs with with_ttl, and the LRU recency refresh"""
+        pipe.mget(namespaced_keys)
+        if with_ttl:
+            for namespaced_key in namespaced_keys:
+                pipe.pttl(namespaced_key)
+        if self._reads_refresh_recency:
+            # XX so misses aren't indexed
+            now = time.time()
+            pipe.zadd(
+                self._get_index_key(collection_name),
+                {namespaced_key: now for namespaced_key in namespaced_keys},
+                xx=True,
+            )
+
+    @staticmethod
+    def _found_with_ttl(keys: list, results: list) -> Dict[str, Tuple[bytes, Optional[float]]]:
+        """Values and remaining TTLs of the keys found, from the results of _queue_reads with_ttl"""
+        found = {}
+        for key, value, pttl in zip(keys, results[0], results[1:]):
+            # PTTL is -1 for keys without a TTL, -2 for keys that expired after the MGET
+            if value is not None and pttl != -2:
+                found[key] = (value, pttl / 1000 if pttl >= 0 else None)
+        return found
+
+    def _trimmed_writes(self, items: Dict[str, Any], ttl: Optional[int], collection_name: str):
+        """KEYS and ARGV of the SET_AND_TRIM_SCRIPT call writing each item"""
+        now = time.time()
+        for position, (key, value) in enumerate(items.items()):
+            # Keep the batch order, equal scores would be evicted by member name
+            namespaced_key = self._get_namespaced_key(key, collection_name)
+            yield (
+                self._set_and_trim_keys(namespaced_key, collection_name),
+                self._set_and_trim_args(value, ttl, now + position * 1e-6),
+            )
+
+    def _queue_writes(
+        self, pipe, items: Dict[str, Any], ttl: Optional[int], collection_name: str
+    ) -> None:
+        """Queue plain SETs of items, when no index is kept"""
+        for key, value in items.items():
+            namespaced_key = self._get_namespaced_key(key, collection_name)
+            if ttl:
+                pipe.setex(namespaced_key, timedelta(seconds=ttl), value)
+            else:
+                pipe.set(namespaced_key, value)
+
+    def _queue_clear_page(
+        self, pipe, keys: list, cursor: int, pattern: str, collection_name: Optional[str]
+    ) -> None:
+        """Queue the UNLINK of a SCAN page of keys, and the SCAN of the next page"""
+        if keys:
+            pipe.unlink(*keys)
+            if self.max_entries is not None:
+                self._unindex(pipe, keys, collection_name)
+        if cursor:
+            pipe.scan(cursor, match=pattern, count=self.scan_count)
+
+    @staticmethod
+    def _report_cleared(pattern: str, removed: int) -> None:
+        if removed:
+            print(f"Cache cleared for pattern: {pattern}, {removed} keys removed")
+        else:
+            print(f"No matching keys found for pattern: {pattern}")
+
+    @staticmethod
+    def _miss(key: str, collection_name: str) -> CacheMissError:
+        return CacheMissError(f"Key '{key}' not found in collection '{collection_name}'")
+
+    def _get_namespaced_pattern(
+        self, collection_name: str, context: Optional[UserContext], scope: CacheScope
+    ) -> str:
+        """Generate a pattern to match keys for clearing the cache"""
+        if collection_name is None:
+            collection_name = "*"
+        scope_str = get_context_scope_string(context, scope).strip(":") if context else "*"
+        scope_str = scope_str.strip(":")
+        return f"{collection_name}:{scope_str}:*"
+
+
+class RedisBackend(RedisKeyspaceMixin, BaseBackend):
+    supports_locks = True
+
     def __init__(
         self,
         host="localhost",
         port=6379,
         db=0,
         max_entries: Optional[int] = None,
+        scan_count: int = 1000,
+        eviction: str = "fifo",
         **kwargs,
     ):
-        """Initialize Redis client"""
+        """
+        Initialize Redis client
+
+        :param max_entries: Maximum number of entries per collection
+        :param scan_count: COUNT hint of the SCAN calls used by clear, i.e. keys examined per round trip
+        :param eviction: Entries evicted beyond max_entries, 'fifo' (oldest write) or 'lru' (least recently read)
+        """
+        self._init_options(max_entries, scan_count, eviction)
         self.client = redis.Redis(host=host, port=port, db=db, **kwargs)
-        self.max_entries = max_entries
+        self._set_and_trim = self.client.register_script(SET_AND_TRIM_SCRIPT)
+        self._release_lock = self.client.register_script(RELEASE_LOCK_SCRIPT)
 
     def get(self, key: str, collection_name: str) -> bytes:
         """Get a value from cache by key"""
         namespaced_key = self._get_namespaced_key(key, collection_name)
-        value = self.client.get(namespaced_key)
+        if self._reads_refresh_recency:
+            # Refresh the recency of the key in the same round trip
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_reads(pipe, [namespaced_key], collection_name)
+            value = pipe.execute()[0][0]
+        else:
+            value = self.client.get(namespaced_key)
         if value is None:
-            raise CacheMissError(
-                f"Key '{key}' not found in collection '{collection_name}'"
-            )
+            raise self._miss(key, collection_name)
         return value
 
     def set(self, key: str, value: Any, collection_name: str, ttl: int = None) -> None:
         """Set a value in cache with optional TTL"""
         namespaced_key = self._get_namespaced_key(key, collection_name)
+
+        # Enforce max_entries limit if specified, the index is trimmed by the same script
+        if self.max_entries is not None:
+            self._set_and_trim(
+                keys=self._set_and_trim_keys(namespaced_key, collection_name),
+                args=self._set_and_trim_args(value, ttl, time.time()),
+            )
+            return
+
         # Set with or without TTL based on the provided value
         if ttl:
             self.client.setex(namespaced_key, timedelta(seconds=ttl), value)
         else:
             self.client.set(namespaced_key, value)
 
-        # Enforce max_entries limit if specified
-        if self.max_entries is not None:
-            self._enforce_max_entries(collection_name)
-
     def delete(self, key: str, collection_name: str) -> None:
         """Delete a value from cache by key"""
         namespaced_key = self._get_namespaced_key(key, collection_name)
-        result = self.client.delete(namespaced_key)
+        if self.max_entries is not None:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.delete(namespaced_key)
+            self._unindex_members(pipe, [namespaced_key], collection_name)
+            result = pipe.execute()[0]
+        else:
+            result = self.client.delete(namespaced_key)
         if result == 0:
-            raise CacheMissError(
-                f"Key '{key}' not found in collection '{collection_name}'"
-            )
+            raise self._miss(key, collection_name)
+
+    def get_many(self, keys: Iterable[str], collection_name: str) -> Dict[str, bytes]:
+        """Get several values with a single MGET"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        namespaced_keys = [self._get_namespaced_key(key, collection_name) for key in keys]
+        if self._reads_refresh_recency:
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_reads(pipe, namespaced_keys, collection_name)
+            values = pipe.execute()[0]
+        else:
+            values = self.client.mget(namespaced_keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def get_with_ttl(self, key: str, collection_name: str) -> Tuple[bytes, Optional[float]]:
+        """Get a value and its remaining TTL in one round trip"""
+        found = self.get_many_with_ttl([key], collection_name)
+        if key not in found:
+            raise self._miss(key, collection_name)
+        return found[key]
+
+    def get_many_with_ttl(
+        self, keys: Iterable[str], collection_name: str
+    ) -> Dict[str, Tuple[bytes, Optional[float]]]:
+        """Get several values with a MGET and their remaining TTLs with PTTLs, pipelined"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        namespaced_keys = [self._get_namespaced_key(key, collection_name) for key in keys]
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_reads(pipe, namespaced_keys, collection_name, with_ttl=True)
+        return self._found_with_ttl(keys, pipe.execute())
+
+    def set_many(
+        self, items: Dict[str, Any], ttl: int = None, collection_name: str = None
+    ) -> None:
+        """Set several values in one pipelined round trip"""
+        if not items:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        if self.max_entries is not None:
+            for keys, args in self._trimmed_writes(items, ttl, collection_name):
+                self._set_and_trim(keys=keys, args=args, client=pipe)
+        else:
+            self._queue_writes(pipe, items, ttl, collection_name)
+        pipe.execute()
+
+    def delete_many(self, keys: Iterable[str], collection_name: str = None) -> None:
+        """Delete several values with a single UNLINK"""
+        namespaced_keys = [self._get_namespaced_key(key, collection_name) for key in keys]
+        if not namespaced_keys:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        pipe.unlink(*namespaced_keys)
+        if self.max_entries is not None:
+            self._unindex_members(pipe, namespaced_keys, collection_name)
+        pipe.execute()
+
+    def acquire_lock(self, key: str, ttl: float, collection_name: str = None) -> Optional[str]:
+        """Take the lease with SET NX PX"""
+        token = self._new_lock_token()
+        if self.client.set(
+            self._get_lock_key(key, collection_name), token, nx=True, px=int(ttl * 1000)
+        ):
+            return token
+        return None
+
+    def release_lock(self, key: str, token: str, collection_name: str = None) -> None:
+        """Delete the lease if it is still ours, in a script so the check and delete are atomic"""
+        self._release_lock(keys=[self._get_lock_key(key, collection_name)], args=[token])
 
     def clear(
         self,
         collection_name: str = None,
         context: Optional[UserContext] = None,
         scope: CacheScope = CacheScope.ORGANIZATION.value,
-    ) -> None:
-        """Clear the cache for a specific collection and scope"""
-        pattern = self._get_namespaced_pattern(collection_name, context, scope)
-        keys = self.client.keys(pattern)
-        if keys:
-            self.client.delete(*keys)
-            print(f"Cache cleared for pattern: {pattern}")
-        else:
-            print(f"No matching keys found for pattern: {pattern}")
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Clear the cache for a specific collection and scope.
 
-    def _get_namespaced_key(self, key: str, collection_name: str) -> str:
-        """Generate a namespaced key for Redis storage"""
-        return f"{collection_name}:{key}"
+        Keys are found incrementally with SCAN instead of KEYS, which would block the server while
+        it walks the whole keyspace. The keys of each SCAN page are removed with UNLINK, pipelined
+        with the request for the next page, so memory is reclaimed in the background and every
+        page costs one round trip.
 
-    def _get_namespaced_pattern(
-        self, collection_name: str, context: Optional[UserContext], scope: CacheScope
-    ) -> str:
-        """Generate a pattern to match keys for clearing the cache"""
-        if collection_name is None:
-            collection_name = "*"
-        scope_str = get_context_scope_string(context, scope).strip(":") if context else "*"
-        scope_str = scope_str.strip(":")
-        return f"{collection_name}:{scope_str}:*"
+        :param progress: Called with the running number of removed keys after each page
+        :return: Number of keys removed
+        """
+        pattern = self._get_namespaced_pattern(collection_name, context, scope)
+        removed = 0
+        cursor, keys = self.client.scan(0, match=pattern, count=self.scan_count)
+        while keys or cursor:
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_clear_page(pipe, keys, cursor, pattern, collection_name)
+            results = pipe.execute()
+            if keys:
+                removed += results[0]
+                if progress is not None:
+                    progress(removed)
+            cursor, keys = results[-1] if cursor else (0, [])
+
+        self._report_cleared(pattern, removed)
+        return removed
 
-    def _enforce_max_entries(self, collection_name: str) -> None:
-        """Enforce the max_entries limit by removing the oldest entries"""
-        keys_pattern = f"{collection_name}:*"
-        keys = self.client.keys(keys_pattern)
-        if len(keys) > self.max_entries:
-            sorted_keys = sorted(keys, key=lambda k: self.client.ttl(k) or float("inf"))
-            excess = len(sorted_keys) - self.max_entries
-            keys_to_remove = sorted_keys[:excess]
-            if keys_to_remove:
-                self.client.delete(*keys_to_remove)
+    def close(self) -> None:
+        """Close the client connection pool"""
+        self.client.close()
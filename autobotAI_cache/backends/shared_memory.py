@@ -0,0 +1,289 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from autobotAI_cache.backends.base import BaseBackend
+from autobotAI_cache.core.exceptions import CacheBackendError, CacheMissError
+from autobotAI_cache.core.models import CacheScope, UserContext
+from autobotAI_cache.utils.helpers import get_context_scope_string
+
+
+MAGIC = b"ABCSHM01"
+# magic, num_buckets, ways, slot_size
+HEADER = struct.Struct("<8sIII")
+HEADER_SIZE = 64
+# seq, state, key_len, value_len, key_hash, expire_at, last_access
+SLOT_HEADER = struct.Struct("<QBxHIQdd")
+SEQ = struct.Struct("<Q")
+ACCESS = struct.Struct("<d")
+ACCESS_OFFSET = 32
+
+EMPTY = 0
+USED = 1
+
+# Byte-range lock used while the segment is created, far beyond any bucket lock
+INIT_LOCK_OFFSET = 1 << 40
+# Attempts a reader makes before treating a slot that keeps changing as a miss
+READ_RETRIES = 64
+
+
+class SharedMemoryBackend(BaseBackend):
+    """
+    Cache backend shared by every process on a host through a memory-mapped file.
+
+    The file is a fixed-size hash table of `num_buckets` buckets with `ways` slots each. A key
+    hashes to one bucket and is stored in any free slot of it (open addressing within the
+    bucket). When the bucket is full, an expired slot is reused or the least recently read slot
+    is evicted.
+
+    Each slot is guarded by a sequence counter: writers make it odd while they update the slot
+    and readers retry when it changed under them, so reads never lock. Writers serialize on the
+    bucket with a thread lock and a POSIX byte-range lock on the file, which also excludes
+    writers in other processes. Values that don't fit in a slot are not cached.
+    """
+
+    in_process = True
+
+    def __init__(
+        self,
+        name: str = "autobotai_cache",
+        directory: Optional[str] = None,
+        num_buckets: int = 1024,
+        ways: int = 8,
+        slot_size: int = 4096,
+    ):
+        if fcntl is None:
+            raise CacheBackendError("SharedMemoryBackend requires a POSIX platform")
+        if slot_size <= SLOT_HEADER.size:
+            raise ValueError(f"slot_size must be larger than {SLOT_HEADER.size} bytes")
+
+        if directory is None:
+            directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        self.path = os.path.join(directory, name)
+        self.num_buckets = num_buckets
+        self.ways = ways
+        self.slot_size = slot_size
+        self.size = HEADER_SIZE + num_buckets * ways * slot_size
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._init_segment()
+            self._mm = mmap.mmap(self._fd, self.size)
+        except Exception:
+            os.close(self._fd)
+            raise
+        self._bucket_locks = [threading.Lock() for _ in range(min(num_buckets, 256))]
+        backend_ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: SharedMemoryBackend._reset_thread_locks(backend_ref))
+
+    @staticmethod
+    def _reset_thread_locks(backend_ref) -> None:
+        # Locks held by other threads at fork time would never be released in the child
+        backend = backend_ref()
+        if backend is not None:
+            backend._bucket_locks = [threading.Lock() for _ in range(len(backend._bucket_locks))]
+
+    def _init_segment(self) -> None:
+        """Size and stamp the file, or validate the layout when another process created it"""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, INIT_LOCK_OFFSET)
+        try:
+            header = os.pread(self._fd, HEADER.size, 0)
+            expected = (MAGIC, self.num_buckets, self.ways, self.slot_size)
+            if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+                os.ftruncate(self._fd, self.size)
+                os.pwrite(self._fd, HEADER.pack(*expected), 0)
+            elif HEADER.unpack(header) != expected:
+                raise CacheBackendError(
+                    f"Shared cache '{self.path}' exists with a different layout {HEADER.unpack(header)[1:]}"
+                )
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, INIT_LOCK_OFFSET)
+
+    def close(self) -> None:
+        """Unmap the segment, the data stays available to other processes"""
+        if self._mm is not None:
+            self._mm.close()
+            os.close(self._fd)
+            self._mm = None
+
+    def destroy(self) -> None:
+        """Unmap and remove the segment for every process"""
+        self.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _encode_key(key: str, collection_name: str) -> bytes:
+        return f"{collection_name}\x00{key}".encode()
+
+    @staticmethod
+    def _hash(full_key: bytes) -> int:
+        # Python's hash() is randomized per process, so a stable digest is required
+        return int.from_bytes(hashlib.blake2b(full_key, digest_size=8).digest(), "little")
+
+    def _slot_offset(self, bucket: int, way: int) -> int:
+        return HEADER_SIZE + (bucket * self.ways + way) * self.slot_size
+
+    @contextmanager
+    def _bucket_lock(self, bucket: int):
+        """Exclude writers of the bucket in this process and in other processes"""
+        with self._bucket_locks[bucket % len(self._bucket_locks)]:
+            offset = self._slot_offset(bucket, 0)
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, offset)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, offset)
+
+    def _read_slot(self, offset: int, full_key: bytes, key_hash: int) -> Optional[tuple]:
+        """Consistent (value, expire_at) of a slot holding the key, or None"""
+        mm = self._mm
+        for _ in range(READ_RETRIES):
+            seq, state, key_len, value_len, slot_hash, expire_at, _ = SLOT_HEADER.unpack_from(mm, offset)
+            if seq & 1:
+                continue
+            if state != USED or slot_hash != key_hash:
+                return None
+            start = offset + SLOT_HEADER.size
+            stored_key = mm[start:start + key_len]
+            value = mm[start + key_len:start + key_len + value_len]
+            if SEQ.unpack_from(mm, offset)[0] != seq:
+                continue
+            if stored_key != full_key:
+                return None
+            return value, expire_at
+        return None
+
+    def _write_slot(self, offset: int, full_key: bytes, key_hash: int, value: bytes, expire_at: float) -> None:
+        """Overwrite a slot, caller must hold the bucket lock"""
+        mm = self._mm
+        seq = SEQ.unpack_from(mm, offset)[0]
+        SEQ.pack_into(mm, offset, seq + 1)
+        SLOT_HEADER.pack_into(
+            mm, offset, seq + 1, USED, len(full_key), len(value), key_hash, expire_at, time.time()
+        )
+        start = offset + SLOT_HEADER.size
+        mm[start:start + len(full_key)] = full_key
+        mm[start + len(full_key):start + len(full_key) + len(value)] = value
+        SEQ.pack_into(mm, offset, seq + 2)
+
+    def _clear_slot(self, offset: int) -> None:
+        """Mark a slot empty, caller must hold the bucket lock"""
+        mm = self._mm
+        seq = SEQ.unpack_from(mm, offset)[0]
+        SEQ.pack_into(mm, offset, seq + 1)
+        mm[offset + 8] = EMPTY
+        SEQ.pack_into(mm, offset, seq + 2)
+
+    def _find_slot(self, bucket: int, full_key: bytes, key_hash: int) -> Optional[int]:
+        """Offset of the slot holding the key, caller must hold the bucket lock"""
+        for way in range(self.ways):
+            offset = self._slot_offset(bucket, way)
+            _, state, key_len, _, slot_hash, _, _ = SLOT_HEADER.unpack_from(self._mm, offset)
+            if state == USED and slot_hash == key_hash:
+                start = offset + SLOT_HEADER.size
+                if self._mm[start:start + key_len] == full_key:
+                    return offset
+        return None
+
+    def get(self, key: str, collection_name: str) -> bytes:
+        full_key = self._encode_key(key, collection_name)
+        key_hash = self._hash(full_key)
+        bucket = key_hash % self.num_buckets
+        for way in range(self.ways):
+            offset = self._slot_offset(bucket, way)
+            found = self._read_slot(offset, full_key, key_hash)
+            if found is None:
+                continue
+            value, expire_at = found
+            now = time.time()
+            if expire_at and expire_at <= now:
+                raise CacheMissError(f"Key '{key}' expired")
+            # Recency is only a hint for eviction, so it is updated without the bucket lock
+            ACCESS.pack_into(self._mm, offset + ACCESS_OFFSET, now)
+            return value
+        raise CacheMissError(f"Key '{key}' not found")
+
+    def set(self, key: str, value: bytes, collection_name: str, ttl: int = None) -> None:
+        full_key = self._encode_key(key, collection_name)
+        key_hash = self._hash(full_key)
+        bucket = key_hash % self.num_buckets
+        fits = SLOT_HEADER.size + len(full_key) + len(value) <= self.slot_size
+        expire_at = time.time() + ttl if ttl is not None else 0.0
+
+        with self._bucket_lock(bucket):
+            existing = self._find_slot(bucket, full_key, key_hash)
+            if not fits:
+                # Too large to share, drop the old value so it isn't served stale
+                if existing is not None:
+                    self._clear_slot(existing)
+                return
+            if existing is None:
+                existing = self._choose_slot(bucket)
+            self._write_slot(existing, full_key, key_hash, value, expire_at)
+
+    def _choose_slot(self, bucket: int) -> int:
+        """Pick an empty or expired slot, otherwise evict the least recently read one"""
+        now = time.time()
+        victim, oldest = None, None
+        for way in range(self.ways):
+            offset = self._slot_offset(bucket, way)
+            _, state, _, _, _, expire_at, last_access = SLOT_HEADER.unpack_from(self._mm, offset)
+            if state != USED or (expire_at and expire_at <= now):
+                return offset
+            if oldest is None or last_access < oldest:
+                victim, oldest = offset, last_access
+        return victim
+
+    def delete(self, key: str, collection_name: str) -> None:
+        full_key = self._encode_key(key, collection_name)
+        key_hash = self._hash(full_key)
+        bucket = key_hash % self.num_buckets
+        with self._bucket_lock(bucket):
+            offset = self._find_slot(bucket, full_key, key_hash)
+            if offset is not None:
+                self._clear_slot(offset)
+
+    def clear(
+        self,
+        collection_name: str = None,
+        context: Optional[UserContext] = None,
+        scope: CacheScope = CacheScope.ORGANIZATION.value,
+    ) -> None:
+        """Remove matching entries, this walks every slot of the segment"""
+        context_scope_str = get_context_scope_string(context, scope)
+        collection_prefix = f"{collection_name}\x00".encode() if collection_name else b""
+        if scope == CacheScope.GLOBAL.value:
+            scope_prefix = b""
+        elif scope == CacheScope.USER.value:
+            scope_prefix = f"{context_scope_str}:".encode()
+        else:
+            scope_prefix = context_scope_str.encode()
+        mm = self._mm
+        for bucket in range(self.num_buckets):
+            with self._bucket_lock(bucket):
+                for way in range(self.ways):
+                    offset = self._slot_offset(bucket, way)
+                    if mm[offset + 8] != USED:
+                        continue
+                    key_len = SLOT_HEADER.unpack_from(mm, offset)[2]
+                    start = offset + SLOT_HEADER.size
+                    stored_collection, _, stored_key = mm[start:start + key_len].partition(b"\x00")
+                    if collection_prefix and stored_collection + b"\x00" != collection_prefix:
+                        continue
+                    if stored_key.startswith(scope_prefix):
+                        self._clear_slot(offset)
@@ -0,0 +1,283 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+import redis
+
+from autobotAI_cache.backends.base import BaseBackend
+from autobotAI_cache.backends.invalidation import RedisInvalidationBus
+from autobotAI_cache.core.exceptions import CacheMissError
+from autobotAI_cache.core.models import CacheScope, UserContext
+from autobotAI_cache.utils.payload import unpack
+
+WRITE_POLICIES = ("write_through", "write_around")
+
+
+class TieredBackend(BaseBackend):
+    """
+    Two-level cache backend: a bounded in-process L1 in front of a shared L2 such as Redis or MongoDB.
+
+    Reads are served from L1 when possible, L2 hits are promoted into L1 for at most `l1_ttl`
+    seconds so a process never serves an L1 copy much longer than that after another node
+    changed it, and never past the expiry of the L2 entry. Writes go to L2 and then, depending on `write_policy`, either also to L1
+    ('write_through') or only evict the L1 copy so L1 is filled by reads alone ('write_around').
+    Deletes and scope-aware clears are applied to both tiers.
+
+    With `invalidation`, writes, deletes and clears are also broadcast over Redis pub/sub so
+    other processes drop their L1 copies right away, which makes long `l1_ttl` values safe. An
+    L2 value is not promoted if its key was written, deleted or cleared, here or by another
+    process, while it was being read.
+    """
+
+    def __init__(
+        self,
+        l2: Union[str, BaseBackend] = "redis",
+        l2_options: Optional[dict] = None,
+        l1: str = "memory",
+        l1_options: Optional[dict] = None,
+        l1_ttl: int = 60,
+        write_policy: str = "write_through",
+        invalidation: Union[bool, dict] = False,
+    ):
+        """
+        :param l2: Name of the registered backend used as L2, or a backend instance
+        :param l2_options: Options of the L2 backend when it is given by name
+        :param l1: Name of the registered in-process backend used as L1
+        :param l1_options: Options of the L1 backend, the memory backend defaults to 10000 entries
+            per collection with LRU eviction
+        :param l1_ttl: Longest time in seconds an entry is kept in L1
+        :param write_policy: 'write_through' or 'write_around'
+        :param invalidation: True or options of RedisInvalidationBus (channel, flush_interval,
+            max_batch) to invalidate the L1 copies of other processes. It publishes with the
+            client of a Redis L2, or a client created from its `redis_options`
+        """
+        # Imported here, the registry imports this module
+        from autobotAI_cache.backends import BackendRegistry
+
+        if write_policy not in WRITE_POLICIES:
+            raise ValueError(f"Invalid write policy: {write_policy}")
+        l1_cls = BackendRegistry.get_backend(l1)
+        if not l1_cls.in_process or l1_cls.stores_objects:
+            raise ValueError(f"Backend '{l1}' can't be used as L1, it must be in-process and store bytes")
+        if isinstance(l2, BaseBackend):
+            self.l2 = l2
+            self._owns_l2 = False
+        else:
+            self.l2 = BackendRegistry.get_backend(l2)(**(l2_options or {}))
+            self._owns_l2 = True
+        if self.l2.stores_objects:
+            raise ValueError("The L2 backend must store bytes")
+        if l1_options is None:
+            l1_options = {"max_entries": 10000, "eviction": "lru"} if l1 == "memory" else {}
+        self.l1 = l1_cls(**l1_options)
+        self.l1_ttl = l1_ttl
+        self.write_policy = write_policy
+        self.supports_locks = self.l2.supports_locks
+
+        self.invalidation: Optional[RedisInvalidationBus] = None
+        self._owns_invalidation_client = False
+        if invalidation:
+            options = dict(invalidation) if isinstance(invalidation, dict) else {}
+            redis_options = options.pop("redis_options", None)
+            if redis_options is not None:
+                client = redis.Redis(**redis_options)
+                self._owns_invalidation_client = True
+            elif isinstance(getattr(self.l2, "client", None), redis.Redis):
+                client = self.l2.client
+            else:
+                raise ValueError("invalidation needs a Redis L2 backend or redis_options")
+            self.invalidation = RedisInvalidationBus(
+                client, self.l1, on_invalidate=self._invalidate_reads, **options
+            )
+
+        # L2 reads in flight by (collection, key), and the generation of the last write, delete
+        # or clear of their key, by this process or another one, made meanwhile
+        self._reads_lock = threading.Lock()
+        self._generation = 0
+        self._reads: Dict[tuple, int] = {}
+        self._invalidated: Dict[tuple, int] = {}
+
+    def _l1_ttl(self, ttl: Optional[int]) -> int:
+        return min(ttl, self.l1_ttl) if ttl else self.l1_ttl
+
+    def _promotion_ttl(self, value: bytes, remaining: Optional[float]) -> Optional[float]:
+        """
+        TTL of the L1 copy of an L2 value, capped by the time the L2 entry has left, or by the
+        expire_at header of the value when L2 can't tell. None if the entry already expired.
+        """
+        if remaining is None:
+            expire_at = unpack(value)[1].get("expire_at")
+            if expire_at is None:
+                return self.l1_ttl
+            remaining = expire_at - time.time()
+        if remaining <= 0:
+            return None
+        return min(remaining, self.l1_ttl)
+
+    def _begin_reads(self, keys: List[str], collection_name: str) -> int:
+        """Register L2 reads of keys, returns the current generation"""
+        with self._reads_lock:
+            for key in keys:
+                read = (collection_name, key)
+                self._reads[read] = self._reads.get(read, 0) + 1
+            return self._generation
+
+    def _promote(
+        self,
+        keys: List[str],
+        collection_name: str,
+        by_ttl: Dict[float, Dict[str, bytes]],
+        generation: int,
+    ) -> None:
+        """
+        Write values read from L2 into L1, by TTL, and unregister the reads of keys.
+
+        Values of keys written, deleted or cleared since generation are left out, they may
+        predate the change. The check and the L1 writes are done under the lock changes are
+        recorded with, and changes are recorded after L2 is updated and before L1 is, so a
+        change is either seen here or applied to L1 after the writes.
+        """
+        with self._reads_lock:
+            stale = set()
+            for key in keys:
+                read = (collection_name, key)
+                if self._invalidated.get(read, generation) > generation:
+                    stale.add(key)
+                self._reads[read] -= 1
+                if not self._reads[read]:
+                    del self._reads[read]
+                    self._invalidated.pop(read, None)
+            for ttl, items in by_ttl.items():
+                if stale:
+                    items = {key: value for key, value in items.items() if key not in stale}
+                if items:
+                    self.l1.set_many(items, ttl=ttl, collection_name=collection_name)
+
+    def _invalidate_reads(
+        self, collection_name: Optional[str], keys: Optional[Iterable[str]]
+    ) -> None:
+        """Record a change of keys made in L2, keys is None for clears, see _promote"""
+        with self._reads_lock:
+            self._generation += 1
+            if keys is None:
+                # Every read of the collection, or of all collections, may be in the cleared scope
+                reads = [read for read in self._reads if collection_name in (None, read[0])]
+            else:
+                reads = [(collection_name, key) for key in keys]
+                reads = [read for read in reads if read in self._reads]
+            for read in reads:
+                self._invalidated[read] = self._generation
+
+    def get(self, key: str, collection_name: str) -> bytes:
+        try:
+            return self.l1.get(key, collection_name=collection_name)
+        except CacheMissError:
+            pass
+        generation = self._begin_reads([key], collection_name)
+        by_ttl = {}
+        try:
+            value, remaining = self.l2.get_with_ttl(key, collection_name=collection_name)
+            ttl = self._promotion_ttl(value, remaining)
+            if ttl is not None:
+                by_ttl[ttl] = {key: value}
+        finally:
+            self._promote([key], collection_name, by_ttl, generation)
+        return value
+
+    def get_many(self, keys: Iterable[str], collection_name: str) -> Dict[str, bytes]:
+        """Read L1, then the keys L1 missed from L2 in one batch, and promote them"""
+        keys = list(keys)
+        found = self.l1.get_many(keys, collection_name=collection_name)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            # Promoted in one set_many per TTL, entries without a known expiry share l1_ttl
+            generation = self._begin_reads(missing, collection_name)
+            by_ttl: Dict[float, Dict[str, bytes]] = {}
+            try:
+                for key, (value, remaining) in self.l2.get_many_with_ttl(
+                    missing, collection_name=collection_name
+                ).items():
+                    found[key] = value
+                    ttl = self._promotion_ttl(value, remaining)
+                    if ttl is not None:
+                        by_ttl.setdefault(ttl, {})[key] = value
+            finally:
+                self._promote(missing, collection_name, by_ttl, generation)
+        return found
+
+    def set(self, key: str, value: bytes, collection_name: str, ttl: int = None) -> None:
+        self.l2.set(key, value, ttl=ttl, collection_name=collection_name)
+        self._invalidate_reads(collection_name, [key])
+        if self.write_policy == "write_through":
+            self.l1.set(key, value, ttl=self._l1_ttl(ttl), collection_name=collection_name)
+        else:
+            self.l1.delete(key, collection_name=collection_name)
+        if self.invalidation is not None:
+            self.invalidation.delete([key], collection_name)
+
+    def set_many(
+        self, items: Dict[str, bytes], ttl: int = None, collection_name: str = None
+    ) -> None:
+        self.l2.set_many(items, ttl=ttl, collection_name=collection_name)
+        self._invalidate_reads(collection_name, items)
+        if self.write_policy == "write_through":
+            self.l1.set_many(items, ttl=self._l1_ttl(ttl), collection_name=collection_name)
+        else:
+            self.l1.delete_many(list(items), collection_name=collection_name)
+        if self.invalidation is not None:
+            self.invalidation.delete(items, collection_name)
+
+    def delete(self, key: str, collection_name: str) -> None:
+        # L2 first, concurrent reads of the old value are then invalidated before L1 is cleaned
+        try:
+            self.l2.delete(key, collection_name=collection_name)
+        finally:
+            self._invalidate_reads(collection_name, [key])
+            self.l1.delete(key, collection_name=collection_name)
+            if self.invalidation is not None:
+                self.invalidation.delete([key], collection_name)
+
+    def delete_many(self, keys: Iterable[str], collection_name: str = None) -> None:
+        keys = list(keys)
+        try:
+            self.l2.delete_many(keys, collection_name=collection_name)
+        finally:
+            self._invalidate_reads(collection_name, keys)
+            self.l1.delete_many(keys, collection_name=collection_name)
+            if self.invalidation is not None:
+                self.invalidation.delete(keys, collection_name)
+
+    def clear(
+        self,
+        collection_name: str = None,
+        context: Optional[UserContext] = None,
+        scope: CacheScope = CacheScope.ORGANIZATION.value,
+    ):
+        """Clear both tiers, returns what the L2 backend's clear returns"""
+        try:
+            return self.l2.clear(collection_name=collection_name, context=context, scope=scope)
+        finally:
+            self._invalidate_reads(collection_name, None)
+            self.l1.clear(collection_name=collection_name, context=context, scope=scope)
+            if self.invalidation is not None:
+                self.invalidation.clear(collection_name=collection_name, context=context, scope=scope)
+
+    def acquire_lock(self, key: str, ttl: float, collection_name: str = None) -> Optional[str]:
+        return self.l2.acquire_lock(key, ttl, collection_name=collection_name)
+
+    def release_lock(self, key: str, token: str, collection_name: str = None) -> None:
+        self.l2.release_lock(key, token, collection_name=collection_name)
+
+    def stats(self, collection_name: str = None) -> Dict[str, int]:
+        """Counters of a memory L1 backend, its misses are the reads that went to L2"""
+        return self.l1.stats(collection_name)
+
+    def close(self) -> None:
+        """Close L1, and L2 unless it was passed in as an instance"""
+        if self.invalidation is not None:
+            self.invalidation.close()
+            if self._owns_invalidation_client:
+                self.invalidation.client.close()
+        self.l1.close()
+        if self._owns_l2:
+            self.l2.close()
@@ -1,9 +1,14 @@
 DEFAULT_CONFIG = {
     "BACKEND": "memory",
     "BACKEND_OPTIONS": {},
+    "ASYNC_BACKEND_OPTIONS": None,  # Defaults to BACKEND_OPTIONS for Redis
     "DEFAULT_TTL": 300,  # 5 minutes
     "DEFAULT_COLLECTION": "cache_collection",
     "SERIALIZER": "pickle",
+    "COMPRESSION": None,  # i.e. "zlib", compresses values of at least COMPRESSION_THRESHOLD bytes
+    "COMPRESSION_THRESHOLD": 4096,
+    "COLLECTION_COMPRESSION": {},  # Per collection {"algorithm": ..., "threshold": ...} overrides
     "KEY_GENERATOR": "sha256",
     "FAIL_SILENTLY": False,
+    "REFRESH_WORKERS": 4,  # Threads refreshing stale entries of memoize(stale_ttl/refresh_ahead)
 }
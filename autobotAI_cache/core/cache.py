@@ -0,0 +1,100 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.models import CacheScope
+from autobotAI_cache.utils.helpers import get_context_scope_string
+from autobotAI_cache.utils.keygen import new_key_hasher
+from autobotAI_cache.utils.serializers import deserialize_payload, serialize_payload
+
+
+def make_key(key: str, context=None, scope: str = CacheScope.ORGANIZATION.value) -> str:
+    """
+    Scoped backend key of an application key, in the same format as the keys of memoize.
+
+    :param key: Application key, e.g. 'resource:1234'
+    :param context: Request context providing the organization and user, unused for global scope
+    :param scope: CacheScope, i.e. CacheScope.ORGANIZATION.value
+    :return: The backend key
+    """
+    scope_str = get_context_scope_string(context, scope)
+    hasher = new_key_hasher()
+    hasher.update(key.encode())
+    return f"{scope_str}:{hasher.hexdigest()}"
+
+
+def get_many(
+    keys: Iterable[str],
+    collection_name: Optional[str] = None,
+    context=None,
+    scope: str = CacheScope.ORGANIZATION.value,
+) -> Dict[str, Any]:
+    """
+    Read several values from the configured backend in one batch.
+
+    :param keys: Application keys to read
+    :param collection_name: Collection to read from, defaults to DEFAULT_COLLECTION
+    :param context: Request context, unused for global scope
+    :param scope: CacheScope, i.e. CacheScope.ORGANIZATION.value
+    :return: Mapping of the cached application keys to their values, missing keys are left out
+    """
+    backend = settings.backend
+    backend_keys = {make_key(key, context, scope): key for key in keys}
+    found = backend.get_many(
+        list(backend_keys), collection_name=collection_name or settings.DEFAULT_COLLECTION
+    )
+    if backend.stores_objects:
+        return {backend_keys[backend_key]: value for backend_key, value in found.items()}
+    return {
+        backend_keys[backend_key]: deserialize_payload(value)[0]
+        for backend_key, value in found.items()
+    }
+
+
+def set_many(
+    items: Dict[str, Any],
+    ttl: Optional[int] = None,
+    collection_name: Optional[str] = None,
+    context=None,
+    scope: str = CacheScope.ORGANIZATION.value,
+) -> None:
+    """
+    Write several values to the configured backend in one batch.
+
+    :param items: Mapping of application keys to values
+    :param ttl: Time-to-live in seconds, defaults to DEFAULT_TTL
+    :param collection_name: Collection to write to, defaults to DEFAULT_COLLECTION
+    :param context: Request context, unused for global scope
+    :param scope: CacheScope, i.e. CacheScope.ORGANIZATION.value
+    """
+    backend = settings.backend
+    collection_name = collection_name or settings.DEFAULT_COLLECTION
+    if not backend.stores_objects:
+        items = {
+            key: serialize_payload(value, collection_name=collection_name)
+            for key, value in items.items()
+        }
+    backend.set_many(
+        {make_key(key, context, scope): value for key, value in items.items()},
+        ttl=ttl if ttl is not None else settings.DEFAULT_TTL,
+        collection_name=collection_name,
+    )
+
+
+def delete_many(
+    keys: Iterable[str],
+    collection_name: Optional[str] = None,
+    context=None,
+    scope: str = CacheScope.ORGANIZATION.value,
+) -> None:
+    """
+    Delete several values from the configured backend in one batch.
+
+    :param keys: Application keys to delete, keys that aren't cached are ignored
+    :param collection_name: Collection to delete from, defaults to DEFAULT_COLLECTION
+    :param context: Request context, unused for global scope
+    :param scope: CacheScope, i.e. CacheScope.ORGANIZATION.value
+    """
+    backend_keys: List[str] = [make_key(key, context, scope) for key in keys]
+    settings.backend.delete_many(
+        backend_keys, collection_name=collection_name or settings.DEFAULT_COLLECTION
+    )
@@ -1,20 +1,30 @@
 from autobotAI_cache.config.defaults import DEFAULT_CONFIG
 from autobotAI_cache.backends import BackendRegistry
+from autobotAI_cache.backends.async_base import InlineAsyncBackend, ThreadedAsyncBackend
 
 
 class Config:
     def __init__(self):
         self._config = DEFAULT_CONFIG.copy()
         self._backend = None
+        self._async_backend = None
     
     def reset(self):
         self._config = DEFAULT_CONFIG.copy()
-        self._backend = None
+        self._close_backend()
 
     def configure(self, **kwargs):
         """Update configuration settings"""
         self._config.update(kwargs)
-        self._backend = None  # Reset backend on config change
+        self._close_backend()  # Reset backend on config change
+
+    def _close_backend(self):
+        """Release the current backend so it doesn't leak threads or data"""
+        # Async backends can only be closed on their event loop, see close_async_backend()
+        self._async_backend = None
+        backend, self._backend = self._backend, None
+        if backend is not None:
+            backend.close()
 
     def __getattr__(self, name):
         """Direct access to config values"""
@@ -31,6 +41,37 @@ class Config:
             self._backend = backend_cls(**self._config.get("BACKEND_OPTIONS", {}))
         return self._backend
     
+    @property
+    def async_backend(self):
+        """
+        Lazy-loaded asyncio backend instance.
+
+        Redis and MongoDB use their native asyncio variants configured with ASYNC_BACKEND_OPTIONS.
+        Without them Redis falls back to BACKEND_OPTIONS, while MongoDB, whose BACKEND_OPTIONS
+        hold a sync client, runs the sync backend in a thread pool. In-process backends are used
+        directly on the event loop and share their data with the sync backend, other backends
+        run in a thread pool.
+        """
+        if not self._async_backend:
+            backend_name = self._config["BACKEND"]
+            backend_cls = BackendRegistry.get_async_backend(backend_name)
+            options = self._config.get("ASYNC_BACKEND_OPTIONS")
+            if backend_cls is not None and options is None and backend_cls.accepts_sync_options:
+                options = self._config.get("BACKEND_OPTIONS", {})
+            if backend_cls is not None and options is not None:
+                self._async_backend = backend_cls(**options)
+            elif self.backend.in_process:
+                self._async_backend = InlineAsyncBackend(self.backend)
+            else:
+                self._async_backend = ThreadedAsyncBackend(self.backend)
+        return self._async_backend
+
+    async def close_async_backend(self):
+        """Close the asyncio backend's connections, to be awaited on its event loop at shutdown"""
+        backend, self._async_backend = self._async_backend, None
+        if backend is not None:
+            await backend.close()
+
     @property
     def backend_name(self):
         """Name of the backend"""
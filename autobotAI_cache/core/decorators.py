@@ -1,11 +1,28 @@
 import functools
+import inspect
 import logging
-from typing import Optional, List
+import math
+import random
+import time
+from typing import Optional, List, Union
 from autobotAI_cache.core.config import settings
 from autobotAI_cache.core.exceptions import CacheBackendError, CacheMissError, SerializationError
 from autobotAI_cache.core.models import CacheScope
-from autobotAI_cache.utils.keygen import generate_cache_key
-from autobotAI_cache.utils.serializers import serialize, deserialize
+from autobotAI_cache.core.refresh import BackgroundRefresher
+from autobotAI_cache.core.single_flight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    run_locked,
+    run_locked_async,
+)
+from autobotAI_cache.utils.keygen import KeyPlan, generate_element_key
+from autobotAI_cache.utils.payload import pack_object, unpack_object
+from autobotAI_cache.utils.serializers import (
+    Serializer,
+    SerializerRegistry,
+    deserialize_payload,
+    serialize_payload,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -19,6 +36,72 @@ ch.setFormatter(formatter)
 
 logger.addHandler(ch)
 
+# Coalesce the misses of memoized functions created with single_flight
+_flights = SingleFlight()
+_async_flights = AsyncSingleFlight()
+# Refreshes stale entries of memoized functions created with stale_ttl or refresh_ahead
+_refresher = BackgroundRefresher(lambda: settings.REFRESH_WORKERS)
+
+SINGLE_FLIGHT_MODES = (False, True, "local", "distributed")
+
+# States of a cached entry, see _entry_state()
+_FRESH = "fresh"
+_REFRESH = "refresh"
+_STALE = "stale"
+
+
+def _encode_result(
+    backend,
+    serializer,
+    collection_name: str,
+    result,
+    expire_at: Optional[float],
+    delta: Optional[float],
+):
+    """Value stored for a result, with a header naming its serializer and tracked expiry"""
+    if expire_at is None:
+        delta = None  # Only used to expire results early
+    if backend.stores_objects:
+        if expire_at is None:
+            return result
+        return pack_object(result, expire_at=expire_at, delta=delta)
+    return serialize_payload(
+        result, serializer, collection_name, expire_at=expire_at, delta=delta
+    )
+
+
+def _decode_result(backend, serializer, cached) -> tuple:
+    """Result of a stored value and its header fields"""
+    if backend.stores_objects:
+        return unpack_object(cached)
+    return deserialize_payload(cached, serializer)
+
+
+def _entry_state(
+    fields: dict, ttl: int, refresh_ahead: Optional[float], beta: Optional[float]
+) -> str:
+    """
+    Whether a cached entry is fresh, due for a refresh ahead of its expiry, or stale.
+
+    With beta, entries expire early with the XFetch algorithm (Vattani et al., "Optimal
+    Probabilistic Cache Stampede Prevention"): each read treats the entry as expired with a
+    probability rising as its expiry approaches, faster for results that took longer to compute.
+    Recomputations of entries written together are spread out instead of happening at once.
+    """
+    expire_at = fields.get("expire_at")
+    if expire_at is None:
+        return _FRESH
+    now = time.time()
+    if beta is not None and "delta" in fields:
+        # 1 - random() is in (0, 1], so the logarithm is finite and never positive
+        now -= fields["delta"] * beta * math.log(1 - random.random())
+    if now >= expire_at:
+        return _STALE
+    if refresh_ahead is not None and now >= expire_at - ttl * (1 - refresh_ahead):
+        return _REFRESH
+    return _FRESH
+
+
 def memoize(
     ttl: Optional[int] = None,
     key_prefix: Optional[str] = None,
@@ -27,6 +110,12 @@ def memoize(
     scope: str = CacheScope.ORGANIZATION.value,
     verbose: bool = False,
     collection_name: Optional[str] = None,
+    single_flight: Union[bool, str] = False,
+    lock_timeout: float = 30,
+    stale_ttl: Optional[int] = None,
+    refresh_ahead: Optional[float] = None,
+    early_expiration: Union[bool, float] = False,
+    serializer: Union[str, Serializer, None] = None,
 ):
     """
     Memoization decorator that caches function results using configured backend
@@ -37,83 +126,508 @@ def memoize(
     :param fail_silently: Return uncached result on backend errors if True
     :param scope: CacheScope, i.e. CacheScope.ORGANIZATION.value
     :param verbose: verbose logs
+    :param single_flight: True (or 'local') to run the function once for concurrent misses on
+        the same key in this process, the other callers wait for its result. 'distributed'
+        also coalesces misses across processes with a lock in Redis or MongoDB
+    :param lock_timeout: Seconds the distributed lock is held at most, and the longest a caller
+        waits for another process before computing the result itself
+    :param stale_ttl: Seconds an expired result is still returned for, while it is recomputed in
+        the background
+    :param refresh_ahead: Fraction of the ttl after which a result is recomputed in the
+        background before it expires, i.e. 0.8
+    :param early_expiration: True to recompute results probabilistically before they expire
+        (XFetch), or the algorithm's beta, 1.0 for True. Values above 1 favor earlier recomputation
+    :param serializer: Name of the serializer of the results, defaults to the SERIALIZER setting
     """
+    if single_flight not in SINGLE_FLIGHT_MODES:
+        raise ValueError(f"Invalid single_flight mode: {single_flight}")
+    if stale_ttl is not None and stale_ttl <= 0:
+        raise ValueError(f"stale_ttl must be positive: {stale_ttl}")
+    if refresh_ahead is not None and not 0 < refresh_ahead < 1:
+        raise ValueError(f"refresh_ahead must be between 0 and 1: {refresh_ahead}")
+    if early_expiration is True:
+        beta = 1.0
+    elif early_expiration is False:
+        beta = None
+    elif early_expiration > 0:
+        beta = float(early_expiration)
+    else:
+        raise ValueError(f"early_expiration must be positive: {early_expiration}")
+    # Results record their expiry and compute time in a header, the backend keeps them for the
+    # grace period too
+    tracks_expiry = stale_ttl is not None or refresh_ahead is not None or beta is not None
+    # Resolved once, None follows the SERIALIZER setting
+    value_serializer = SerializerRegistry.get_serializer(serializer) if serializer else None
 
     def decorator(func):
+        # Signature work is done once here, not on every call
+        key_plan = KeyPlan(func, scope=scope, key_prefix=key_prefix, ignore_args=ignore_args)
+
+        # Decisions shared by the sync and async wrappers, which only differ in their awaits
+
+        def plan(args, kwargs):
+            """Cache key, collection, ttl and backend ttl of a call"""
+            cache_key = key_plan.key(args, kwargs)
+
+            if verbose:
+                logger.info(f"Generated cache key: {cache_key}")
+
+            cache_collection_name = (
+                collection_name
+                if collection_name is not None
+                else settings.DEFAULT_COLLECTION
+            )
+            effective_ttl = ttl if ttl is not None else settings.DEFAULT_TTL
+            # Expired results are kept stale_ttl longer, to be served while they refresh
+            backend_ttl = effective_ttl + stale_ttl if stale_ttl and effective_ttl else effective_ttl
+            return cache_key, cache_collection_name, effective_ttl, backend_ttl
+
+        def read(backend, cache_key, effective_ttl, cached):
+            """
+            (True, result, state) of a value read from the backend, (False, None, None) if it
+            isn't a cached result
+
+            :raises CacheMissError: If the result expired and isn't served stale
+            """
+            # Live objects are returned as they are, None is a valid cached result
+            if not backend.stores_objects and cached is None:
+                return False, None, None
+            result, fields = _decode_result(backend, value_serializer, cached)
+            state = _entry_state(fields, effective_ttl, refresh_ahead, beta)
+            if state == _STALE and stale_ttl is None:
+                raise CacheMissError(f"Key '{cache_key}' expired")
+            if verbose:
+                if state != _FRESH:
+                    logger.info(f"Refreshing {state} result for key: {cache_key}")
+                logger.info(f"Cache ({settings.backend_name}) hit for key: {cache_key}")
+            return True, result, state
+
+        def lookup_failed(cache_key, error):
+            """Miss of a lookup that raised error, backend errors are raised unless failing silently"""
+            if isinstance(error, CacheMissError):
+                if verbose:
+                    logger.info(f"Cache miss for key: {cache_key}")
+            else:
+                if verbose:
+                    logger.error(f"Cache backend error during get: {str(error)}")
+                if not fail_silently:
+                    raise error
+            return False, None
+
+        def encode(backend, cache_collection_name, effective_ttl, result, delta):
+            """Value stored for a result computed in delta seconds"""
+            expire_at = None
+            if tracks_expiry and effective_ttl:
+                expire_at = time.time() + effective_ttl
+            return _encode_result(
+                backend, value_serializer, cache_collection_name, result, expire_at, delta
+            )
+
+        def stored(cache_key):
+            if verbose:
+                logger.info(
+                    f"Successfully cached ({settings.backend_name}) result with key : {cache_key}"
+                )
+
+        def store_failed(error):
+            if verbose:
+                logger.error(f"Error caching result: {str(error)}")
+            if not fail_silently:
+                raise error
+
+        def refresh_failed(cache_key, error):
+            # The cached result is kept until it expires, the next hit retries
+            if verbose:
+                logger.error(f"Error refreshing result for key {cache_key}: {str(error)}")
+
+        def call_failed(error):
+            if verbose:
+                logger.error(f"Unexpected error in memoize decorator: {str(error)}")
+            if not fail_silently:
+                raise error
+
+        if inspect.iscoroutinefunction(func):
+            # Coroutine functions are awaited and cached through the asyncio backend
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    cache_key, cache_collection_name, effective_ttl, backend_ttl = plan(args, kwargs)
+                    backend = settings.async_backend
+
+                    async def lookup():
+                        """(True, result) on a cache hit, (False, None) on a miss"""
+                        try:
+                            cached = await backend.get(
+                                cache_key, collection_name=cache_collection_name
+                            )
+                            hit, result, state = read(backend, cache_key, effective_ttl, cached)
+                        except (CacheMissError, CacheBackendError) as e:
+                            return lookup_failed(cache_key, e)
+                        if hit and state != _FRESH:
+                            _refresher.submit_async((cache_collection_name, cache_key), refresh)
+                        return hit, result
+
+                    async def store(result, delta):
+                        try:
+                            await backend.set(
+                                cache_key,
+                                encode(backend, cache_collection_name, effective_ttl, result, delta),
+                                ttl=backend_ttl,
+                                collection_name=cache_collection_name,
+                            )
+                        except (CacheBackendError, SerializationError) as e:
+                            store_failed(e)
+                        else:
+                            stored(cache_key)
+
+                    async def refresh():
+                        try:
+                            start = time.perf_counter()
+                            result = await func(*args, **kwargs)
+                            await store(result, time.perf_counter() - start)
+                        except Exception as e:
+                            refresh_failed(cache_key, e)
+
+                    async def compute():
+                        if single_flight:
+                            # Another caller may have cached the result since our miss
+                            hit, cached = await lookup()
+                            if hit:
+                                return cached
+
+                        start = time.perf_counter()
+                        result = await func(*args, **kwargs)
+                        await store(result, time.perf_counter() - start)
+                        return result
+
+                    hit, cached = await lookup()
+                    if hit:
+                        return cached
+                    if not single_flight:
+                        return await compute()
+
+                    async def compute_once():
+                        if single_flight == "distributed" and backend.supports_locks:
+                            return await run_locked_async(
+                                backend, cache_key, cache_collection_name, lock_timeout, lookup, compute
+                            )
+                        return await compute()
+
+                    leader, result = await _async_flights.do(
+                        (cache_collection_name, cache_key), compute_once
+                    )
+                    if leader or backend.stores_objects:
+                        return result
+                    # Waiters read their own copy of the result, as on a cache hit
+                    hit, cached = await lookup()
+                    return cached if hit else result
+
+                except Exception as e:
+                    call_failed(e)
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
-                cache_key = generate_cache_key(
-                    func=func,
-                    args=args,
-                    kwargs=kwargs,
-                    scope=scope,
-                    key_prefix=key_prefix,
-                    ignore_args=ignore_args,
-                    verbose=verbose,
-                )
+                cache_key, cache_collection_name, effective_ttl, backend_ttl = plan(args, kwargs)
+                backend = settings.backend
 
-                if verbose:
-                    logger.info(f"Generated cache key: {cache_key}")
+                def lookup():
+                    """(True, result) on a cache hit, (False, None) on a miss"""
+                    try:
+                        cached = backend.get(cache_key, collection_name=cache_collection_name)
+                        hit, result, state = read(backend, cache_key, effective_ttl, cached)
+                    except (CacheMissError, CacheBackendError) as e:
+                        return lookup_failed(cache_key, e)
+                    if hit and state != _FRESH:
+                        _refresher.submit((cache_collection_name, cache_key), refresh)
+                    return hit, result
+
+                def store(result, delta):
+                    try:
+                        backend.set(
+                            cache_key,
+                            encode(backend, cache_collection_name, effective_ttl, result, delta),
+                            ttl=backend_ttl,
+                            collection_name=cache_collection_name,
+                        )
+                    except (CacheBackendError, SerializationError) as e:
+                        store_failed(e)
+                    else:
+                        stored(cache_key)
+
+                def refresh():
+                    try:
+                        start = time.perf_counter()
+                        result = func(*args, **kwargs)
+                        store(result, time.perf_counter() - start)
+                    except Exception as e:
+                        refresh_failed(cache_key, e)
+
+                def compute():
+                    if single_flight:
+                        # Another caller may have cached the result since our miss
+                        hit, cached = lookup()
+                        if hit:
+                            return cached
+
+                    start = time.perf_counter()
+                    result = func(*args, **kwargs)
+                    store(result, time.perf_counter() - start)
+                    return result
+
+                hit, cached = lookup()
+                if hit:
+                    return cached
+                if not single_flight:
+                    return compute()
+
+                def compute_once():
+                    if single_flight == "distributed" and backend.supports_locks:
+                        return run_locked(
+                            backend, cache_key, cache_collection_name, lock_timeout, lookup, compute
+                        )
+                    return compute()
+
+                leader, result = _flights.do((cache_collection_name, cache_key), compute_once)
+                if leader or backend.stores_objects:
+                    return result
+                # Waiters read their own copy of the result, as on a cache hit
+                hit, cached = lookup()
+                return cached if hit else result
+
+            except Exception as e:
+                call_failed(e)
+                return func(*args, **kwargs)
+
+        return wrapper
 
-                cache_collection_name = (
-                    collection_name
-                    if collection_name is not None
-                    else settings.DEFAULT_COLLECTION
+    return decorator
+
+
+def _decode_batch(backend, serializer, cached: dict) -> dict:
+    """Deserialize the values read by get_many unless the backend stores objects"""
+    if backend.stores_objects:
+        return cached
+    return {key: deserialize_payload(value, serializer)[0] for key, value in cached.items()}
+
+
+def _encode_batch(backend, serializer, collection_name: str, fresh: dict) -> dict:
+    """Serialize the values passed to set_many unless the backend stores objects"""
+    if backend.stores_objects:
+        return fresh
+    return {
+        key: serialize_payload(value, serializer, collection_name) for key, value in fresh.items()
+    }
+
+
+def _missing_elements(ids: list, keys: list, values: dict) -> dict:
+    """Key to id of the ids that weren't cached, in their original order and each only once"""
+    missing = {}
+    for element, key in zip(ids, keys):
+        if key not in values and key not in missing:
+            missing[key] = element
+    return missing
+
+
+def _fresh_results(func, result, missing: dict, returns: str) -> dict:
+    """Key to result of the ids the function was called with"""
+    if returns == "dict":
+        return {key: result[element] for key, element in missing.items() if element in result}
+    if len(result) != len(missing):
+        raise ValueError(
+            f"{func.__qualname__} returned {len(result)} results for {len(missing)} ids"
+        )
+    return dict(zip(missing, result))
+
+
+def _merge_results(ids: list, keys: list, values: dict, returns: str):
+    """Results in the order of the requested ids"""
+    if returns == "dict":
+        return {element: values[key] for element, key in zip(ids, keys) if key in values}
+    return [values[key] for key in keys]
+
+
+def memoize_batch(
+    batch_arg: str = "ids",
+    returns: str = "list",
+    ttl: Optional[int] = None,
+    key_prefix: Optional[str] = None,
+    ignore_args: Optional[List[str]] = None,
+    fail_silently: bool = False,
+    scope: str = CacheScope.ORGANIZATION.value,
+    verbose: bool = False,
+    collection_name: Optional[str] = None,
+    serializer: Union[str, Serializer, None] = None,
+):
+    """
+    Memoization decorator for functions taking a list of ids, caching the result of every id.
+
+    Cached ids are read in one batch, the function is only called with the missing ids and
+    their results are written in one batch. With returns='list' the function returns one
+    result per id in the order of the ids, with returns='dict' a mapping of id to result,
+    ids left out of the mapping are not cached. Coroutine functions are supported.
+
+    :param batch_arg: Name of the argument holding the list of ids
+    :param returns: 'list' or 'dict', what the function returns
+    :param ttl: Time-to-live in seconds (default 300) # 5 minutes
+    :param key_prefix: Custom prefix for cache keys
+    :param ignore_args: List of argument names to exclude from cache key
+    :param fail_silently: Return uncached result on backend errors if True
+    :param scope: CacheScope, i.e. CacheScope.ORGANIZATION.value
+    :param verbose: verbose logs
+    :param serializer: Name of the serializer of the results, defaults to the SERIALIZER setting
+    """
+    if returns not in ("list", "dict"):
+        raise ValueError(f"Invalid returns value: {returns}")
+    # Resolved once, None follows the SERIALIZER setting
+    value_serializer = SerializerRegistry.get_serializer(serializer) if serializer else None
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        if batch_arg not in signature.parameters:
+            raise ValueError(f"{func.__qualname__} has no argument named '{batch_arg}'")
+
+        key_plan = KeyPlan(
+            func, scope=scope, key_prefix=key_prefix, ignore_args=[*(ignore_args or []), batch_arg]
+        )
+
+        # Steps shared by the sync and async wrappers, which only differ in their awaits
+
+        def plan(args, kwargs):
+            """Ids, the cache key of every id, collection and ttl of a call"""
+            arguments = key_plan.bind(args, kwargs)
+            ids = list(arguments[batch_arg])
+            base_key = key_plan.key_for(arguments)
+            keys = [generate_element_key(base_key, element) for element in ids]
+            # The DEFAULT_COLLECTION and DEFAULT_TTL settings are read on every call
+            cache_collection_name = (
+                collection_name if collection_name is not None else settings.DEFAULT_COLLECTION
+            )
+            effective_ttl = ttl if ttl is not None else settings.DEFAULT_TTL
+            return ids, keys, cache_collection_name, effective_ttl
+
+        def read(backend, cached):
+            """Results of the values read by get_many"""
+            return _decode_batch(backend, value_serializer, cached)
+
+        def lookup_failed(error):
+            """No cached results, backend errors are raised unless failing silently"""
+            if verbose:
+                logger.error(f"Cache backend error during get_many: {str(error)}")
+            if not fail_silently:
+                raise error
+            return {}
+
+        def find_missing(ids, keys, values):
+            """Key to id of the ids that weren't cached"""
+            missing = _missing_elements(ids, keys, values)
+            if verbose:
+                logger.info(
+                    f"Cache ({settings.backend_name}) hits: {len(ids) - len(missing)}, misses: {len(missing)}"
                 )
+            return missing
 
+        def bind_missing(args, kwargs, missing):
+            """Bound arguments of the call computing only the missing ids"""
+            bound = signature.bind(*args, **kwargs)
+            bound.arguments[batch_arg] = list(missing.values())
+            return bound
+
+        def computed(result, missing, values):
+            """Key to result of the missing ids, added to values"""
+            fresh = _fresh_results(func, result, missing, returns)
+            values.update(fresh)
+            return fresh
+
+        def encode(backend, cache_collection_name, fresh):
+            """Values stored for the computed results"""
+            return _encode_batch(backend, value_serializer, cache_collection_name, fresh)
+
+        def store_failed(error):
+            if verbose:
+                logger.error(f"Error caching results: {str(error)}")
+            if not fail_silently:
+                raise error
+
+        def call_failed(error):
+            if verbose:
+                logger.error(f"Unexpected error in memoize_batch decorator: {str(error)}")
+            if not fail_silently:
+                raise error
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
                 try:
-                    cached = settings.backend.get(
-                        cache_key, collection_name=cache_collection_name
-                    )
-                    if cached is not None:
-                        if verbose:
-                            logger.info(
-                                f"Cache ({settings.backend_name}) hit for key: {cache_key}"
+                    ids, keys, cache_collection_name, effective_ttl = plan(args, kwargs)
+                    backend = settings.async_backend
+
+                    try:
+                        cached = await backend.get_many(
+                            list(dict.fromkeys(keys)), collection_name=cache_collection_name
+                        )
+                        values = read(backend, cached)
+                    except CacheBackendError as e:
+                        values = lookup_failed(e)
+
+                    missing = find_missing(ids, keys, values)
+                    if missing:
+                        bound = bind_missing(args, kwargs, missing)
+                        result = await func(*bound.args, **bound.kwargs)
+                        fresh = computed(result, missing, values)
+                        try:
+                            await backend.set_many(
+                                encode(backend, cache_collection_name, fresh),
+                                ttl=effective_ttl,
+                                collection_name=cache_collection_name,
                             )
-                        return deserialize(cached, settings.SERIALIZER)
-                
-                except CacheMissError:
-                    if verbose:
-                        logger.info(f"Cache miss for key: {cache_key}")
-                
-                except CacheBackendError as e:
-                    if verbose:
-                        logger.error(f"Cache backend error during get: {str(e)}")
-                    if not fail_silently:
-                        raise
+                        except (CacheBackendError, SerializationError) as e:
+                            store_failed(e)
+
+                    return _merge_results(ids, keys, values, returns)
 
-                result = func(*args, **kwargs)
+                except Exception as e:
+                    call_failed(e)
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                ids, keys, cache_collection_name, effective_ttl = plan(args, kwargs)
+                backend = settings.backend
 
                 try:
-                    serialized = serialize(result, settings.SERIALIZER)
-                    effective_ttl = ttl if ttl is not None else settings.DEFAULT_TTL
-                    
-                    settings.backend.set(
-                        cache_key,
-                        serialized,
-                        ttl=effective_ttl,
-                        collection_name=cache_collection_name,
+                    cached = backend.get_many(
+                        list(dict.fromkeys(keys)), collection_name=cache_collection_name
                     )
-                    
-                    if verbose:
-                        logger.info(
-                            f"Successfully cached ({settings.backend_name}) result with key : {cache_key}"
+                    values = read(backend, cached)
+                except CacheBackendError as e:
+                    values = lookup_failed(e)
+
+                missing = find_missing(ids, keys, values)
+                if missing:
+                    bound = bind_missing(args, kwargs, missing)
+                    result = func(*bound.args, **bound.kwargs)
+                    fresh = computed(result, missing, values)
+                    try:
+                        backend.set_many(
+                            encode(backend, cache_collection_name, fresh),
+                            ttl=effective_ttl,
+                            collection_name=cache_collection_name,
                         )
-                
-                except (CacheBackendError, SerializationError) as e:
-                    if verbose:
-                        logger.error(f"Error caching result: {str(e)}")
-                    if not fail_silently:
-                        raise
-
-                return result
-                
+                    except (CacheBackendError, SerializationError) as e:
+                        store_failed(e)
+
+                return _merge_results(ids, keys, values, returns)
+
             except Exception as e:
-                if verbose:
-                    logger.error(f"Unexpected error in memoize decorator: {str(e)}")
-                if not fail_silently:
-                    raise
+                call_failed(e)
                 return func(*args, **kwargs)
 
         return wrapper
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Hashable, Optional, Set
+
+
+class BackgroundRefresher:
+    """
+    Recomputes cached results off the request path.
+
+    Sync refreshes run in a thread pool, coroutine refreshes as tasks on the caller's event loop.
+    At most one refresh per key is pending at a time, callers hitting the same stale entry while
+    it refreshes don't queue more work.
+    """
+
+    def __init__(self, max_workers: Callable[[], int]):
+        """
+        :param max_workers: Returns the size of the thread pool, read when it is first used
+        """
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: Set[Hashable] = set()
+        # Strong references to running tasks, the event loop only keeps weak ones
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _claim(self, key: Hashable) -> bool:
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            return True
+
+    def _release(self, key: Hashable) -> None:
+        with self._lock:
+            self._pending.discard(key)
+
+    def submit(self, key: Hashable, fn: Callable[[], None]) -> bool:
+        """
+        Run fn in the thread pool unless a refresh of key is pending.
+
+        :param key: Identifies the cached entry being refreshed
+        :param fn: Recomputes and stores the entry, must handle its own errors
+        :return: Whether the refresh was scheduled
+        """
+        if not self._claim(key):
+            return False
+
+        def run():
+            try:
+                fn()
+            finally:
+                self._release(key)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers(), thread_name_prefix="autobotai-cache-refresh"
+                )
+            executor = self._executor
+        executor.submit(run)
+        return True
+
+    def submit_async(self, key: Hashable, fn: Callable[[], Awaitable[None]]) -> bool:
+        """
+        Start fn() as a task on the running event loop unless a refresh of key is pending.
+
+        :param key: Identifies the cached entry being refreshed
+        :param fn: Coroutine function recomputing and storing the entry, must handle its own errors
+        :return: Whether the refresh was scheduled
+        """
+        if not self._claim(key):
+            return False
+
+        async def run():
+            try:
+                await fn()
+            finally:
+                self._release(key)
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    def pending(self) -> int:
+        """Number of refreshes scheduled or running"""
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the thread pool, a new one is started by the next refresh"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# Seconds between the first checks of a waiter for the result of a distributed lock holder,
+# doubled after every check up to LOCK_POLL_MAX_INTERVAL
+LOCK_POLL_INTERVAL = 0.05
+LOCK_POLL_MAX_INTERVAL = 1.0
+
+
+class _Call:
+    """A computation in flight and its outcome"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key within a process.
+
+    The first caller of a key runs the function, callers arriving while it runs wait for it
+    and receive its result or exception instead of running the function themselves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[bool, Any]:
+        """
+        Run fn unless a call for key is already in flight, then wait for that call.
+
+        :param key: Identifies calls that can share their result
+        :param fn: Function to run
+        :return: Whether this caller ran fn, and the result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return False, call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return True, call.result
+
+
+class AsyncSingleFlight:
+    """Asyncio variant of SingleFlight, coalescing concurrent calls on the same event loop"""
+
+    def __init__(self):
+        self._calls: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[bool, Any]:
+        """
+        Await fn() unless a call for key is already in flight, then wait for that call.
+
+        :param key: Identifies calls that can share their result
+        :param fn: Coroutine function to await
+        :return: Whether this caller awaited fn, and the result
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        while flight_key in self._calls:
+            future = self._calls[flight_key]
+            try:
+                # Shielded so a cancelled waiter doesn't cancel the call of the others
+                return False, await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The caller running the call was cancelled, the next waiter takes over
+
+        future = loop.create_future()
+        self._calls[flight_key] = future
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved, it is re-raised here whether or not anyone waits
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._calls[flight_key]
+        return True, result
+
+
+def run_locked(
+    backend,
+    key: str,
+    collection_name: str,
+    timeout: float,
+    lookup: Callable[[], Tuple[bool, Any]],
+    compute: Callable[[], Any],
+) -> Any:
+    """
+    Run compute while holding the backend's distributed lock on a key.
+
+    When another process holds the lock, wait for it to cache its result instead. If it
+    neither caches a result nor releases the lock within timeout, compute without the lock.
+
+    :param backend: Backend supporting locks
+    :param key: Cache key being computed
+    :param collection_name: Collection of the key
+    :param timeout: Lifetime of the lease in seconds, and the longest wait for another holder
+    :param lookup: Returns (True, result) once the result is cached, (False, None) otherwise
+    :param compute: Computes and caches the result
+    :return: The result
+    """
+    deadline = time.monotonic() + timeout
+    interval = LOCK_POLL_INTERVAL
+    while True:
+        token = backend.acquire_lock(key, timeout, collection_name=collection_name)
+        if token is not None:
+            try:
+                return compute()
+            finally:
+                backend.release_lock(key, token, collection_name=collection_name)
+
+        time.sleep(interval)
+        interval = min(interval * 2, LOCK_POLL_MAX_INTERVAL)
+        hit, result = lookup()
+        if hit:
+            return result
+        if time.monotonic() >= deadline:
+            return compute()
+
+
+async def run_locked_async(
+    backend,
+    key: str,
+    collection_name: str,
+    timeout: float,
+    lookup: Callable[[], Awaitable[Tuple[bool, Any]]],
+    compute: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Asyncio variant of run_locked, with an asyncio backend and coroutine functions"""
+    deadline = time.monotonic() + timeout
+    interval = LOCK_POLL_INTERVAL
+    while True:
+        token = await backend.acquire_lock(key, timeout, collection_name=collection_name)
+        if token is not None:
+            try:
+                return await compute()
+            finally:
+                await backend.release_lock(key, token, collection_name=collection_name)
+
+        await asyncio.sleep(interval)
+        interval = min(interval * 2, LOCK_POLL_MAX_INTERVAL)
+        hit, result = await lookup()
+        if hit:
+            return result
+        if time.monotonic() >= deadline:
+            return await compute()
@@ -0,0 +1,293 @@
+import dataclasses
+import enum
+import hashlib
+import struct
+import sys
+from array import array
+from typing import Any, Callable, Dict
+
+from pydantic import BaseModel
+
+# Every value is written as a one byte tag followed by a self-delimiting body, so different
+# values never produce the same stream: lengths are written before variable sized data
+_LENGTH = struct.Struct("<Q")
+_FLOAT = struct.Struct("<d")
+
+# Types whose values are ordered against each other, sets and dict keys made of only one of
+# these groups are hashed in sorted order, any others in the order of their own digests
+_ORDERED_GROUPS = ({str}, {bytes}, {int, float, bool})
+
+# Registered reducers, see register_hasher
+_reducers: Dict[type, Callable[[Any], Any]] = {}
+# Handler of every type seen so far, resolved from the type once
+_handlers: Dict[type, Callable] = {}
+
+
+def register_hasher(cls: type, reducer: Callable[[Any], Any]) -> None:
+    """
+    Hash instances of a type, and its subclasses, through a canonical substitute.
+
+    :param cls: Type to register
+    :param reducer: Returns a value made of hashable types standing for the instance, i.e.
+        lambda point: (point.x, point.y). It is hashed together with the name of the type
+    """
+    _reducers[cls] = reducer
+    _handlers.clear()
+
+
+def hash_into(hasher, value) -> None:
+    """
+    Feed the canonical form of a value into a hash object, without building it as a string.
+
+    Equal values hash the same regardless of the order of dicts and sets. Primitives,
+    lists, tuples, dicts, sets, enums, pydantic models, dataclasses and NumPy arrays are
+    hashed by structure, other objects by repr unless a reducer is registered for them.
+
+    :param hasher: Object with an update(bytes) method, such as a hashlib hash
+    :param value: Value to hash
+    """
+    _feed(value, hasher.update, hasher)
+
+
+def canonical_digest(value, hasher_factory=hashlib.sha256) -> bytes:
+    """
+    :param value: Value to hash
+    :param hasher_factory: Returns a new hash object
+    :return: Digest of the canonical form of value
+    """
+    hasher = hasher_factory()
+    hash_into(hasher, value)
+    return hasher.digest()
+
+
+def _feed(value, update, hasher) -> None:
+    cls = type(value)
+    handler = _handlers.get(cls)
+    if handler is None:
+        handler = _handlers[cls] = _resolve(cls)
+    handler(value, update, hasher)
+
+
+def _type_name(cls: type) -> bytes:
+    name = f"{cls.__module__}.{cls.__qualname__}".encode()
+    return _LENGTH.pack(len(name)) + name
+
+
+def _feed_none(value, update, hasher):
+    update(b"N")
+
+
+def _feed_bool(value, update, hasher):
+    update(b"T" if value else b"F")
+
+
+def _feed_int(value, update, hasher):
+    data = value.to_bytes(value.bit_length() // 8 + 1, "little", signed=True)
+    update(b"i" + _LENGTH.pack(len(data)) + data)
+
+
+def _feed_float(value, update, hasher):
+    update(b"f" + _FLOAT.pack(value))
+
+
+def _feed_complex(value, update, hasher):
+    update(b"c" + _FLOAT.pack(value.real) + _FLOAT.pack(value.imag))
+
+
+def _feed_str(value, update, hasher):
+    data = value.encode("utf-8", "surrogatepass")
+    if len(data) < 1024:
+        update(b"s" + _LENGTH.pack(len(data)) + data)
+    else:
+        update(b"s" + _LENGTH.pack(len(data)))
+        update(data)
+
+
+def _feed_bytes(value, update, hasher):
+    update(b"b" + _LENGTH.pack(len(value)))
+    update(value)
+
+
+def _feed_items(tag: bytes, value, update, hasher) -> None:
+    update(tag + _LENGTH.pack(len(value)))
+    kinds = set(map(type, value))
+    # Runs of numbers or strings go in one update instead of one per element
+    if kinds == {int}:
+        try:
+            packed = array("q", value)
+        except OverflowError:
+            pass
+        else:
+            update(b"I")
+            update(packed)
+            return
+    elif kinds == {float}:
+        update(b"D")
+        update(array("d", value))
+        return
+    elif kinds == {str}:
+        encoded = [item.encode("utf-8", "surrogatepass") for item in value]
+        update(b"S")
+        update(array("Q", map(len, encoded)))
+        update(b"".join(encoded))
+        return
+    update(b"*")
+    for item in value:
+        _feed(item, update, hasher)
+
+
+def _feed_list(value, update, hasher):
+    _feed_items(b"l", value, update, hasher)
+
+
+def _feed_tuple(value, update, hasher):
+    _feed_items(b"t", value, update, hasher)
+
+
+def _is_ordered(items) -> bool:
+    kinds = set(map(type, items))
+    return any(kinds <= group for group in _ORDERED_GROUPS)
+
+
+def _item_digests(hasher, items) -> list:
+    """
+    Sorted digests of unordered items, each hashed on a copy of the hasher's current state.
+    The state is the same for every item, so the result doesn't depend on their order.
+    """
+    base = hasher.copy() if hasattr(hasher, "copy") else hashlib.sha256()
+    digests = []
+    for values in items:
+        item_hasher = base.copy()
+        for value in values:
+            _feed(value, item_hasher.update, item_hasher)
+        digests.append(item_hasher.digest())
+    digests.sort()
+    return digests
+
+
+def _feed_dict(value, update, hasher):
+    update(b"d" + _LENGTH.pack(len(value)))
+    if _is_ordered(value):
+        for key in sorted(value):
+            _feed(key, update, hasher)
+            _feed(value[key], update, hasher)
+    else:
+        for digest in _item_digests(hasher, value.items()):
+            update(digest)
+
+
+def _feed_set(value, update, hasher):
+    update((b"e" if type(value) is set else b"z") + _LENGTH.pack(len(value)))
+    if _is_ordered(value):
+        _feed_items(b"", sorted(value), update, hasher)
+    else:
+        for digest in _item_digests(hasher, ((item,) for item in value)):
+            update(digest)
+
+
+def _feed_object(value, update, hasher):
+    # Default reprs contain the object's address, so such objects only match themselves
+    update(b"o" + _type_name(type(value)))
+    _feed_str(repr(value), update, hasher)
+
+
+_BUILTIN_HANDLERS = {
+    type(None): _feed_none,
+    bool: _feed_bool,
+    int: _feed_int,
+    float: _feed_float,
+    complex: _feed_complex,
+    str: _feed_str,
+    bytes: _feed_bytes,
+    bytearray: _feed_bytes,
+    list: _feed_list,
+    tuple: _feed_tuple,
+    dict: _feed_dict,
+    set: _feed_set,
+    frozenset: _feed_set,
+}
+
+
+def _resolve(cls: type) -> Callable:
+    """Handler hashing instances of cls"""
+    for base in cls.__mro__:
+        if base in _reducers:
+            return _reduced_handler(cls, _reducers[base])
+    if cls in _BUILTIN_HANDLERS:
+        return _BUILTIN_HANDLERS[cls]
+    if issubclass(cls, enum.Enum):
+        return _named_handler(cls, lambda member: member.value)
+    if issubclass(cls, BaseModel):
+        return _model_handler(cls)
+    if dataclasses.is_dataclass(cls):
+        return _dataclass_handler(cls)
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and issubclass(cls, (numpy.ndarray, numpy.generic)):
+        return _feed_numpy
+    for base in cls.__mro__[1:]:
+        if base in _BUILTIN_HANDLERS and base is not object:
+            # Subclasses of builtins are hashed as their base, under their own name
+            return _named_handler(cls, base)
+    return _feed_object
+
+
+def _named_handler(cls: type, convert: Callable) -> Callable:
+    name = b"n" + _type_name(cls)
+
+    def handler(value, update, hasher):
+        update(name)
+        _feed(convert(value), update, hasher)
+
+    return handler
+
+
+def _reduced_handler(cls: type, reducer: Callable) -> Callable:
+    name = b"r" + _type_name(cls)
+
+    def handler(value, update, hasher):
+        update(name)
+        _feed(reducer(value), update, hasher)
+
+    return handler
+
+
+def _model_handler(cls: type) -> Callable:
+    name = b"m" + _type_name(cls)
+
+    def handler(value, update, hasher):
+        update(name)
+        for field in type(value).model_fields:
+            _feed_str(field, update, hasher)
+            _feed(getattr(value, field), update, hasher)
+        extra = value.__pydantic_extra__
+        _feed(extra if extra else None, update, hasher)
+
+    return handler
+
+
+def _dataclass_handler(cls: type) -> Callable:
+    name = b"a" + _type_name(cls)
+    fields = [field.name for field in dataclasses.fields(cls) if field.compare]
+
+    def handler(value, update, hasher):
+        update(name)
+        for field in fields:
+            _feed_str(field, update, hasher)
+            _feed(getattr(value, field), update, hasher)
+
+    return handler
+
+
+def _feed_numpy(value, update, hasher):
+    numpy = sys.modules["numpy"]
+    if value.dtype.hasobject:
+        # Object arrays hold references, hash their elements
+        update(b"x" + _LENGTH.pack(value.ndim))
+        update(array("Q", value.shape))
+        _feed_items(b"", value.ravel().tolist(), update, hasher)
+        return
+    value = numpy.ascontiguousarray(value)
+    dtype = value.dtype.str.encode()
+    update(b"y" + _LENGTH.pack(len(dtype)) + dtype + _LENGTH.pack(value.ndim))
+    update(array("Q", value.shape))
+    update(memoryview(value).cast("B"))
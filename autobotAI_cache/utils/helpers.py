@@ -1,6 +1,9 @@
 from autobotAI_cache.core.exceptions import CacheBackendError
 from autobotAI_cache.core.models import CacheScope
 
+# Argument names holding the request context, in lookup order. They are never part of cache keys
+CONTEXT_ARG_NAMES = ("ctx", "rctx", "_ctx", "_rctx", "request_context")
+
 
 def generate_scoped_context_key(arguments, scope: CacheScope = CacheScope.ORGANIZATION.value):
     # If Global Scope return 'global'
@@ -10,7 +13,7 @@ def generate_scoped_context_key(arguments, scope: CacheScope = CacheScope.ORGANI
     context = None
 
     # Fetch The context object
-    possible_context_key_names = ["ctx", "rctx", "_ctx", "_rctx", "request_context"]
+    possible_context_key_names = CONTEXT_ARG_NAMES
     
     # fetching context through 'self'
     if "self" in arguments:
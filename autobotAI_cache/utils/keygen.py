@@ -1,8 +1,220 @@
 import hashlib
 import inspect
+from typing import Callable, Union
 
+from autobotAI_cache.core.config import settings
 from autobotAI_cache.core.models import CacheScope
-from autobotAI_cache.utils.helpers import generate_scoped_context_key
+from autobotAI_cache.utils.hashing import hash_into
+from autobotAI_cache.utils.helpers import CONTEXT_ARG_NAMES, get_context_scope_string
+
+try:
+    import xxhash
+except ImportError:  # Optional, only the 'xxh3_128' key generator needs it
+    xxhash = None
+
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+_KEYWORD = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+
+
+def _blake2b_128():
+    return hashlib.blake2b(digest_size=16)
+
+
+class KeyGeneratorRegistry:
+    """
+    Registry of the hash algorithms of cache keys, selected with the KEY_GENERATOR setting.
+
+    A key generator is a callable returning a new hash object with update(bytes) and
+    hexdigest() methods, and preferably copy(), like the constructors of hashlib.
+    """
+
+    _generators = {
+        "sha256": hashlib.sha256,
+        # 128 bit digests halve the size of keys, and of their index in Redis and MongoDB
+        "blake2b": _blake2b_128,
+        # Non-cryptographic, fastest, but keys can be forged by whoever controls arguments
+        "xxh3_128": xxhash.xxh3_128 if xxhash is not None else None,
+    }
+
+    @classmethod
+    def get_generator(cls, generator: Union[str, Callable]) -> Callable:
+        """
+        Returns the hash constructor of a key generator.
+
+        :param generator: Name of a registered key generator, or a hash constructor
+        :return: Callable returning a new hash object
+        :raises ValueError: If the specified key generator is not registered or not installed
+        """
+        if callable(generator):
+            return generator
+        if generator not in cls._generators:
+            raise ValueError(f"Key generator '{generator}' is not registered.")
+        if cls._generators[generator] is None:
+            raise ValueError(f"Key generator '{generator}' needs the xxhash package.")
+        return cls._generators[generator]
+
+    @classmethod
+    def register_generator(cls, name: str, generator: Callable) -> None:
+        """
+        Registers a key generator, to be selected with KEY_GENERATOR=name.
+
+        :param name: Name of the key generator
+        :param generator: Callable returning a new hash object
+        """
+        cls._generators[name] = generator
+
+
+_key_hasher = (None, None)
+
+
+def new_key_hasher():
+    """New hash object of the configured KEY_GENERATOR"""
+    global _key_hasher
+    generator, constructor = _key_hasher
+    if generator != settings.KEY_GENERATOR:
+        generator = settings.KEY_GENERATOR
+        constructor = KeyGeneratorRegistry.get_generator(generator)
+        _key_hasher = (generator, constructor)
+    return constructor()
+
+
+class KeyPlan:
+    """
+    Everything needed to build the cache keys of a function, worked out once from its signature.
+
+    Keys are the same as generate_cache_key's, but calls are bound to parameter names without
+    inspect, and the ignored arguments, key components and context lookup are precomputed.
+    Argument values are fed into the hash by structure, see hash_into, not through their repr.
+    """
+
+    def __init__(
+        self,
+        func,
+        scope=CacheScope.ORGANIZATION.value,
+        key_prefix=None,
+        ignore_args=None,
+    ):
+        """
+        :param func: The function being memoized
+        :param scope: Scope level of generated keys, default CacheScope.ORGANIZATION.value
+        :param key_prefix: Optional prefix for the cache keys
+        :param ignore_args: List of argument names to exclude from key generation
+        """
+        self.func = func
+        self.scope = scope
+        self.signature = inspect.signature(func)
+        parameters = list(self.signature.parameters.values())
+
+        self._positional = [p.name for p in parameters if p.kind in _POSITIONAL]
+        self._positional_index = {name: index for index, name in enumerate(self._positional)}
+        self._keyword = {p.name for p in parameters if p.kind in _KEYWORD}
+        self._required = [
+            p.name
+            for p in parameters
+            if p.default is inspect.Parameter.empty
+            and p.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        ]
+        self._defaults = {
+            p.name: p.default for p in parameters if p.default is not inspect.Parameter.empty
+        }
+        self._var_positional = next(
+            (p.name for p in parameters if p.kind == inspect.Parameter.VAR_POSITIONAL), None
+        )
+        self._var_keyword = next(
+            (p.name for p in parameters if p.kind == inspect.Parameter.VAR_KEYWORD), None
+        )
+
+        # Context arguments are never part of the key
+        ignore = set(ignore_args or [])
+        ignore.update(CONTEXT_ARG_NAMES)
+        names = [p.name for p in parameters]
+        self._key_args = [
+            (name, f"\0{name}=".encode())
+            for name in sorted(names)
+            if name not in ignore and name not in ["self", "cls"]
+        ]
+        if "self" in names and "self" not in ignore:
+            self._instance_arg = "self"
+        elif "cls" in names and "cls" not in ignore:
+            self._instance_arg = "cls"
+        else:
+            self._instance_arg = None
+
+        # Where the request context is looked up, see generate_scoped_context_key
+        self._has_self = "self" in names
+        self._has_cls = "cls" in names
+        self._context_arg = next((name for name in CONTEXT_ARG_NAMES if name in names), None)
+
+        self._prefix = f"{key_prefix or ''}{func.__module__}.{func.__qualname__}:".encode()
+
+    def bind(self, args: tuple, kwargs: dict) -> dict:
+        """
+        Arguments of a call by parameter name, defaults included, like BoundArguments.arguments.
+
+        :raises TypeError: If the arguments don't match the signature
+        """
+        positional = self._positional
+        if len(args) > len(positional) and self._var_positional is None:
+            self.signature.bind(*args, **kwargs)  # Raises the interpreter's TypeError
+        arguments = dict(self._defaults)
+        arguments.update(zip(positional, args))
+        if self._var_positional is not None:
+            arguments[self._var_positional] = tuple(args[len(positional):])
+
+        extra = {}
+        for name, value in kwargs.items():
+            if name in self._keyword:
+                if self._positional_index.get(name, len(args)) < len(args):
+                    self.signature.bind(*args, **kwargs)  # Also given positionally
+                arguments[name] = value
+            elif self._var_keyword is not None:
+                extra[name] = value
+            else:
+                self.signature.bind(*args, **kwargs)
+        if self._var_keyword is not None:
+            arguments[self._var_keyword] = extra
+
+        if any(name not in arguments for name in self._required):
+            self.signature.bind(*args, **kwargs)
+        return arguments
+
+    def context_scope(self, arguments: dict) -> str:
+        """Scope string of a call, i.e. 'root_user_id:' for organization scope"""
+        if self.scope == CacheScope.GLOBAL.value:
+            return CacheScope.GLOBAL.value
+        context = None
+        if self._has_self:
+            instance = arguments["self"]
+            for name in CONTEXT_ARG_NAMES:
+                if hasattr(instance, name):
+                    context = getattr(instance, name)
+                    break
+        if context is None and self._context_arg is not None:
+            context = arguments[self._context_arg]
+        if context is None and self._has_cls:
+            owner = arguments["cls"]
+            for name in CONTEXT_ARG_NAMES:
+                if hasattr(owner, name):
+                    context = getattr(owner, name)
+                    break
+        return get_context_scope_string(context, self.scope)
+
+    def key_for(self, arguments: dict) -> str:
+        """Cache key of a call from its bound arguments"""
+        hasher = new_key_hasher()
+        hasher.update(self._prefix)
+        for name, label in self._key_args:
+            hasher.update(label)
+            hash_into(hasher, arguments[name])
+        if self._instance_arg == "self":
+            hasher.update(f"\0self_id={id(arguments['self'])}".encode())
+        elif self._instance_arg == "cls":
+            hasher.update(f"\0cls_name={arguments['cls'].__name__}".encode())
+        return f"{self.context_scope(arguments)}:{hasher.hexdigest()}"
+
+    def key(self, args: tuple, kwargs: dict) -> str:
+        """Cache key of a call"""
+        return self.key_for(self.bind(args, kwargs))
 
 
 def generate_cache_key(
@@ -17,6 +229,8 @@ def generate_cache_key(
     """
     Generates a unique cache key based on the function, arguments, and keyword arguments.
 
+    Decorators build a KeyPlan once per function instead, this works out the plan on every call.
+
     :param func: The function being memoized
     :param args: Positional arguments passed to the function
     :param kwargs: Keyword arguments passed to the function
@@ -25,39 +239,19 @@ def generate_cache_key(
     :param ignore_args: List of argument names to exclude from key generation
     :return: The generated cache key
     """
-    # Preevent context from being the part of key string
-    ignore_args = set(ignore_args or [])
-    ignore_args.update(["ctx", "rctx", "_ctx", "_rctx", "request_context"])
-    bound = inspect.signature(func).bind(*args, **kwargs)
-    bound.apply_defaults()
-
-    key_components = []
-    # Handle self/cls intelligently
-    if "self" in bound.arguments and "self" not in ignore_args:
-        key_components.append(f"self_id={id(bound.arguments['self'])}")
-    elif "cls" in bound.arguments and "cls" not in ignore_args:
-        key_components.append(f"cls_name={bound.arguments['cls'].__name__}")
-
-    # Filter out ignored arguments
-    filtered_args = {
-        name: value
-        for name, value in bound.arguments.items()
-        if name not in ignore_args and name not in ["self", "cls"]
-    }
+    return KeyPlan(func, scope=scope, key_prefix=key_prefix, ignore_args=ignore_args).key(args, kwargs)
 
-    # Ensure consistent ordering for keyword arguments
-    sorted_items = sorted(filtered_args.items())
-    arg_str = "_".join(f"{name}={repr(value)}" for name, value in sorted_items)
 
-    # String for key components
-    key_components_str = "_".join(key_components)
-
-    # Build a fully qualified function name (module and qualified name)
-    func_qualname = f"{func.__module__}.{func.__qualname__}"
-
-    key_str = f"{key_prefix or ''}{func_qualname}:{arg_str}_{key_components_str}"
-
-    # scoped_context_key refers to user_id, root_user_id or global
-    scoped_context_key = generate_scoped_context_key(bound.arguments, scope=scope)
+def generate_element_key(base_key, element):
+    """
+    Derives the cache key of one element of a batch from the key of the whole call.
 
-    return f"{scoped_context_key}:{hashlib.sha256(key_str.encode()).hexdigest()}"
+    :param base_key: Key generated for the call with the batch argument ignored
+    :param element: Element of the batch argument
+    :return: The scoped cache key of the element
+    """
+    scoped_context_key, digest = base_key.rsplit(":", 1)
+    hasher = new_key_hasher()
+    hasher.update(f"{digest}:".encode())
+    hash_into(hasher, element)
+    return f"{scoped_context_key}:{hasher.hexdigest()}"
@@ -0,0 +1,106 @@
+import copy
+import struct
+from typing import Any, Dict, Tuple
+
+# Prefix of values carrying a header. Serialized values never start with it: pickle starts with
+# its protocol opcode (0x80) and JSON with a printable character
+MAGIC = b"\x00\xac"
+
+# Header flags, each set flag is followed by its field in this order
+HAS_EXPIRE_AT = 0x01
+HAS_DELTA = 0x02
+HAS_SERIALIZER = 0x04
+HAS_COMPRESSION = 0x08
+
+_HEADER = struct.Struct("<2sB")
+_FLOAT = struct.Struct("<d")
+_CODE = struct.Struct("<B")
+
+
+class Envelope:
+    """A cached object together with its header fields, for backends storing objects"""
+
+    __slots__ = ("value", "fields")
+
+    def __init__(self, value: Any, fields: Dict[str, Any]):
+        self.value = value
+        self.fields = fields
+
+    def __copy__(self) -> "Envelope":
+        # Backends copying on read copy the cached object, not just its envelope
+        return Envelope(copy.copy(self.value), self.fields)
+
+
+def pack(
+    value: bytes,
+    expire_at: float = None,
+    delta: float = None,
+    serializer: int = None,
+    compression: int = None,
+) -> bytes:
+    """
+    Prefix a serialized value with a header holding the given fields.
+
+    :param value: Serialized value
+    :param expire_at: Epoch time after which the value is stale
+    :param delta: Seconds it took to compute the value
+    :param serializer: Code of the serializer that wrote the value
+    :param compression: Code of the compressor the value is compressed with
+    :return: The value with its header
+    """
+    flags = 0
+    fields = b""
+    if expire_at is not None:
+        flags |= HAS_EXPIRE_AT
+        fields += _FLOAT.pack(expire_at)
+    if delta is not None:
+        flags |= HAS_DELTA
+        fields += _FLOAT.pack(delta)
+    if serializer is not None:
+        flags |= HAS_SERIALIZER
+        fields += _CODE.pack(serializer)
+    if compression is not None:
+        flags |= HAS_COMPRESSION
+        fields += _CODE.pack(compression)
+    return _HEADER.pack(MAGIC, flags) + fields + value
+
+
+def unpack(data: bytes) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Split a value written by pack into the serialized value and its header fields.
+
+    Values without a header are returned as they are with no fields.
+
+    :param data: Value read from a backend
+    :return: The serialized value and a dict of its header fields
+    """
+    if data[:2] != MAGIC:
+        return data, {}
+    _, flags = _HEADER.unpack_from(data)
+    offset = _HEADER.size
+    fields = {}
+    if flags & HAS_EXPIRE_AT:
+        (fields["expire_at"],) = _FLOAT.unpack_from(data, offset)
+        offset += _FLOAT.size
+    if flags & HAS_DELTA:
+        (fields["delta"],) = _FLOAT.unpack_from(data, offset)
+        offset += _FLOAT.size
+    if flags & HAS_SERIALIZER:
+        (fields["serializer"],) = _CODE.unpack_from(data, offset)
+        offset += _CODE.size
+    if flags & HAS_COMPRESSION:
+        (fields["compression"],) = _CODE.unpack_from(data, offset)
+        offset += _CODE.size
+    return data[offset:], fields
+
+
+def pack_object(value: Any, **fields) -> Envelope:
+    """Object counterpart of pack, for backends that store objects"""
+    return Envelope(value, {name: field for name, field in fields.items() if field is not None})
+
+
+def unpack_object(value: Any) -> Tuple[Any, Dict[str, Any]]:
+    """Object counterpart of unpack, objects stored without an envelope have no fields"""
+    if isinstance(value, Envelope):
+        return value.value, value.fields
+    return value, {}
@@ -1,7 +1,191 @@
+import io
 import pickle
 import json
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
+from pydantic import BaseModel
+
+from autobotAI_cache.core.config import settings
 from autobotAI_cache.core.exceptions import SerializationError
+from autobotAI_cache.utils.compression import CompressorRegistry, compression_for
+from autobotAI_cache.utils.payload import pack, unpack
+
+try:
+    import msgpack
+except ImportError:  # Optional, only the 'msgpack' serializer needs it
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # Optional, only the 'orjson' serializer needs it
+    orjson = None
+
+
+class Serializer:
+    """A format of cached values, named in the header of the payloads written with it"""
+
+    def __init__(
+        self,
+        name: str,
+        code: int,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+        requires: Optional[str] = None,
+    ):
+        """
+        :param name: Name the serializer is selected with
+        :param code: Number from 1 to 255 identifying the serializer in payload headers, it must
+            never be reused for another format
+        :param dumps: Serializes a value to bytes
+        :param loads: Deserializes the bytes written by dumps
+        :param requires: Package the serializer needs when it isn't installed, None if available
+        """
+        self.name = name
+        self.code = code
+        self.dumps = dumps
+        self.loads = loads
+        self.requires = requires
+
+
+def _load_model(cls, data: dict) -> BaseModel:
+    return cls.model_validate(data)
+
+
+class _ModelPickler(pickle.Pickler):
+    """Pickles pydantic models as their class reference and field values"""
+
+    def reducer_override(self, obj):
+        # Not called for builtin containers and primitives, which keeps plain data fast
+        if isinstance(obj, BaseModel):
+            return _load_model, (type(obj), obj.model_dump(by_alias=True, round_trip=True))
+        return NotImplemented
+
+
+def _dumps_pydantic(data) -> bytes:
+    buffer = io.BytesIO()
+    _ModelPickler(buffer, protocol=5).dump(data)
+    return buffer.getvalue()
+
+
+def _dumps_json(data) -> bytes:
+    return json.dumps(data).encode("utf-8")
+
+
+def _loads_json(data: bytes):
+    return json.loads(data.decode("utf-8"))
+
+
+def _to_builtin(obj):
+    """Fallback of the msgpack and orjson serializers for pydantic models"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def _dumps_msgpack(data) -> bytes:
+    return msgpack.packb(data, use_bin_type=True, default=_to_builtin)
+
+
+def _loads_msgpack(data: bytes):
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _dumps_orjson(data) -> bytes:
+    return orjson.dumps(
+        data, default=_to_builtin, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+class SerializerRegistry:
+    """
+    Registry of serializers, selected with the SERIALIZER setting or memoize(serializer=...).
+    """
+
+    _serializers: Dict[str, Serializer] = {}
+    _codes: Dict[int, Serializer] = {}
+
+    @classmethod
+    def register_serializer(cls, serializer: Serializer) -> None:
+        """
+        Registers a serializer.
+
+        :param serializer: Serializer to register
+        :raises ValueError: If its code is taken by a serializer of another name
+        """
+        registered = cls._codes.get(serializer.code)
+        if registered is not None and registered.name != serializer.name:
+            raise ValueError(
+                f"Serializer code {serializer.code} is already used by '{registered.name}'."
+            )
+        cls._serializers[serializer.name] = serializer
+        cls._codes[serializer.code] = serializer
+
+    @classmethod
+    def get_serializer(cls, serializer: Union[str, Serializer]) -> Serializer:
+        """
+        Returns a serializer by name.
+
+        :param serializer: Name of a registered serializer, or a Serializer
+        :return: The serializer
+        :raises ValueError: If the specified serializer is not registered or not installed
+        """
+        if isinstance(serializer, Serializer):
+            found = serializer
+        elif serializer in cls._serializers:
+            found = cls._serializers[serializer]
+        else:
+            raise ValueError(f"Serializer '{serializer}' is not registered.")
+        if found.requires is not None:
+            raise ValueError(f"Serializer '{found.name}' needs the {found.requires} package.")
+        return found
+
+    @classmethod
+    def get_serializer_by_code(cls, code: int) -> Serializer:
+        """
+        Returns the serializer named in a payload header.
+
+        :raises ValueError: If no serializer is registered with the code, or it isn't installed
+        """
+        if code not in cls._codes:
+            raise ValueError(f"No serializer is registered with code {code}.")
+        return cls.get_serializer(cls._codes[code])
+
+
+for _serializer in [
+    Serializer("pickle", 1, pickle.dumps, pickle.loads),
+    Serializer("json", 2, _dumps_json, _loads_json),
+    Serializer("pickle5", 3, lambda data: pickle.dumps(data, protocol=5), pickle.loads),
+    Serializer("pydantic", 4, _dumps_pydantic, pickle.loads),
+    Serializer(
+        "msgpack",
+        5,
+        _dumps_msgpack,
+        _loads_msgpack,
+        requires="msgpack" if msgpack is None else None,
+    ),
+    Serializer(
+        "orjson",
+        6,
+        _dumps_orjson,
+        orjson.loads if orjson is not None else None,
+        requires="orjson" if orjson is None else None,
+    ),
+]:
+    SerializerRegistry.register_serializer(_serializer)
+
+
+_configured = (None, None)
+
+
+def configured_serializer() -> Serializer:
+    """Serializer of the SERIALIZER setting"""
+    global _configured
+    name, serializer = _configured
+    if name != settings.SERIALIZER:
+        name = settings.SERIALIZER
+        serializer = SerializerRegistry.get_serializer(name)
+        _configured = (name, serializer)
+    return serializer
 
 
 def serialize(data, serializer="pickle"):
@@ -9,17 +193,12 @@ def serialize(data, serializer="pickle"):
     Serialize data using the specified serializer
 
     :param data: Data to serialize
-    :param serializer: Serializer name ('pickle' or 'json')
+    :param serializer: Serializer name (i.e. 'pickle' or 'json') or Serializer
     :return: Serialized data as bytes
     :raises SerializationError: If serialization fails
     """
     try:
-        if serializer == "pickle":
-            return pickle.dumps(data)
-        elif serializer == "json":
-            return json.dumps(data).encode("utf-8")
-        else:
-            raise ValueError(f"Invalid serializer: {serializer}")
+        return SerializerRegistry.get_serializer(serializer).dumps(data)
     except Exception as e:
         raise SerializationError(f"Failed to serialize data: {e}")
 
@@ -29,16 +208,72 @@ def deserialize(data, serializer="pickle"):
     Deserialize data using the specified serializer
 
     :param data: Serialized data
-    :param serializer: Serializer name ('pickle' or 'json')
+    :param serializer: Serializer name (i.e. 'pickle' or 'json') or Serializer
     :return: Deserialized data
     :raises SerializationError: If deserialization fails
     """
     try:
-        if serializer == "pickle":
-            return pickle.loads(data)
-        elif serializer == "json":
-            return json.loads(data.decode("utf-8"))
+        return SerializerRegistry.get_serializer(serializer).loads(data)
+    except Exception as e:
+        raise SerializationError(f"Failed to deserialize data: {e}")
+
+
+def serialize_payload(
+    data,
+    serializer: Optional[Serializer] = None,
+    collection_name: Optional[str] = None,
+    **fields,
+) -> bytes:
+    """
+    Serialize data behind a header naming the serializer, see utils.payload.
+
+    Values at least as large as the compression threshold of the collection are compressed,
+    unless that doesn't make them smaller, and the header names the compressor.
+
+    :param data: Data to serialize
+    :param serializer: Serializer to use, defaults to the SERIALIZER setting
+    :param collection_name: Collection the payload is written to, see COLLECTION_COMPRESSION
+    :param fields: Header fields, i.e. expire_at
+    :return: The payload
+    :raises SerializationError: If serialization fails
+    """
+    serializer = serializer or configured_serializer()
+    compression = compression_for(collection_name)
+    try:
+        serialized = serializer.dumps(data)
+        if compression is not None and len(serialized) >= compression[1]:
+            compressor = compression[0]
+            compressed = compressor.compress(serialized)
+            if len(compressed) < len(serialized):
+                return pack(
+                    compressed, serializer=serializer.code, compression=compressor.code, **fields
+                )
+    except Exception as e:
+        raise SerializationError(f"Failed to serialize data: {e}")
+    return pack(serialized, serializer=serializer.code, **fields)
+
+
+def deserialize_payload(data: bytes, serializer: Optional[Serializer] = None) -> Tuple[Any, dict]:
+    """
+    Deserialize a payload with the serializer named in its header, decompressing it first if
+    its header names a compressor.
+
+    :param data: Payload read from a backend
+    :param serializer: Serializer of values written without a header, defaults to the
+        SERIALIZER setting
+    :return: The data and the other header fields
+    :raises SerializationError: If deserialization fails
+    """
+    value, fields = unpack(data)
+    try:
+        compression = fields.pop("compression", None)
+        if compression is not None:
+            value = CompressorRegistry.get_compressor_by_code(compression).decompress(value)
+        code = fields.pop("serializer", None)
+        if code is not None:
+            serializer = SerializerRegistry.get_serializer_by_code(code)
         else:
-            raise ValueError(f"Invalid serializer: {serializer}")
+            serializer = serializer or configured_serializer()
+        return serializer.loads(value), fields
     except Exception as e:
         raise SerializationError(f"Failed to deserialize data: {e}")
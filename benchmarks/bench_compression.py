@@ -0,0 +1,64 @@
+"""
+Size and CPU trade-off of the COMPRESSION options.
+
+Serializes a cloud-inventory-like payload of JSON-style records and reports, for every
+installed compressor, the compression ratio and the milliseconds spent compressing and
+decompressing it.
+
+    PYTHONPATH=. python benchmarks/bench_compression.py [records]
+"""
+import pickle
+import sys
+import time
+
+from autobotAI_cache.utils.compression import CompressorRegistry
+
+
+def inventory(records: int) -> list:
+    return [
+        {
+            "id": f"i-{i:017x}",
+            "arn": f"arn:aws:ec2:us-east-1:123456789012:instance/i-{i:017x}",
+            "type": "ec2:instance",
+            "region": ["us-east-1", "eu-west-1", "ap-south-1"][i % 3],
+            "state": "running" if i % 7 else "stopped",
+            "tags": {"env": "prod" if i % 2 else "staging", "team": f"team-{i % 12}"},
+            "security_groups": [f"sg-{(i * 31) % 997:08x}", f"sg-{(i * 17) % 991:08x}"],
+            "launch_time": 1700000000 + i * 60,
+        }
+        for i in range(records)
+    ]
+
+
+def measure(data: bytes, compressor, rounds: int = 3) -> dict:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        compressed = compressor.compress(data)
+    compress_ms = (time.perf_counter() - start) / rounds * 1000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        compressor.decompress(compressed)
+    decompress_ms = (time.perf_counter() - start) / rounds * 1000
+    return {
+        "ratio": len(data) / len(compressed),
+        "compress ms": compress_ms,
+        "decompress ms": decompress_ms,
+    }
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    data = pickle.dumps(inventory(records), protocol=5)
+    print(f"payload: {len(data) / 1024 / 1024:.1f} MiB")
+    for name in ["zlib", "lzma", "lz4", "zstd"]:
+        try:
+            compressor = CompressorRegistry.get_compressor(name)
+        except ValueError as e:
+            print(f"{name:<6}skipped: {e}")
+            continue
+        result = measure(data, compressor)
+        print(f"{name:<6}" + "  ".join(f"{label}: {value:8.1f}" for label, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Speed and key size of the KEY_GENERATOR options.
+
+Reports microseconds per key built by a KeyPlan for a call with a few small arguments and
+for one with a large list argument, and the length of the keys, for every installed
+key generator.
+
+    PYTHONPATH=. python benchmarks/bench_key_generators.py [calls]
+"""
+import sys
+import time
+
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.models import CacheScope
+from autobotAI_cache.utils.keygen import KeyGeneratorRegistry, KeyPlan
+
+
+def lookup(account_id, region="us-east-1", resource_ids=None):
+    return account_id
+
+
+def measure(calls: int, plan: KeyPlan, args: tuple, kwargs: dict) -> float:
+    plan.key(args, kwargs)
+    start = time.perf_counter()
+    for _ in range(calls):
+        plan.key(args, kwargs)
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    plan = KeyPlan(lookup, scope=CacheScope.GLOBAL.value)
+    small = (("123456789012",), {"region": "eu-west-1"})
+    large = (("123456789012",), {"resource_ids": [f"i-{i:017x}" for i in range(10_000)]})
+
+    for name in ["sha256", "blake2b", "xxh3_128"]:
+        try:
+            KeyGeneratorRegistry.get_generator(name)
+        except ValueError as e:
+            print(f"{name:<10}skipped: {e}")
+            continue
+        settings.configure(KEY_GENERATOR=name)
+        small_us = measure(calls, plan, *small)
+        large_us = measure(max(calls // 100, 10), plan, *large)
+        key_length = len(plan.key(*small))
+        print(f"{name:<10}small: {small_us:8.2f} us/key  large: {large_us:8.1f} us/key  key length: {key_length}")
+    settings.reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Per-call overhead of memoize on a cache hit.
+
+Reports microseconds per call of the undecorated function, of building its cache key with
+generate_cache_key (which inspects the signature on every call), with the KeyPlan memoize
+builds once per function, and of a memoized call hitting the in-memory backend.
+
+    PYTHONPATH=. python benchmarks/bench_memoize_overhead.py [calls]
+"""
+import sys
+import time
+
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.decorators import memoize
+from autobotAI_cache.core.models import CacheScope
+from autobotAI_cache.utils.keygen import KeyPlan, generate_cache_key
+
+
+def lookup(account_id, region="us-east-1", limit=100):
+    return {"account_id": account_id, "region": region, "limit": limit}
+
+
+def measure(calls: int, fn) -> float:
+    fn()  # Warm up, the memoized call stores its result here
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    settings.configure(BACKEND="memory")
+    scope = CacheScope.GLOBAL.value
+    args, kwargs = ("123456789012",), {"limit": 50}
+    plan = KeyPlan(lookup, scope=scope)
+    memoized = memoize(scope=scope)(lookup)
+
+    for name, fn in [
+        ("plain call", lambda: lookup(*args, **kwargs)),
+        ("generate_cache_key", lambda: generate_cache_key(lookup, args, kwargs, scope=scope)),
+        ("KeyPlan.key", lambda: plan.key(args, kwargs)),
+        ("memoized hit", lambda: memoized(*args, **kwargs)),
+    ]:
+        print(f"{name:<20}{measure(calls, fn):8.2f} us/call")
+    settings.reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Memory overhead of the in-memory backend.
+
+Reports the bytes the backend allocates per entry on top of the keys and values themselves,
+and the duration of a full garbage collection with the entries stored, for the default and
+the compact storage.
+
+    PYTHONPATH=. python benchmarks/bench_memory_entry_size.py [entries]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from autobotAI_cache.backends.memory import MemoryBackend
+
+
+def measure(entries: int, **options) -> dict:
+    keys = [f"root:user:{i:032x}" for i in range(entries)]
+    values = [b"v" * 64 for _ in range(entries)]
+    payload = sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in zip(keys, values))
+
+    gc.collect()
+    tracemalloc.start()
+    backend = MemoryBackend(**options)
+    for key, value in zip(keys, values):
+        backend.set(key, value, collection_name="bench", ttl=3600)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    gc.collect()
+    collect_ms = (time.perf_counter() - start) * 1000
+    backend.close()
+    # Keys and values are allocated before tracing started, only the structures are counted
+    return {
+        "bytes/entry": used / entries,
+        "payload bytes/entry": payload / entries,
+        "gc.collect ms": collect_ms,
+    }
+
+
+def main() -> None:
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for name, options in [
+        ("fifo", {"eviction": "fifo"}),
+        ("lru", {"eviction": "lru"}),
+        ("fifo compact", {"eviction": "fifo", "compact": True}),
+        ("lru compact", {"eviction": "lru", "compact": True}),
+    ]:
+        result = measure(entries, **options)
+        print(f"{name:<14}" + "  ".join(f"{label}: {value:8.1f}" for label, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,18 @@ setup(
     author_email="hello@shunyeka.com",
     packages=find_packages(),
     install_requires=[
-        "pymongo",
+        "pymongo>=4.13",
         "pydantic",
         "python-dotenv",
-        "redis",
+        "redis>=5.0.1",
     ],
+    extras_require={
+        "xxhash": ["xxhash"],
+        "msgpack": ["msgpack"],
+        "orjson": ["orjson"],
+        "lz4": ["lz4"],
+        "zstd": ["zstandard"],
+    },
     classifiers=[
         "License :: Other/Proprietary License" "Operating System :: OS Independent",
         "Programming Language :: Python :: 3.10",
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest  # type: ignore
+from autobotAI_cache.backends.async_base import InlineAsyncBackend, ThreadedAsyncBackend
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.decorators import memoize, memoize_batch
+from autobotAI_cache.core.models import CacheScope
+
+
+@pytest.fixture(params=["memory", "object_memory"])
+def backend_name(request):
+    settings.configure(BACKEND=request.param, BACKEND_OPTIONS={})
+    yield request.param
+    settings.reset()
+
+
+class TestAsyncMemoize:
+    def test_caches_coroutine_result(self, backend_name):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value)
+        async def my_function(x):
+            calls.append(x)
+            await asyncio.sleep(0)
+            return {"value": x * 2}
+
+        async def main():
+            assert await my_function(2) == {"value": 4}
+            assert await my_function(2) == {"value": 4}
+            assert await my_function(3) == {"value": 6}
+
+        asyncio.run(main())
+        assert calls == [2, 3]
+        assert asyncio.iscoroutinefunction(my_function)
+        assert isinstance(settings.async_backend, InlineAsyncBackend)
+
+    def test_shares_data_with_sync_backend(self, backend_name):
+        settings.backend.set("global:a", b"value", ttl=60, collection_name="shared")
+
+        async def main():
+            backend = settings.async_backend
+            assert await backend.get("global:a", collection_name="shared") == b"value"
+            await backend.set_many({"global:b": b"other"}, ttl=60, collection_name="shared")
+
+        asyncio.run(main())
+        assert settings.backend.get("global:b", collection_name="shared") == b"other"
+
+    def test_fail_silently(self, backend_name):
+        @memoize(scope=CacheScope.GLOBAL.value, fail_silently=True)
+        async def my_function(x):
+            return lambda: x  # not serializable
+
+        assert asyncio.run(my_function(2))() == 2
+
+    def test_memoize_batch(self, backend_name):
+        calls = []
+
+        @memoize_batch(batch_arg="ids", scope=CacheScope.GLOBAL.value)
+        async def fetch(ids):
+            calls.append(list(ids))
+            return [i * 10 for i in ids]
+
+        async def main():
+            assert await fetch([1, 2]) == [10, 20]
+            assert await fetch([2, 3, 1]) == [20, 30, 10]
+
+        asyncio.run(main())
+        assert calls == [[1, 2], [3]]
+
+    def test_disk_backend_runs_in_threads(self, tmp_path):
+        settings.configure(
+            BACKEND="disk", BACKEND_OPTIONS={"path": str(tmp_path / "cache.sqlite3")}
+        )
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value)
+        async def my_function(x):
+            calls.append(x)
+            return x * 2
+
+        async def main():
+            results = await asyncio.gather(*(my_function(i % 3) for i in range(6)))
+            assert results == [0, 2, 4, 0, 2, 4]
+            assert await my_function(1) == 2
+
+        try:
+            assert isinstance(settings.async_backend, ThreadedAsyncBackend)
+            asyncio.run(main())
+            assert sorted(set(calls)) == [0, 1, 2]
+        finally:
+            settings.reset()
+
+    def test_single_flight(self, backend_name):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, single_flight=True)
+        async def my_function(x):
+            calls.append(x)
+            await asyncio.sleep(0.05)
+            return [x]
+
+        async def main():
+            return await asyncio.gather(*(my_function(1) for _ in range(10)))
+
+        assert asyncio.run(main()) == [[1]] * 10
+        assert calls == [1]
+
+    def test_stale_while_revalidate(self, backend_name):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, ttl=1, stale_ttl=5)
+        async def my_function(x):
+            calls.append(x)
+            return len(calls)
+
+        async def main():
+            assert await my_function(1) == 1
+            await asyncio.sleep(1.1)
+            assert await my_function(1) == 1
+            await asyncio.sleep(0.1)  # Let the refresh task run
+            assert await my_function(1) == 2
+
+        asyncio.run(main())
+        assert calls == [1, 1]
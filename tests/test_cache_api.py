@@ -0,0 +1,42 @@
+import pytest  # type: ignore
+from autobotAI_cache.core import cache
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.exceptions import CacheBackendError
+from autobotAI_cache.core.models import CacheScope
+from helpers import RequestContext, UserContext
+
+
+def make_context(root_user_id, user_id):
+    return RequestContext(
+        config={},
+        user_context=UserContext(root_user={"id": root_user_id}, user={"id": user_id}),
+    )
+
+
+@pytest.fixture(params=["memory", "object_memory"])
+def backend_name(request):
+    settings.configure(BACKEND=request.param, BACKEND_OPTIONS={})
+    yield request.param
+    settings.reset()
+
+
+class TestCacheApi:
+    def test_round_trip(self, backend_name):
+        items = {f"resource:{i}": {"id": i} for i in range(300)}
+        cache.set_many(items, scope=CacheScope.GLOBAL.value)
+        found = cache.get_many(list(items) + ["resource:missing"], scope=CacheScope.GLOBAL.value)
+        assert found == items
+        cache.delete_many(["resource:0", "resource:missing"], scope=CacheScope.GLOBAL.value)
+        assert "resource:0" not in cache.get_many(["resource:0"], scope=CacheScope.GLOBAL.value)
+
+    def test_keys_are_scoped(self, backend_name):
+        org1, org2 = make_context("org1", "u1"), make_context("org2", "u1")
+        cache.set_many({"resource": "org1 value"}, context=org1)
+        assert cache.get_many(["resource"], context=org1) == {"resource": "org1 value"}
+        assert cache.get_many(["resource"], context=org2) == {}
+        assert cache.make_key("resource", org1).startswith("org1::")
+        assert cache.make_key("resource", org1, CacheScope.USER.value).startswith("org1:u1:")
+
+    def test_context_is_required(self, backend_name):
+        with pytest.raises(CacheBackendError):
+            cache.get_many(["resource"])
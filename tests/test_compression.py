@@ -0,0 +1,86 @@
+import os
+
+import pytest  # type: ignore
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.decorators import memoize
+from autobotAI_cache.core.models import CacheScope
+from autobotAI_cache.utils.compression import CompressorRegistry
+from autobotAI_cache.utils.keygen import KeyPlan
+from autobotAI_cache.utils.payload import unpack
+from autobotAI_cache.utils.serializers import deserialize_payload, serialize_payload
+
+
+def inventory(count):
+    return [
+        {"id": f"i-{i:017x}", "region": "us-east-1", "tags": {"env": "prod"}}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def reset_settings():
+    yield
+    settings.reset()
+
+
+class TestCompression:
+    @pytest.mark.parametrize("name", ["zlib", "lzma", "lz4", "zstd"])
+    def test_round_trip(self, name):
+        try:
+            compressor = CompressorRegistry.get_compressor(name)
+        except ValueError:
+            pytest.skip(f"{name} is not installed")
+        settings.configure(
+            COMPRESSION=name,
+            COMPRESSION_THRESHOLD=1024,
+            COLLECTION_COMPRESSION={"sessions": {"algorithm": None}},
+        )
+        data = inventory(500)
+        payload = serialize_payload(data)
+        _, fields = unpack(payload)
+        assert fields["compression"] == compressor.code
+        assert len(payload) < len(serialize_payload(data, collection_name="sessions")) / 2
+        assert deserialize_payload(payload) == (data, {})
+
+    def test_threshold(self):
+        settings.configure(COMPRESSION="zlib", COMPRESSION_THRESHOLD=1024)
+        assert "compression" not in unpack(serialize_payload(inventory(1)))[1]
+        # Values compression doesn't make smaller are stored as they are
+        random_bytes = os.urandom(4096)
+        payload = serialize_payload(random_bytes)
+        assert "compression" not in unpack(payload)[1]
+        assert deserialize_payload(payload) == (random_bytes, {})
+
+    def test_collection_settings(self):
+        settings.configure(
+            COMPRESSION="zlib",
+            COLLECTION_COMPRESSION={
+                "inventory": {"algorithm": "lzma", "threshold": 0},
+                "sessions": {"algorithm": None},
+            },
+        )
+        data = inventory(100)
+        assert unpack(serialize_payload(data))[1]["compression"] == 1
+        assert unpack(serialize_payload(data, collection_name="inventory"))[1]["compression"] == 2
+        assert "compression" not in unpack(serialize_payload(data, collection_name="sessions"))[1]
+
+    def test_unknown_compressor(self):
+        settings.configure(COMPRESSION="brotli")
+        with pytest.raises(ValueError):
+            serialize_payload(inventory(100))
+
+    def test_memoize(self):
+        settings.configure(COMPRESSION="zlib", COMPRESSION_THRESHOLD=1024)
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, collection_name="inventory")
+        def list_resources(count):
+            calls.append(count)
+            return inventory(count)
+
+        assert list_resources(200) == inventory(200)
+        assert list_resources(200) == inventory(200)
+        assert calls == [200]
+        key = KeyPlan(list_resources.__wrapped__, scope=CacheScope.GLOBAL.value).key((200,), {})
+        _, fields = unpack(settings.backend.get(key, collection_name="inventory"))
+        assert fields["compression"] == CompressorRegistry.get_compressor("zlib").code
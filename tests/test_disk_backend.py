@@ -0,0 +1,106 @@
+import time
+
+import pytest  # type: ignore
+from autobotAI_cache.backends.disk import DiskBackend
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.decorators import memoize
+from autobotAI_cache.core.exceptions import CacheMissError
+from autobotAI_cache.core.models import CacheScope
+from helpers import RequestContext, UserContext
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = DiskBackend(path=str(tmp_path / "cache.sqlite3"))
+    yield backend
+    backend.close()
+
+
+class TestDiskBackend:
+    def test_get_set_delete(self, backend):
+        backend.set("global:a", b"value", collection_name="disk")
+        assert backend.get("global:a", collection_name="disk") == b"value"
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="other")
+        backend.delete("global:a", collection_name="disk")
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="disk")
+
+    def test_ttl(self, backend):
+        backend.set("global:a", b"value", collection_name="disk", ttl=0.05)
+        time.sleep(0.1)
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="disk")
+
+    def test_survives_restart(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        backend = DiskBackend(path=path)
+        backend.set("global:a", b"value", collection_name="disk", ttl=60)
+        backend.close()
+        backend = DiskBackend(path=path)
+        assert backend.get("global:a", collection_name="disk") == b"value"
+        backend.close()
+
+    def test_max_bytes_evicts_least_recently_read(self, tmp_path):
+        backend = DiskBackend(path=str(tmp_path / "cache.sqlite3"), max_bytes=100)
+        backend.set("global:a", b"x" * 40, collection_name="disk")
+        time.sleep(0.01)
+        backend.set("global:b", b"x" * 40, collection_name="disk")
+        backend.set("global:c", b"x" * 40, collection_name="disk")
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="disk")
+        assert backend.get("global:c", collection_name="disk") == b"x" * 40
+        connection = backend._connection()
+        assert backend._stored_bytes(connection) == 80
+        backend.close()
+
+    def test_overwrite_keeps_size_exact(self, backend):
+        backend.set("global:a", b"x" * 40, collection_name="disk")
+        backend.set("global:a", b"x" * 10, collection_name="disk")
+        assert backend._stored_bytes(backend._connection()) == 10
+        backend.delete("global:a", collection_name="disk")
+        assert backend._stored_bytes(backend._connection()) == 0
+
+    def test_scoped_clear(self, backend):
+        ctx = RequestContext(
+            config={}, user_context=UserContext(root_user={"id": "org1"}, user={"id": "u1"})
+        )
+        for key in ["org1::a", "org1:u1:b", "org1:u11:c", "org2::d"]:
+            backend.set(key, b"value", collection_name="disk")
+        backend.clear(collection_name="disk", context=ctx, scope=CacheScope.USER.value)
+        with pytest.raises(CacheMissError):
+            backend.get("org1:u1:b", collection_name="disk")
+        assert backend.get("org1:u11:c", collection_name="disk") == b"value"
+        backend.clear(context=ctx, scope=CacheScope.ORGANIZATION.value)
+        with pytest.raises(CacheMissError):
+            backend.get("org1::a", collection_name="disk")
+        assert backend.get("org2::d", collection_name="disk") == b"value"
+        backend.clear(scope=CacheScope.GLOBAL.value)
+        with pytest.raises(CacheMissError):
+            backend.get("org2::d", collection_name="disk")
+
+    def test_batch_operations(self, backend):
+        backend.set_many({f"global:{i}": b"value" for i in range(1200)}, collection_name="disk", ttl=60)
+        backend.set("global:expired", b"value", collection_name="disk", ttl=-1)
+        keys = [f"global:{i}" for i in range(1200)] + ["global:expired", "global:missing"]
+        assert len(backend.get_many(keys, collection_name="disk")) == 1200
+        backend.delete_many(keys[:1000], collection_name="disk")
+        assert sorted(backend.get_many(keys, collection_name="disk")) == sorted(keys[1000:1200])
+
+    def test_memoize(self, tmp_path):
+        settings.configure(
+            BACKEND="disk", BACKEND_OPTIONS={"path": str(tmp_path / "cache.sqlite3")}
+        )
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value)
+        def my_function(x):
+            calls.append(x)
+            return x * 2
+
+        try:
+            assert my_function(2) == 4
+            assert my_function(2) == 4
+            assert calls == [2]
+        finally:
+            settings.reset()
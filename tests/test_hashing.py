@@ -0,0 +1,86 @@
+import dataclasses
+import enum
+
+import pytest  # type: ignore
+from autobotAI_cache.utils.hashing import canonical_digest, register_hasher
+from autobotAI_cache.utils.keygen import KeyPlan
+from pydantic import BaseModel  # type: ignore
+
+
+class DummyModel(BaseModel):
+    id: int
+    tags: list
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Color(enum.IntEnum):
+    RED = 1
+
+
+class Opaque:
+    def __init__(self, value):
+        self.value = value
+
+
+class TestCanonicalHashing:
+    def test_unordered_containers(self):
+        assert canonical_digest({"a": 1, "b": 2}) == canonical_digest({"b": 2, "a": 1})
+        assert canonical_digest({1: "x", "a": (1, 2)}) == canonical_digest({"a": (1, 2), 1: "x"})
+        assert canonical_digest({frozenset({1}), ("a", None)}) == canonical_digest(
+            {("a", None), frozenset({1})}
+        )
+
+    def test_types_are_distinguished(self):
+        for first, second in [
+            ([1, 2], (1, 2)),
+            (1, True),
+            (1, 1.0),
+            ("1", b"1"),
+            (["ab", "c"], ["a", "bc"]),
+            ([2**70], [0]),
+            (Color.RED, 1),
+            (Point(1, 2), (1, 2)),
+            ({1}, frozenset({1})),
+        ]:
+            assert canonical_digest(first) != canonical_digest(second)
+
+    def test_models_and_dataclasses(self):
+        assert canonical_digest(DummyModel(id=1, tags=["a"])) == canonical_digest(
+            DummyModel(id=1, tags=["a"])
+        )
+        assert canonical_digest(DummyModel(id=1, tags=["a"])) != canonical_digest(
+            DummyModel(id=1, tags=["b"])
+        )
+        assert canonical_digest(Point(1, 2)) == canonical_digest(Point(1, 2))
+        assert canonical_digest(Point(1, 2)) != canonical_digest(Point(2, 1))
+
+    def test_register_hasher(self):
+        first, second = Opaque(1), Opaque(1)
+        # Hashed by their default repr, which contains their address
+        assert canonical_digest(first) != canonical_digest(second)
+
+        register_hasher(Opaque, lambda opaque: opaque.value)
+        assert canonical_digest(first) == canonical_digest(second)
+        assert canonical_digest(first) != canonical_digest(Opaque(2))
+
+    def test_numpy_arrays(self):
+        numpy = pytest.importorskip("numpy")
+        array = numpy.arange(12, dtype="int64").reshape(3, 4)
+        assert canonical_digest(array) == canonical_digest(array.copy())
+        # Non-contiguous views are hashed by their elements
+        assert canonical_digest(array.T) == canonical_digest(numpy.ascontiguousarray(array.T))
+        assert canonical_digest(array) != canonical_digest(array.reshape(4, 3))
+        assert canonical_digest(array) != canonical_digest(array.astype("int32"))
+
+    def test_cache_keys(self):
+        def func(filters, ids):
+            return filters
+
+        plan = KeyPlan(func, scope="global")
+        assert plan.key(({"a": 1, "b": {2, 3}}, [1]), {}) == plan.key(({"b": {3, 2}, "a": 1}, [1]), {})
+        assert plan.key(({"a": 1}, [1]), {}) != plan.key(({"a": 1}, [2]), {})
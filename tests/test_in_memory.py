@@ -1,7 +1,11 @@
+import random
 import pytest  # type: ignore
+from autobotAI_cache.backends.eviction import TinyLFUPolicy
+from autobotAI_cache.backends.memory import MemoryBackend
 from autobotAI_cache.core.config import settings  # noqa: F401
-from autobotAI_cache.core.decorators import memoize
+from autobotAI_cache.core.decorators import memoize, memoize_batch
 import time
+from autobotAI_cache.core.exceptions import CacheMissError
 from autobotAI_cache.core.models import CacheScope
 from helpers import RequestContext, UserContext, timeit_return
 import threading
@@ -229,3 +233,635 @@ class TestInMemory:  # Use a class to group related tests
         res = my_function()
         assert res == 8
         settings.backend.clear(collection_name='my_cole', scope=CacheScope.GLOBAL.value)
+
+
+def stored_keys(backend, collection_name):
+    return [key for segment in backend._store[collection_name] for key in segment.entries]
+
+
+class TestMemoryEviction:
+    def _fill(self, backend, keys):
+        for key in keys:
+            backend.set(key, b"value", collection_name="evict")
+
+    def test_fifo_ignores_reads(self):
+        backend = MemoryBackend(max_entries=2, eviction="fifo")
+        self._fill(backend, ["a", "b"])
+        backend.get("a", collection_name="evict")
+        self._fill(backend, ["c"])
+        with pytest.raises(CacheMissError):
+            backend.get("a", collection_name="evict")
+        assert backend.get("b", collection_name="evict") == b"value"
+
+    def test_lru_keeps_recently_read_key(self):
+        backend = MemoryBackend(max_entries=2, eviction="lru")
+        self._fill(backend, ["a", "b"])
+        backend.get("a", collection_name="evict")
+        self._fill(backend, ["c"])
+        assert backend.get("a", collection_name="evict") == b"value"
+        with pytest.raises(CacheMissError):
+            backend.get("b", collection_name="evict")
+
+    def test_lfu_keeps_frequently_read_key(self):
+        backend = MemoryBackend(max_entries=2, eviction="lfu")
+        self._fill(backend, ["a", "b"])
+        for _ in range(3):
+            backend.get("a", collection_name="evict")
+        backend.get("b", collection_name="evict")
+        self._fill(backend, ["c", "d"])
+        assert backend.get("a", collection_name="evict") == b"value"
+        assert backend.get("d", collection_name="evict") == b"value"
+
+    def test_tinylfu_beats_fifo_on_skewed_traffic(self):
+        rng = random.Random(7)
+        keys = [f"k{int(rng.paretovariate(1.1))}" for _ in range(20000)]
+
+        def hit_ratio(eviction):
+            backend = MemoryBackend(max_entries=50, eviction=eviction)
+            for key in keys:
+                try:
+                    backend.get(key, collection_name="evict")
+                except CacheMissError:
+                    backend.set(key, b"value", collection_name="evict")
+            stats = backend.stats("evict")
+            assert stats["evictions"] > 0
+            return stats["hits"] / (stats["hits"] + stats["misses"])
+
+        assert hit_ratio("tinylfu") > hit_ratio("fifo")
+
+    def test_tinylfu_candidate_is_last_window_key(self):
+        # Window and protected segments hold a single key
+        policy = TinyLFUPolicy(capacity=3)
+        policy.on_insert("v")
+        for _ in range(5):
+            policy.on_access("v")
+        policy.on_insert("d")
+        for _ in range(3):
+            policy.on_access("d")
+        policy.on_insert("e")
+        policy.on_access("d")  # promoted
+        policy.on_insert("c")
+        policy.on_insert("f")
+        policy.on_access("e")  # promoted, demotes d to the probation tail
+        # c left the window last, the demoted key isn't the candidate
+        assert list(policy._probation) == ["v", "c", "d"]
+        assert policy.victim() == "c"
+
+    def test_stats_count_evictions(self):
+        backend = MemoryBackend(max_entries=1, eviction="lru")
+        self._fill(backend, ["a", "b", "c"])
+        stats = backend.stats()
+        assert stats["evictions"] == 2
+        assert stats["hits"] == stats["misses"] == stats["expirations"] == 0
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            MemoryBackend(eviction="random")
+
+
+class TestMemoryExpiry:
+    def test_expired_entry_is_never_served(self):
+        backend = MemoryBackend()
+        backend.set("a", b"value", collection_name="expiry", ttl=0.05)
+        backend.set("b", b"value", collection_name="expiry", ttl=60)
+        time.sleep(0.1)
+        with pytest.raises(CacheMissError):
+            backend.get("a", collection_name="expiry")
+        assert backend.get("b", collection_name="expiry") == b"value"
+        assert backend.stats("expiry")["expirations"] == 1
+
+    def test_cleanup_only_removes_due_entries(self):
+        backend = MemoryBackend()
+        for i in range(100):
+            backend.set(f"short{i}", b"value", collection_name="expiry", ttl=0.05)
+        backend.set("long", b"value", collection_name="expiry", ttl=60)
+        time.sleep(0.1)
+        backend.set("other", b"value", collection_name="expiry", ttl=60)
+        assert set(stored_keys(backend, "expiry")) == {"long", "other"}
+
+    def test_overwrites_do_not_grow_expiry_index(self):
+        backend = MemoryBackend()
+        for _ in range(10000):
+            backend.set("a", b"value", collection_name="expiry", ttl=60)
+        assert len(backend._store["expiry"][0].expiry_heap) < 100
+        assert backend.get("a", collection_name="expiry") == b"value"
+
+
+class TestMemoryJanitor:
+    def test_janitor_reaps_without_requests(self):
+        backend = MemoryBackend(janitor_interval=0.05)
+        try:
+            for i in range(10):
+                backend.set(f"k{i}", b"value", collection_name="janitor", ttl=0.01)
+            time.sleep(0.3)
+            assert stored_keys(backend, "janitor") == []
+            assert backend.stats("janitor")["expirations"] == 10
+        finally:
+            backend.close()
+
+    def test_reap_respects_budget(self):
+        backend = MemoryBackend()
+        for i in range(10):
+            backend.set(f"k{i}", b"value", collection_name="janitor", ttl=0.01)
+        time.sleep(0.05)
+        assert backend.reap_expired(budget=4) == 4
+        assert len(stored_keys(backend, "janitor")) == 6
+
+    def test_configure_shuts_down_janitor(self):
+        settings.configure(
+            BACKEND="memory", BACKEND_OPTIONS={"janitor_interval": 0.05}
+        )
+        backend = settings.backend
+        backend.set("a", b"value", collection_name="janitor")
+        janitor = backend._janitor
+        assert janitor.is_alive()
+        settings.reset()
+        assert not janitor.is_alive()
+        assert backend._store == {}
+
+
+class TestMemoryByteBudget:
+    def test_evicts_until_collection_fits(self):
+        backend = MemoryBackend(max_bytes=100, eviction="lru")
+        backend.set("a", b"x" * 40, collection_name="bytes")
+        backend.set("b", b"x" * 40, collection_name="bytes")
+        backend.get("a", collection_name="bytes")
+        backend.set("c", b"x" * 50, collection_name="bytes")
+        assert set(stored_keys(backend, "bytes")) == {"a", "c"}
+        assert backend.stats("bytes")["bytes"] == 90
+
+    def test_overwrite_accounts_for_previous_size(self):
+        backend = MemoryBackend(max_bytes=100)
+        backend.set("a", b"x" * 60, collection_name="bytes")
+        backend.set("b", b"x" * 30, collection_name="bytes")
+        backend.set("a", b"x" * 10, collection_name="bytes")
+        assert backend.stats("bytes")["bytes"] == 40
+        assert backend.stats("bytes")["evictions"] == 0
+        backend.delete("b", collection_name="bytes")
+        assert backend.stats("bytes")["bytes"] == 10
+
+    def test_oversized_entry_is_not_admitted(self):
+        backend = MemoryBackend(max_entry_bytes=10)
+        backend.set("a", b"small", collection_name="bytes")
+        backend.set("a", b"x" * 11, collection_name="bytes")
+        with pytest.raises(CacheMissError):
+            backend.get("a", collection_name="bytes")
+        stats = backend.stats("bytes")
+        assert stats["rejections"] == 1
+        assert stats["bytes"] == 0
+
+
+class TestMemorySharding:
+    def test_keys_are_spread_over_segments(self):
+        backend = MemoryBackend(shards=8)
+        for i in range(200):
+            backend.set(f"k{i}", b"value", collection_name="sharded")
+        segments = backend._store["sharded"]
+        assert len(segments) == 8
+        assert sum(len(segment.entries) for segment in segments) == 200
+        assert all(segment.entries for segment in segments)
+        assert backend.get("k42", collection_name="sharded") == b"value"
+
+    def test_limits_are_split_between_segments(self):
+        backend = MemoryBackend(shards=4, max_entries=40, max_bytes=400)
+        for segment in backend._get_segments("sharded"):
+            assert segment.max_entries == 10
+            assert segment.max_bytes == 100
+        for i in range(1000):
+            backend.set(f"k{i}", b"x" * 5, collection_name="sharded")
+        assert len(stored_keys(backend, "sharded")) <= 40
+
+    def test_limits_hold_for_the_whole_collection(self):
+        backend = MemoryBackend(shards=8, max_entries=10, max_bytes=50)
+        segments = backend._get_segments("sharded")
+        assert sum(segment.max_entries for segment in segments) == 10
+        assert sum(segment.max_bytes for segment in segments) == 50
+        for i in range(1000):
+            backend.set(f"k{i}", b"x", collection_name="sharded")
+        assert len(stored_keys(backend, "sharded")) <= 10
+
+    def test_shards_are_capped_by_the_limits(self):
+        # More shards than entries would leave segments without room for any entry
+        backend = MemoryBackend(shards=16, max_entries=4)
+        assert backend.shards == 4
+        for i in range(100):
+            backend.set(f"k{i}", b"x", collection_name="sharded")
+        assert len(stored_keys(backend, "sharded")) == 4
+        assert backend.stats("sharded")["rejections"] == 0
+        assert backend.get("k99", collection_name="sharded") == b"x"
+
+        assert MemoryBackend(shards=16, max_bytes=8).shards == 8
+
+    def test_concurrent_reads_and_writes(self):
+        backend = MemoryBackend(shards=4, max_entries=100, eviction="lru")
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(2000):
+                    key = f"k{(i + offset) % 150}"
+                    try:
+                        assert backend.get(key, collection_name="sharded") == key.encode()
+                    except CacheMissError:
+                        backend.set(key, key.encode(), collection_name="sharded")
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        stats = backend.stats("sharded")
+        assert stats["hits"] + stats["misses"] == 8 * 2000
+        assert len(stored_keys(backend, "sharded")) <= 100
+
+    def test_invalid_shard_count(self):
+        with pytest.raises(ValueError):
+            MemoryBackend(shards=0)
+
+
+class TestMemoryScopeIndex:
+    def _context(self, root_user_id, user_id):
+        return RequestContext(
+            config={},
+            user_context=UserContext(root_user={"id": root_user_id}, user={"id": user_id}),
+        )
+
+    def _populate(self, backend):
+        for key in ["org1::a", "org1:u1:b", "org1:u11:c", "org2::d", "org2:u1:e", "global:f"]:
+            backend.set(key, b"value", collection_name="scoped")
+
+    def test_clear_organization(self):
+        backend = MemoryBackend(shards=2)
+        self._populate(backend)
+        backend.clear(
+            collection_name="scoped",
+            context=self._context("org1", "u1"),
+            scope=CacheScope.ORGANIZATION.value,
+        )
+        assert sorted(stored_keys(backend, "scoped")) == ["global:f", "org2::d", "org2:u1:e"]
+
+    def test_clear_user_only_matches_exact_user(self):
+        backend = MemoryBackend()
+        self._populate(backend)
+        backend.clear(
+            collection_name="scoped",
+            context=self._context("org1", "u1"),
+            scope=CacheScope.USER.value,
+        )
+        assert "org1:u1:b" not in stored_keys(backend, "scoped")
+        assert "org1:u11:c" in stored_keys(backend, "scoped")
+        assert "org2:u1:e" in stored_keys(backend, "scoped")
+
+    def test_index_follows_deletes(self):
+        backend = MemoryBackend()
+        self._populate(backend)
+        for key in ["org1::a", "org1:u1:b", "org1:u11:c"]:
+            backend.delete(key, collection_name="scoped")
+        segment = backend._store["scoped"][0]
+        assert "org1" not in segment.org_index
+        assert "org1:u1" not in segment.user_index
+
+
+class TestMemoryCompact:
+    def test_fifo_and_lru_order(self):
+        fifo = MemoryBackend(max_entries=2, eviction="fifo", compact=True)
+        lru = MemoryBackend(max_entries=2, eviction="lru", compact=True)
+        for backend in (fifo, lru):
+            for key in ["a", "b"]:
+                backend.set(key, b"value", collection_name="compact")
+            backend.get("a", collection_name="compact")
+            backend.set("c", b"value", collection_name="compact")
+        assert sorted(stored_keys(fifo, "compact")) == ["b", "c"]
+        assert sorted(stored_keys(lru, "compact")) == ["a", "c"]
+        assert lru.stats("compact")["evictions"] == 1
+
+    def test_slots_are_reused(self):
+        backend = MemoryBackend(max_bytes=100, compact=True)
+        for i in range(1000):
+            backend.set(f"k{i}", b"x" * 10, collection_name="compact", ttl=60)
+        segment = backend._store["compact"][0]
+        assert len(segment.entries) == 10
+        assert len(segment.keys) <= 11
+        assert backend.stats("compact")["bytes"] == 100
+        backend.delete("k999", collection_name="compact")
+        with pytest.raises(CacheMissError):
+            backend.get("k999", collection_name="compact")
+        assert backend.get("k998", collection_name="compact") == b"x" * 10
+
+    def test_expiry(self):
+        backend = MemoryBackend(compact=True)
+        for i in range(20):
+            backend.set(f"short{i}", b"value", collection_name="compact", ttl=0.05)
+        backend.set("long", b"value", collection_name="compact", ttl=60)
+        backend.set("forever", b"value", collection_name="compact")
+        time.sleep(0.1)
+        with pytest.raises(CacheMissError):
+            backend.get("short0", collection_name="compact")
+        # Expiry ticks are whole seconds, reaping happens once the tick has passed
+        time.sleep(1)
+        assert backend.reap_expired() == 19
+        assert sorted(stored_keys(backend, "compact")) == ["forever", "long"]
+        assert backend.stats("compact")["expirations"] == 20
+
+    def test_overwrites_do_not_grow_expiry_wheel(self):
+        backend = MemoryBackend(compact=True)
+        for _ in range(10000):
+            backend.set("a", b"value", collection_name="compact", ttl=60)
+        assert backend._store["compact"][0].wheel_size < 100
+
+    def test_unsupported_policy(self):
+        with pytest.raises(ValueError):
+            MemoryBackend(eviction="lfu", compact=True)
+
+
+class TestMemoryBatch:
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_batch_operations(self, compact):
+        backend = MemoryBackend(shards=4, compact=compact)
+        backend.set_many({f"k{i}": b"value" for i in range(100)}, collection_name="batch", ttl=60)
+        backend.set("expired", b"value", collection_name="batch", ttl=-1)
+        keys = [f"k{i}" for i in range(100)] + ["expired", "missing"]
+        assert len(backend.get_many(keys, collection_name="batch")) == 100
+        backend.delete_many(keys[:50], collection_name="batch")
+        assert sorted(backend.get_many(keys, collection_name="batch")) == sorted(keys[50:100])
+        stats = backend.stats("batch")
+        assert stats["hits"] == 150
+        assert stats["misses"] == 54
+
+    def test_set_many_enforces_limits(self):
+        backend = MemoryBackend(max_entries=10, eviction="lru")
+        backend.set_many({f"k{i}": b"value" for i in range(25)}, collection_name="batch")
+        assert sorted(stored_keys(backend, "batch")) == sorted(f"k{i}" for i in range(15, 25))
+
+
+class TestMemoizeBatch:
+    def teardown_method(self):
+        settings.reset()
+
+    def test_partial_hits(self):
+        calls = []
+
+        @memoize_batch(scope=CacheScope.GLOBAL.value)
+        def get_resources(ids, prefix="r"):
+            calls.append(list(ids))
+            return [f"{prefix}{i}" for i in ids]
+
+        assert get_resources([1, 2, 3]) == ["r1", "r2", "r3"]
+        assert get_resources([2, 3, 4, 2]) == ["r2", "r3", "r4", "r2"]
+        assert get_resources([4, 1]) == ["r4", "r1"]
+        assert get_resources([1], prefix="x") == ["x1"]
+        assert calls == [[1, 2, 3], [4], [1]]
+
+    def test_dict_results(self):
+        calls = []
+
+        @memoize_batch(batch_arg="resource_ids", returns="dict")
+        def get_resources(ctx, resource_ids):
+            calls.append(list(resource_ids))
+            return {i: {"id": i} for i in resource_ids if i != "gone"}
+
+        ctx1 = RequestContext(
+            config={}, user_context=UserContext(root_user={"id": "org1"}, user={"id": "u1"})
+        )
+        ctx2 = RequestContext(
+            config={}, user_context=UserContext(root_user={"id": "org2"}, user={"id": "u1"})
+        )
+        assert get_resources(ctx1, ["a", "gone"]) == {"a": {"id": "a"}}
+        assert get_resources(ctx1, ["gone", "a"]) == {"a": {"id": "a"}}
+        assert get_resources(ctx2, ["a"]) == {"a": {"id": "a"}}
+        assert calls == [["a", "gone"], ["gone"], ["a"]]
+
+    def test_result_count_must_match(self):
+        @memoize_batch(scope=CacheScope.GLOBAL.value)
+        def get_resources(ids):
+            return ids[:1]
+
+        with pytest.raises(ValueError):
+            get_resources([10, 11])
+
+    def test_unknown_batch_arg(self):
+        with pytest.raises(ValueError):
+            @memoize_batch(batch_arg="ids")
+            def get_resources(resource_ids):
+                return resource_ids
+
+
+class TestSingleFlight:
+    def run_concurrently(self, fn, count=8):
+        barrier = threading.Barrier(count)
+        results = [None] * count
+
+        def worker(i):
+            barrier.wait()
+            results[i] = fn()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, single_flight=True)
+        def get_inventory(region):
+            calls.append(region)
+            time.sleep(0.2)
+            return {"region": region, "items": [1, 2]}
+
+        results = self.run_concurrently(lambda: get_inventory("eu"))
+        assert calls == ["eu"]
+        assert all(result == {"region": "eu", "items": [1, 2]} for result in results)
+        # Every caller gets its own copy, as on a cache hit
+        assert len({id(result) for result in results}) == len(results)
+
+    def test_without_single_flight_every_miss_computes(self):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value)
+        def get_inventory(region):
+            calls.append(region)
+            time.sleep(0.2)
+            return region
+
+        self.run_concurrently(lambda: get_inventory("us"), count=4)
+        assert len(calls) == 4
+
+    def test_error_is_shared_and_not_cached(self):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, single_flight=True)
+        def get_inventory(region):
+            calls.append(region)
+            time.sleep(0.2)
+            raise RuntimeError("upstream unavailable")
+
+        def call():
+            try:
+                get_inventory("ap")
+            except RuntimeError as e:
+                return str(e)
+
+        assert self.run_concurrently(call, count=4) == ["upstream unavailable"] * 4
+        assert calls == ["ap"]
+        assert call() == "upstream unavailable"
+        assert calls == ["ap", "ap"]
+
+    def test_distributed_falls_back_to_local(self):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, single_flight="distributed")
+        def get_inventory(region):
+            calls.append(region)
+            time.sleep(0.2)
+            return region
+
+        assert self.run_concurrently(lambda: get_inventory("sa"), count=4) == ["sa"] * 4
+        assert calls == ["sa"]
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            memoize(single_flight="cluster")
+
+
+def wait_for_refreshes(timeout=5):
+    from autobotAI_cache.core.decorators import _refresher
+
+    deadline = time.time() + timeout
+    while _refresher.pending() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class TestStaleWhileRevalidate:
+    def test_stale_result_served_while_refreshing(self):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, ttl=1, stale_ttl=5)
+        def get_inventory(region):
+            calls.append(region)
+            time.sleep(0.2)
+            return len(calls)
+
+        assert get_inventory("eu") == 1
+        time.sleep(1.1)
+        start = time.time()
+        assert get_inventory("eu") == 1  # Stale, returned without waiting
+        assert time.time() - start < 0.1
+        assert get_inventory("eu") == 1  # Refresh already pending, not queued again
+        wait_for_refreshes()
+        assert get_inventory("eu") == 2
+        assert calls == ["eu", "eu"]
+
+    def test_expired_beyond_grace_is_a_miss(self):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, ttl=1, stale_ttl=1)
+        def get_inventory(region):
+            calls.append(region)
+            return len(calls)
+
+        assert get_inventory("us") == 1
+        time.sleep(2.1)
+        assert get_inventory("us") == 2
+
+    def test_refresh_ahead(self):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, ttl=2, refresh_ahead=0.5)
+        def get_inventory(region):
+            calls.append(region)
+            return len(calls)
+
+        assert get_inventory("ap") == 1
+        assert get_inventory("ap") == 1
+        time.sleep(1.1)
+        assert get_inventory("ap") == 1  # Past half of the ttl, refreshed in the background
+        wait_for_refreshes()
+        assert get_inventory("ap") == 2
+        time.sleep(1)
+        # The refreshed result expires later than the first one would have
+        assert get_inventory("ap") == 2
+
+    def test_refresh_errors_keep_stale_result(self):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, ttl=1, stale_ttl=5)
+        def get_inventory(region):
+            calls.append(region)
+            if len(calls) > 1:
+                raise RuntimeError("upstream unavailable")
+            return "inventory"
+
+        assert get_inventory("sa") == "inventory"
+        time.sleep(1.1)
+        assert get_inventory("sa") == "inventory"
+        wait_for_refreshes()
+        assert get_inventory("sa") == "inventory"
+        assert len(calls) >= 2
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            memoize(refresh_ahead=1.5)
+        with pytest.raises(ValueError):
+            memoize(stale_ttl=0)
+
+
+class TestEarlyExpiration:
+    def test_recomputes_early_with_rising_probability(self, monkeypatch):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, ttl=2, early_expiration=True)
+        def get_inventory(region):
+            calls.append(region)
+            time.sleep(0.1)
+            return len(calls)
+
+        assert get_inventory("eu") == 1
+        # A draw of 0 never expires early
+        monkeypatch.setattr("random.random", lambda: 0.0)
+        assert get_inventory("eu") == 1
+        # A draw close to 1 moves the expiry earlier by up to ~28 compute durations (~2.8s)
+        monkeypatch.setattr("random.random", lambda: 1 - 1e-12)
+        assert get_inventory("eu") == 2
+        assert calls == ["eu", "eu"]
+
+    def test_compute_duration_is_stored(self):
+        from autobotAI_cache.utils.payload import unpack
+
+        @memoize(scope=CacheScope.GLOBAL.value, ttl=60, early_expiration=2.0, collection_name="xfetch")
+        def get_inventory(region):
+            time.sleep(0.1)
+            return region
+
+        get_inventory("us")
+        backend = settings.backend
+        keys = stored_keys(backend, "xfetch")
+        _, fields = unpack(backend.get(keys[0], collection_name="xfetch"))
+        assert 0.1 <= fields["delta"] < 0.5
+        assert fields["expire_at"] > time.time() + 59
+
+    def test_early_expiration_refreshes_in_background_with_stale_ttl(self, monkeypatch):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, ttl=2, stale_ttl=10, early_expiration=True)
+        def get_inventory(region):
+            calls.append(region)
+            time.sleep(0.1)
+            return len(calls)
+
+        assert get_inventory("ap") == 1
+        monkeypatch.setattr("random.random", lambda: 1 - 1e-12)
+        assert get_inventory("ap") == 1
+        wait_for_refreshes()
+        monkeypatch.setattr("random.random", lambda: 0.0)
+        assert get_inventory("ap") == 2
+
+    def test_invalid_beta(self):
+        with pytest.raises(ValueError):
+            memoize(early_expiration=-1)
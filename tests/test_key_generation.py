@@ -1,4 +1,8 @@
-from autobotAI_cache.utils.keygen import generate_cache_key
+import hashlib
+
+from autobotAI_cache.core.cache import make_key
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.utils.keygen import KeyGeneratorRegistry, KeyPlan, generate_cache_key
 import pytest
 from pydantic import BaseModel # type: ignore
 
@@ -107,3 +111,107 @@ class TestKeyGeneration:
 
         key = MyClass.class_func(5)
         assert isinstance(key, str)
+
+
+class TestKeyPlan:
+    def test_same_keys_as_generate_cache_key(self):
+        def func(a, b=2, *args, c, d=None, **kwargs):
+            return a
+
+        plan = KeyPlan(func, scope="global", key_prefix="p", ignore_args=["d"])
+        for args, kwargs in [
+            ((1,), {"c": 3}),
+            ((1, 5, 6), {"c": 3, "e": [1, 2]}),
+            ((), {"a": DummyModel(id=1, name="Test"), "c": 3, "d": 4}),
+        ]:
+            assert plan.key(args, kwargs) == generate_cache_key(
+                func, args, kwargs, scope="global", key_prefix="p", ignore_args=["d"]
+            )
+        assert plan.key((1,), {"c": 3}) == plan.key((1, 2), {"c": 3, "d": 5})
+
+    def test_instance_and_class(self):
+        class MyClass:
+            def method(self, x):
+                return x
+
+            def class_func(cls, x):
+                return x
+
+        obj = MyClass()
+        plan = KeyPlan(MyClass.method, scope="global")
+        assert plan.key((obj, 1), {}) == generate_cache_key(MyClass.method, (obj, 1), {}, scope="global")
+        assert plan.key((obj, 1), {}) != plan.key((MyClass(), 1), {})
+        plan = KeyPlan(MyClass.class_func, scope="global")
+        assert plan.key((MyClass, 1), {}) == generate_cache_key(
+            MyClass.class_func, (MyClass, 1), {}, scope="global"
+        )
+
+    def test_invalid_arguments(self):
+        def func(a, /, b, *, c=3):
+            return a
+
+        plan = KeyPlan(func, scope="global")
+        for args, kwargs in [
+            ((), {}),
+            ((1,), {}),
+            ((1, 2, 3), {}),
+            ((1, 2), {"b": 2}),
+            ((), {"a": 1, "b": 2}),
+            ((1, 2), {"x": 1}),
+        ]:
+            with pytest.raises(TypeError):
+                plan.key(args, kwargs)
+
+
+class TestKeyGenerators:
+    @pytest.fixture(autouse=True)
+    def reset_settings(self):
+        yield
+        settings.reset()
+
+    def keys(self):
+        def func(a, b=None):
+            return a
+
+        plan = KeyPlan(func, scope="global")
+        return plan.key((1,), {"b": [1, 2]}), plan.key((2,), {"b": [1, 2]})
+
+    def test_default_is_sha256(self):
+        first, second = self.keys()
+        assert first.startswith("global:") and len(first.split(":")[1]) == 64
+        assert first != second
+
+    def test_blake2b(self):
+        sha256_keys = self.keys()
+        settings.configure(KEY_GENERATOR="blake2b")
+        first, second = self.keys()
+        assert len(first.split(":")[1]) == 32
+        assert first != second and first not in sha256_keys
+        assert make_key("resource:1", scope="global") != make_key("resource:2", scope="global")
+
+    def test_xxh3_128(self):
+        pytest.importorskip("xxhash")
+        settings.configure(KEY_GENERATOR="xxh3_128")
+        first, second = self.keys()
+        assert len(first.split(":")[1]) == 32
+        assert first != second
+
+    def test_custom_generator(self):
+        hashers = []
+
+        def generator():
+            hashers.append(hashlib.md5())
+            return hashers[-1]
+
+        settings.configure(KEY_GENERATOR=generator)
+        first, _ = self.keys()
+        assert len(first.split(":")[1]) == 32 and hashers
+
+        KeyGeneratorRegistry.register_generator("md5", hashlib.md5)
+        settings.configure(KEY_GENERATOR="md5")
+        assert self.keys()[0] == first
+
+    def test_unknown_generator(self):
+        settings.configure(KEY_GENERATOR="crc32")
+        with pytest.raises(ValueError):
+            self.keys()
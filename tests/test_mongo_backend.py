@@ -2,6 +2,7 @@ import os
 import pytest  # type: ignore
 from autobotAI_cache.core.config import settings  # noqa: F401
 from autobotAI_cache.core.decorators import memoize
+from autobotAI_cache.core.exceptions import CacheMissError
 import time
 from autobotAI_cache.core.models import CacheScope
 from helpers import RequestContext, UserContext, timeit_return
@@ -372,3 +373,173 @@ class TestMongoMemory:  # Use a class to group related tests
         res = my_function()
         assert res == 8
         settings.backend.clear(collection_name="my_cole", scope=CacheScope.GLOBAL.value)
+
+    def test_batch_operations(self):
+        backend = settings.backend
+        backend.set_many(
+            {"global:a": b"1", "global:b": b"2", "org1::a": b"3"},
+            ttl=60,
+            collection_name="batch_cole",
+        )
+        found = backend.get_many(["global:a", "global:b", "org1::a", "global:x"], collection_name="batch_cole")
+        assert found == {"global:a": b"1", "global:b": b"2", "org1::a": b"3"}
+        backend.delete_many(["global:a", "global:x"], collection_name="batch_cole")
+        assert backend.get_many(["global:a", "global:b"], collection_name="batch_cole") == {"global:b": b"2"}
+        backend.delete_many(["global:b", "org1::a"], collection_name="batch_cole")
+
+    def test_set_many_overwrites(self):
+        backend = settings.backend
+        backend.set_many({"global:a": b"1", "org1::a": b"2"}, ttl=60, collection_name="overwrite_cole")
+        backend.set_many({"global:a": b"3", "global:b": b"4"}, ttl=60, collection_name="overwrite_cole")
+        found = backend.get_many(["global:a", "global:b", "org1::a"], collection_name="overwrite_cole")
+        assert found == {"global:a": b"3", "global:b": b"4", "org1::a": b"2"}
+        backend.delete_many(["global:a", "global:b", "org1::a"], collection_name="overwrite_cole")
+
+    def test_capped_overwrites(self):
+        from autobotAI_cache.backends.mongo import MongoDBBackend
+
+        client = MongoClient(os.environ.get("MONGO_URL"), server_api=ServerApi("1"))
+        backend = MongoDBBackend(mongo_client=client, max_entries=10)
+        # Capped collections reject replacing a document by one of another size
+        backend.set("global:a", b"1", ttl=60, collection_name="capped_cole")
+        backend.set("global:a", b"1" * 100, ttl=60, collection_name="capped_cole")
+        assert backend.get("global:a", collection_name="capped_cole") == b"1" * 100
+        backend.set_many({"global:a": b"2", "global:b": b"3"}, ttl=60, collection_name="capped_cole")
+        backend.set_many({"global:a": b"2" * 100}, ttl=60, collection_name="capped_cole")
+        found = backend.get_many(["global:a", "global:b"], collection_name="capped_cole")
+        assert found == {"global:a": b"2" * 100, "global:b": b"3"}
+        backend._db.drop_collection("capped_cole")
+
+    def test_refresh_ahead(self):
+        from autobotAI_cache.core.decorators import _refresher
+
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, ttl=2, refresh_ahead=0.5, collection_name="refresh_cole")
+        def get_inventory(region):
+            calls.append(region)
+            return len(calls)
+
+        assert get_inventory("ap") == 1
+        time.sleep(1.1)
+        assert get_inventory("ap") == 1  # Refreshed in the background
+        deadline = time.time() + 5
+        while _refresher.pending() and time.time() < deadline:
+            time.sleep(0.01)
+        # The refreshed result replaced the stored one
+        assert get_inventory("ap") == 2
+        assert get_inventory("ap") == 2
+        assert calls == ["ap", "ap"]
+
+    def test_early_expiration(self, monkeypatch):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, ttl=2, early_expiration=True, collection_name="xfetch_cole")
+        def get_inventory(region):
+            calls.append(region)
+            time.sleep(0.1)
+            return len(calls)
+
+        assert get_inventory("eu") == 1
+        # A draw close to 1 expires the result early, the recomputed one is stored
+        monkeypatch.setattr("random.random", lambda: 1 - 1e-12)
+        assert get_inventory("eu") == 2
+        # A draw of 0 never expires early, so the stored result is served
+        monkeypatch.setattr("random.random", lambda: 0.0)
+        assert get_inventory("eu") == 2
+        assert calls == ["eu", "eu"]
+
+    def test_async_backend(self):
+        import asyncio
+
+        from pymongo import AsyncMongoClient
+
+        from autobotAI_cache.backends.async_mongo import AsyncMongoDBBackend
+
+        async def main():
+            client = AsyncMongoClient(os.environ.get("MONGO_URL"), server_api=ServerApi("1"))
+            backend = AsyncMongoDBBackend(client)
+            try:
+                await backend.set_many({"global:a": b"1", "global:b": b"2"}, ttl=60, collection_name="async_cole")
+                assert await backend.get("global:a", collection_name="async_cole") == b"1"
+                # Documents are shared with the sync backend
+                assert settings.backend.get("global:b", collection_name="async_cole") == b"2"
+                await backend.delete_many(["global:a", "global:b"], collection_name="async_cole")
+                assert await backend.get_many(["global:a"], collection_name="async_cole") == {}
+            finally:
+                await client.close()
+
+        asyncio.run(main())
+
+    def test_async_memoize_without_async_options(self):
+        import asyncio
+
+        from autobotAI_cache.backends.async_base import ThreadedAsyncBackend
+
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, collection_name="async_cole")
+        async def get_inventory(region):
+            calls.append(region)
+            return [region]
+
+        async def main():
+            assert await get_inventory("eu") == ["eu"]
+            assert await get_inventory("eu") == ["eu"]
+
+        # BACKEND_OPTIONS hold a sync client, the sync backend runs in a thread pool
+        assert isinstance(settings.async_backend, ThreadedAsyncBackend)
+        asyncio.run(main())
+        assert calls == ["eu"]
+
+    def test_distributed_lock(self):
+        from autobotAI_cache.core.single_flight import run_locked
+
+        backend = settings.backend
+        token = backend.acquire_lock("global:lock", 5, collection_name="lock_cole")
+        assert token is not None
+        assert backend.acquire_lock("global:lock", 5, collection_name="lock_cole") is None
+        backend.release_lock("global:lock", "not-the-holder", collection_name="lock_cole")
+        assert backend.acquire_lock("global:lock", 5, collection_name="lock_cole") is None
+        backend.release_lock("global:lock", token, collection_name="lock_cole")
+
+        # Clearing every collection keeps the leases of in-flight computations
+        token = backend.acquire_lock("global:lock", 5, collection_name="lock_cole")
+        backend.clear(scope=CacheScope.GLOBAL.value)
+        assert backend.acquire_lock("global:lock", 5, collection_name="lock_cole") is None
+        backend.release_lock("global:lock", token, collection_name="lock_cole")
+
+        # Two nodes missing the same key, only one computes
+        calls = []
+
+        def lookup():
+            try:
+                return True, backend.get("global:locked", collection_name="lock_cole")
+            except CacheMissError:
+                return False, None
+
+        def compute():
+            hit, value = lookup()
+            if hit:
+                return value
+            calls.append(1)
+            time.sleep(0.3)
+            backend.set("global:locked", b"value", ttl=60, collection_name="lock_cole")
+            return b"value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    run_locked(backend, "global:locked", "lock_cole", 5, lookup, compute)
+                )
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [b"value"] * 3
+        assert calls == [1]
+        backend.delete("global:locked", collection_name="lock_cole")
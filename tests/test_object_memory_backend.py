@@ -0,0 +1,85 @@
+import threading
+
+import pytest  # type: ignore
+from autobotAI_cache.backends.object_memory import ObjectMemoryBackend
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.decorators import memoize
+from autobotAI_cache.core.exceptions import CacheMissError
+from autobotAI_cache.core.models import CacheScope
+
+
+class TestObjectMemoryBackend:
+    def test_no_copy_returns_cached_object(self):
+        backend = ObjectMemoryBackend()
+        value = {"items": [1, 2, 3]}
+        backend.set("global:a", value, collection_name="objects")
+        assert backend.get("global:a", collection_name="objects") is value
+
+    def test_shallow_copy(self):
+        backend = ObjectMemoryBackend(copy_on_read="shallow")
+        value = {"items": [1, 2, 3]}
+        backend.set("global:a", value, collection_name="objects")
+        cached = backend.get("global:a", collection_name="objects")
+        assert cached == value and cached is not value
+        assert cached["items"] is value["items"]
+
+    def test_deep_copy_isolates_cache(self):
+        backend = ObjectMemoryBackend(copy_on_read="deep")
+        value = {"items": [1, 2, 3]}
+        backend.set("global:a", value, collection_name="objects")
+        value["items"].append(4)
+        cached = backend.get("global:a", collection_name="objects")
+        cached["items"].append(5)
+        assert backend.get("global:a", collection_name="objects") == {"items": [1, 2, 3]}
+
+    def test_none_is_cached(self):
+        backend = ObjectMemoryBackend(compact=True)
+        backend.set("global:a", None, collection_name="objects")
+        assert backend.get("global:a", collection_name="objects") is None
+        backend.delete("global:a", collection_name="objects")
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="objects")
+
+    def test_max_entries(self):
+        backend = ObjectMemoryBackend(max_entries=2, eviction="lru")
+        for key in ["global:a", "global:b", "global:c"]:
+            backend.set(key, [key], collection_name="objects")
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="objects")
+        assert backend.stats("objects")["evictions"] == 1
+
+    def test_batch_copies(self):
+        backend = ObjectMemoryBackend(copy_on_read="deep")
+        value = {"items": [1]}
+        backend.set_many({"global:a": value, "global:b": None}, collection_name="objects")
+        value["items"].append(2)
+        found = backend.get_many(["global:a", "global:b", "global:c"], collection_name="objects")
+        assert found == {"global:a": {"items": [1]}, "global:b": None}
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            ObjectMemoryBackend(copy_on_read="sometimes")
+        with pytest.raises(ValueError):
+            ObjectMemoryBackend(max_bytes=1000)
+
+    def test_memoize_skips_serialization(self):
+        settings.configure(BACKEND="object_memory", BACKEND_OPTIONS={})
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value)
+        def make_lock(name):
+            # Locks can't be pickled, so this only caches without serialization
+            calls.append(name)
+            return threading.Lock()
+
+        @memoize(scope=CacheScope.GLOBAL.value)
+        def nothing():
+            calls.append(None)
+
+        try:
+            assert make_lock("a") is make_lock("a")
+            nothing()
+            nothing()
+            assert calls == ["a", None]
+        finally:
+            settings.reset()
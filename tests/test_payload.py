@@ -0,0 +1,35 @@
+import pickle
+
+from autobotAI_cache.utils.payload import pack, pack_object, unpack, unpack_object
+
+
+class TestPayload:
+    def test_round_trip(self):
+        value = pickle.dumps({"a": 1})
+        data = pack(value, expire_at=1700000000.5)
+        assert data != value
+        assert unpack(data) == (value, {"expire_at": 1700000000.5})
+        data = pack(value, expire_at=1700000000.5, delta=0.25)
+        assert unpack(data) == (value, {"expire_at": 1700000000.5, "delta": 0.25})
+
+    def test_values_without_header(self):
+        value = pickle.dumps([1, 2])
+        assert unpack(value) == (value, {})
+        assert unpack(b'{"json": true}') == (b'{"json": true}', {})
+        assert unpack(pack(value)) == (value, {})
+
+    def test_objects(self):
+        value = {"a": 1}
+        cached, fields = unpack_object(pack_object(value, expire_at=10.0))
+        assert cached is value and fields == {"expire_at": 10.0}
+        assert unpack_object(value) == (value, {})
+
+    def test_serializer_field(self):
+        value = pickle.dumps({"a": 1})
+        data = pack(value, expire_at=1700000000.5, serializer=3)
+        assert unpack(data) == (value, {"expire_at": 1700000000.5, "serializer": 3})
+        assert unpack(pack(value, serializer=1)) == (value, {"serializer": 1})
+
+    def test_compression_field(self):
+        data = pack(b"compressed", serializer=1, compression=2)
+        assert unpack(data) == (b"compressed", {"serializer": 1, "compression": 2})
@@ -2,6 +2,7 @@ import os
 import pytest  # type: ignore
 from autobotAI_cache.core.config import settings  # noqa: F401
 from autobotAI_cache.core.decorators import memoize
+from autobotAI_cache.core.exceptions import CacheMissError
 import time
 from autobotAI_cache.core.models import CacheScope
 from helpers import RequestContext, UserContext, timeit_return
@@ -361,3 +362,246 @@ class TestRedisMemory:  # Use a class to group related tests
         res = my_function()
         assert res == 8
         settings.backend.clear(collection_name="my_cole", scope=CacheScope.GLOBAL.value)
+
+    def test_batch_operations(self):
+        backend = settings.backend
+        backend.set_many(
+            {"global:a": b"1", "global:b": b"2", "org1::a": b"3"},
+            ttl=60,
+            collection_name="batch_cole",
+        )
+        found = backend.get_many(["global:a", "global:b", "org1::a", "global:x"], collection_name="batch_cole")
+        assert found == {"global:a": b"1", "global:b": b"2", "org1::a": b"3"}
+        backend.delete_many(["global:a", "global:x"], collection_name="batch_cole")
+        assert backend.get_many(["global:a", "global:b"], collection_name="batch_cole") == {"global:b": b"2"}
+        backend.delete_many(["global:b", "org1::a"], collection_name="batch_cole")
+
+    def test_clear_scans_in_pages(self):
+        backend = settings.backend
+        backend.scan_count = 10
+        for i in range(55):
+            backend.set(f"global:key{i}", b"value", collection_name="scan_cole")
+        backend.set("org1::key", b"value", collection_name="other_cole")
+
+        progress = []
+        removed = backend.clear(
+            collection_name="scan_cole", scope=CacheScope.GLOBAL.value, progress=progress.append
+        )
+        assert removed == 55
+        assert progress and progress[-1] == 55
+        assert backend.get("org1::key", collection_name="other_cole") == b"value"
+        assert backend.clear(collection_name="scan_cole", scope=CacheScope.GLOBAL.value) == 0
+
+    def test_max_entries_lru(self):
+        from autobotAI_cache.backends.redis import RedisBackend
+
+        backend = RedisBackend(max_entries=2, eviction="lru")
+        try:
+            backend.set("global:a", b"value", collection_name="lru_cole", ttl=60)
+            backend.set("global:b", b"value", collection_name="lru_cole", ttl=60)
+            backend.get("global:a", collection_name="lru_cole")
+            backend.set("global:c", b"value", collection_name="lru_cole", ttl=60)
+
+            assert backend.get("global:a", collection_name="lru_cole") == b"value"
+            with pytest.raises(CacheMissError):
+                backend.get("global:b", collection_name="lru_cole")
+            assert backend.client.zcard(backend._get_index_key("lru_cole")) == 2
+        finally:
+            backend.clear(collection_name="lru_cole", scope=CacheScope.GLOBAL.value)
+            backend.close()
+
+    def test_max_entries_ignores_expired_keys(self):
+        from autobotAI_cache.backends.redis import RedisBackend
+
+        backend = RedisBackend(max_entries=3)
+        try:
+            backend.set("global:a", b"value", collection_name="expiry_cole", ttl=60)
+            backend.set("global:b", b"value", collection_name="expiry_cole", ttl=1)
+            backend.set("global:c", b"value", collection_name="expiry_cole", ttl=1)
+            time.sleep(1.1)
+            backend.set("global:d", b"value", collection_name="expiry_cole", ttl=60)
+            backend.set("global:e", b"value", collection_name="expiry_cole")
+
+            # b and c expired, so the three live entries fit and nothing is evicted
+            for key in ("global:a", "global:d", "global:e"):
+                assert backend.get(key, collection_name="expiry_cole") == b"value"
+            assert backend.client.zcard(backend._get_index_key("expiry_cole")) == 3
+            assert backend.client.zcard(backend._get_expiry_key("expiry_cole")) == 2
+        finally:
+            backend.clear(collection_name="expiry_cole", scope=CacheScope.GLOBAL.value)
+            backend.close()
+
+    def test_async_memoize(self):
+        import asyncio
+
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, collection_name="async_cole")
+        async def my_function(x):
+            calls.append(x)
+            return {"value": x}
+
+        async def main():
+            try:
+                assert await my_function(1) == {"value": 1}
+                assert await my_function(1) == {"value": 1}
+                backend = settings.async_backend
+                await backend.set_many({"global:a": b"1"}, ttl=60, collection_name="async_cole")
+                assert await backend.get_many(["global:a", "global:x"], collection_name="async_cole") == {
+                    "global:a": b"1"
+                }
+                await backend.clear(collection_name="async_cole", scope=CacheScope.GLOBAL.value)
+            finally:
+                await settings.close_async_backend()
+
+        asyncio.run(main())
+        assert calls == [1]
+
+    def test_distributed_lock(self):
+        from autobotAI_cache.core.single_flight import run_locked
+
+        backend = settings.backend
+        token = backend.acquire_lock("global:lock", 5, collection_name="lock_cole")
+        assert token is not None
+        assert backend.acquire_lock("global:lock", 5, collection_name="lock_cole") is None
+        backend.release_lock("global:lock", "not-the-holder", collection_name="lock_cole")
+        assert backend.acquire_lock("global:lock", 5, collection_name="lock_cole") is None
+        backend.release_lock("global:lock", token, collection_name="lock_cole")
+
+        # Two nodes missing the same key, only one computes
+        calls = []
+
+        def lookup():
+            try:
+                return True, backend.get("global:locked", collection_name="lock_cole")
+            except CacheMissError:
+                return False, None
+
+        def compute():
+            hit, value = lookup()
+            if hit:
+                return value
+            calls.append(1)
+            time.sleep(0.3)
+            backend.set("global:locked", b"value", ttl=60, collection_name="lock_cole")
+            return b"value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    run_locked(backend, "global:locked", "lock_cole", 5, lookup, compute)
+                )
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [b"value"] * 3
+        assert calls == [1]
+        backend.delete("global:locked", collection_name="lock_cole")
+
+    def test_tiered_invalidation(self):
+        from autobotAI_cache.backends.tiered import TieredBackend
+
+        def wait_until(condition, timeout=2):
+            deadline = time.time() + timeout
+            while not condition() and time.time() < deadline:
+                time.sleep(0.01)
+            return condition()
+
+        def in_l1(node, key):
+            try:
+                node.l1.get(key, collection_name="tiered_cole")
+                return True
+            except CacheMissError:
+                return False
+
+        nodes = [
+            TieredBackend(l2="redis", l1_ttl=600, invalidation={"channel": "test-invalidations"})
+            for _ in range(2)
+        ]
+        try:
+            time.sleep(0.2)  # Let the subscribers connect
+            first, second = nodes
+            first.set("global:a", b"1", collection_name="tiered_cole", ttl=600)
+            first.set("org1::b", b"2", collection_name="tiered_cole", ttl=600)
+            assert second.get("global:a", collection_name="tiered_cole") == b"1"
+            assert second.get("org1::b", collection_name="tiered_cole") == b"2"
+
+            # An overwrite on one node drops the L1 copy of the others
+            first.set("global:a", b"changed", collection_name="tiered_cole", ttl=600)
+            assert wait_until(lambda: not in_l1(second, "global:a"))
+            assert second.get("global:a", collection_name="tiered_cole") == b"changed"
+
+            ctx = RequestContext(
+                config={}, user_context=UserContext(root_user={"id": "org1"}, user={"id": "u1"})
+            )
+            first.clear(collection_name="tiered_cole", context=ctx, scope=CacheScope.ORGANIZATION.value)
+            assert wait_until(lambda: not in_l1(second, "org1::b"))
+            assert in_l1(second, "global:a")
+
+            second.delete("global:a", collection_name="tiered_cole")
+            assert wait_until(lambda: not in_l1(first, "global:a"))
+        finally:
+            for node in nodes:
+                node.clear(collection_name="tiered_cole", scope=CacheScope.GLOBAL.value)
+                node.close()
+
+    def test_invalidation_during_l2_read_skips_promotion(self):
+        from autobotAI_cache.backends.tiered import TieredBackend
+
+        backend = TieredBackend(l2="redis", l1_ttl=600, invalidation={"channel": "test-race"})
+        l2_get_with_ttl = backend.l2.get_with_ttl
+        l2_get_many_with_ttl = backend.l2.get_many_with_ttl
+        message = {"origin": "other", "deletes": {"race_cole": ["global:a"]}, "clears": []}
+
+        def get_with_ttl(key, collection_name):
+            # Another node overwrites the key after our L2 read, its invalidation arrives late
+            found = l2_get_with_ttl(key, collection_name=collection_name)
+            backend.invalidation.apply(message)
+            return found
+
+        def get_many_with_ttl(keys, collection_name):
+            found = l2_get_many_with_ttl(keys, collection_name=collection_name)
+            backend.invalidation.apply(message)
+            return found
+
+        try:
+            backend.l2.set("global:a", b"old", collection_name="race_cole", ttl=600)
+            backend.l2.set("global:b", b"other", collection_name="race_cole", ttl=600)
+            backend.l2.get_with_ttl = get_with_ttl
+            backend.l2.get_many_with_ttl = get_many_with_ttl
+
+            assert backend.get("global:a", collection_name="race_cole") == b"old"
+            with pytest.raises(CacheMissError):
+                backend.l1.get("global:a", collection_name="race_cole")
+
+            found = backend.get_many(["global:a", "global:b"], collection_name="race_cole")
+            assert found == {"global:a": b"old", "global:b": b"other"}
+            with pytest.raises(CacheMissError):
+                backend.l1.get("global:a", collection_name="race_cole")
+            assert backend.l1.get("global:b", collection_name="race_cole") == b"other"
+            assert backend._reads == {} and backend._invalidated == {}
+        finally:
+            backend.clear(collection_name="race_cole", scope=CacheScope.GLOBAL.value)
+            backend.close()
+
+    def test_invalidation_batches_are_coalesced(self):
+        from autobotAI_cache.backends.invalidation import RedisInvalidationBus
+        from autobotAI_cache.backends.memory import MemoryBackend
+
+        bus = RedisInvalidationBus(settings.backend.client, MemoryBackend(), flush_interval=60)
+        try:
+            bus.delete(["global:a", "global:b"], "first")
+            bus.delete(["global:a"], "first")
+            bus.delete(["global:c"], "second")
+            bus.clear(collection_name="second", scope=CacheScope.GLOBAL.value)
+            with bus._condition:
+                message = bus._take_batch()
+            assert message["deletes"] == {"first": ["global:a", "global:b"]}
+            assert message["clears"] == [("second", "global", None)]
+        finally:
+            bus.close()
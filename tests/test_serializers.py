@@ -0,0 +1,83 @@
+import pickle
+
+import pytest  # type: ignore
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.decorators import memoize
+from autobotAI_cache.core.exceptions import SerializationError
+from autobotAI_cache.core.models import CacheScope
+from autobotAI_cache.utils.keygen import KeyPlan
+from autobotAI_cache.utils.payload import unpack
+from autobotAI_cache.utils.serializers import (
+    SerializerRegistry,
+    deserialize_payload,
+    serialize,
+    serialize_payload,
+)
+from pydantic import BaseModel  # type: ignore
+
+
+class Tag(BaseModel):
+    key: str
+    value: str
+
+
+class Resource(BaseModel):
+    id: int
+    tags: list[Tag]
+
+
+@pytest.fixture(autouse=True)
+def reset_settings():
+    yield
+    settings.reset()
+
+
+class TestSerializers:
+    @pytest.mark.parametrize("name", ["pickle", "json", "pickle5", "pydantic", "msgpack", "orjson"])
+    def test_round_trip(self, name):
+        try:
+            serializer = SerializerRegistry.get_serializer(name)
+        except ValueError:
+            pytest.skip(f"{name} is not installed")
+        data = {"id": 1, "names": ["a", "b"], "nested": {"ok": True, "ratio": 0.5}}
+        payload = serialize_payload(data, serializer)
+        assert unpack(payload)[1] == {"serializer": serializer.code}
+        assert deserialize_payload(payload) == (data, {})
+
+    def test_header_names_the_serializer(self):
+        payload = serialize_payload({"a": 1}, SerializerRegistry.get_serializer("json"))
+        settings.configure(SERIALIZER="pickle5")
+        assert deserialize_payload(payload) == ({"a": 1}, {})
+
+    def test_values_without_header(self):
+        # Written before payloads had a header, read with the configured serializer
+        assert deserialize_payload(pickle.dumps([1, 2])) == ([1, 2], {})
+        settings.configure(SERIALIZER="json")
+        assert deserialize_payload(b"[1, 2]") == ([1, 2], {})
+
+    def test_pydantic_models(self):
+        resource = Resource(id=1, tags=[Tag(key="env", value="prod")])
+        payload = serialize_payload([resource], SerializerRegistry.get_serializer("pydantic"))
+        assert deserialize_payload(payload)[0] == [resource]
+        assert len(payload) < len(pickle.dumps([resource]))
+
+    def test_unknown_serializer(self):
+        with pytest.raises(ValueError):
+            memoize(serializer="yaml")
+        with pytest.raises(SerializationError):
+            serialize({"a": 1}, "yaml")
+
+    def test_memoize_serializer(self):
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value, serializer="json", collection_name="serializers")
+        def my_function(x):
+            calls.append(x)
+            return {"x": x}
+
+        assert my_function(1) == {"x": 1}
+        assert my_function(1) == {"x": 1}
+        assert calls == [1]
+        key = KeyPlan(my_function.__wrapped__, scope=CacheScope.GLOBAL.value).key((1,), {})
+        _, fields = unpack(settings.backend.get(key, collection_name="serializers"))
+        assert fields == {"serializer": SerializerRegistry.get_serializer("json").code}
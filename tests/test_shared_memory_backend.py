@@ -0,0 +1,108 @@
+import multiprocessing
+import time
+
+import pytest  # type: ignore
+from autobotAI_cache.backends.shared_memory import SharedMemoryBackend
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.decorators import memoize
+from autobotAI_cache.core.exceptions import CacheBackendError, CacheMissError
+from autobotAI_cache.core.models import CacheScope
+from helpers import RequestContext, UserContext
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SharedMemoryBackend(directory=str(tmp_path), num_buckets=16, ways=4, slot_size=512)
+    yield backend
+    backend.destroy()
+
+
+def _write_from_child(directory):
+    backend = SharedMemoryBackend(directory=directory, num_buckets=16, ways=4, slot_size=512)
+    backend.set("global:shared", b"from child", collection_name="shm")
+    backend.close()
+
+
+class TestSharedMemoryBackend:
+    def test_get_set_delete(self, backend):
+        backend.set("global:a", b"value", collection_name="shm")
+        assert backend.get("global:a", collection_name="shm") == b"value"
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="other")
+        backend.delete("global:a", collection_name="shm")
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="shm")
+
+    def test_ttl(self, backend):
+        backend.set("global:a", b"value", collection_name="shm", ttl=0.05)
+        time.sleep(0.1)
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="shm")
+
+    def test_shared_between_processes(self, backend, tmp_path):
+        process = multiprocessing.get_context("spawn").Process(
+            target=_write_from_child, args=(str(tmp_path),)
+        )
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+        assert backend.get("global:shared", collection_name="shm") == b"from child"
+
+    def test_full_bucket_evicts_least_recently_read(self, tmp_path):
+        backend = SharedMemoryBackend(directory=str(tmp_path), num_buckets=1, ways=2, slot_size=256)
+        try:
+            backend.set("global:a", b"a", collection_name="shm")
+            backend.set("global:b", b"b", collection_name="shm")
+            backend.get("global:a", collection_name="shm")
+            backend.set("global:c", b"c", collection_name="shm")
+            assert backend.get("global:a", collection_name="shm") == b"a"
+            assert backend.get("global:c", collection_name="shm") == b"c"
+            with pytest.raises(CacheMissError):
+                backend.get("global:b", collection_name="shm")
+        finally:
+            backend.destroy()
+
+    def test_oversized_value_is_not_cached(self, backend):
+        backend.set("global:a", b"small", collection_name="shm")
+        backend.set("global:a", b"x" * 1024, collection_name="shm")
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="shm")
+
+    def test_scoped_clear(self, backend):
+        ctx = RequestContext(
+            config={}, user_context=UserContext(root_user={"id": "org1"}, user={"id": "u1"})
+        )
+        for key in ["org1::a", "org1:u1:b", "org1:u11:c", "org2::d"]:
+            backend.set(key, b"value", collection_name="shm")
+        backend.clear(collection_name="shm", context=ctx, scope=CacheScope.USER.value)
+        with pytest.raises(CacheMissError):
+            backend.get("org1:u1:b", collection_name="shm")
+        assert backend.get("org1:u11:c", collection_name="shm") == b"value"
+        backend.clear(collection_name="shm", context=ctx, scope=CacheScope.ORGANIZATION.value)
+        with pytest.raises(CacheMissError):
+            backend.get("org1::a", collection_name="shm")
+        assert backend.get("org2::d", collection_name="shm") == b"value"
+
+    def test_layout_mismatch(self, backend, tmp_path):
+        with pytest.raises(CacheBackendError):
+            SharedMemoryBackend(directory=str(tmp_path), num_buckets=32, ways=4, slot_size=512)
+
+    def test_memoize(self, tmp_path):
+        settings.configure(
+            BACKEND="shared_memory",
+            BACKEND_OPTIONS={"directory": str(tmp_path), "num_buckets": 16},
+        )
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value)
+        def my_function(x):
+            calls.append(x)
+            return x * 2
+
+        try:
+            assert my_function(2) == 4
+            assert my_function(2) == 4
+            assert calls == [2]
+        finally:
+            settings.backend.destroy()
+            settings.reset()
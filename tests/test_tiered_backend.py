@@ -0,0 +1,147 @@
+import time
+
+import pytest  # type: ignore
+from autobotAI_cache.backends.disk import DiskBackend
+from autobotAI_cache.backends.tiered import TieredBackend
+from autobotAI_cache.core.config import settings
+from autobotAI_cache.core.decorators import memoize
+from autobotAI_cache.core.exceptions import CacheMissError
+from autobotAI_cache.core.models import CacheScope
+from helpers import RequestContext, UserContext
+
+
+@pytest.fixture
+def l2(tmp_path):
+    backend = DiskBackend(path=str(tmp_path / "l2.sqlite3"))
+    yield backend
+    backend.close()
+
+
+class TestTieredBackend:
+    def test_l2_hits_are_promoted(self, l2):
+        backend = TieredBackend(l2=l2, l1_ttl=1)
+        l2.set("global:a", b"value", collection_name="tiered", ttl=60)
+
+        assert backend.get("global:a", collection_name="tiered") == b"value"
+        assert backend.l1.get("global:a", collection_name="tiered") == b"value"
+        # The L1 copy outlives a change made by another node for at most l1_ttl
+        l2.set("global:a", b"changed", collection_name="tiered", ttl=60)
+        assert backend.get("global:a", collection_name="tiered") == b"value"
+        time.sleep(1.1)
+        assert backend.get("global:a", collection_name="tiered") == b"changed"
+
+    def test_promotion_ends_with_the_l2_entry(self, l2):
+        backend = TieredBackend(l2=l2, l1_ttl=60)
+        l2.set("global:a", b"1", collection_name="tiered", ttl=1)
+        l2.set("global:b", b"2", collection_name="tiered", ttl=1)
+
+        assert backend.get("global:a", collection_name="tiered") == b"1"
+        assert backend.get_many(["global:b"], collection_name="tiered") == {"global:b": b"2"}
+        time.sleep(1.1)
+        # The L1 copies expire with the L2 entries instead of l1_ttl later
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="tiered")
+        assert backend.get_many(["global:b"], collection_name="tiered") == {}
+
+    def test_local_change_during_l2_read_skips_promotion(self, l2):
+        backend = TieredBackend(l2=l2, l1_ttl=60, write_policy="write_around")
+        l2_get_with_ttl = l2.get_with_ttl
+        l2.set("global:a", b"old", collection_name="tiered", ttl=60)
+        l2.set("global:b", b"old", collection_name="tiered", ttl=60)
+
+        def get_with_ttl(key, collection_name):
+            # The key is deleted or overwritten by another thread right after our L2 read
+            found = l2_get_with_ttl(key, collection_name=collection_name)
+            if key == "global:a":
+                backend.delete(key, collection_name=collection_name)
+            else:
+                backend.set(key, b"new", collection_name=collection_name, ttl=60)
+            return found
+
+        l2.get_with_ttl = get_with_ttl
+        assert backend.get("global:a", collection_name="tiered") == b"old"
+        assert backend.get("global:b", collection_name="tiered") == b"old"
+        with pytest.raises(CacheMissError):
+            backend.l1.get("global:a", collection_name="tiered")
+        with pytest.raises(CacheMissError):
+            backend.l1.get("global:b", collection_name="tiered")
+
+        l2.get_with_ttl = l2_get_with_ttl
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="tiered")
+        assert backend.get("global:b", collection_name="tiered") == b"new"
+        assert backend._reads == {} and backend._invalidated == {}
+
+    def test_write_through(self, l2):
+        backend = TieredBackend(l2=l2)
+        backend.set("global:a", b"value", collection_name="tiered", ttl=60)
+        assert l2.get("global:a", collection_name="tiered") == b"value"
+        assert backend.l1.get("global:a", collection_name="tiered") == b"value"
+
+        backend.delete("global:a", collection_name="tiered")
+        with pytest.raises(CacheMissError):
+            backend.get("global:a", collection_name="tiered")
+
+    def test_write_around(self, l2):
+        backend = TieredBackend(l2=l2, write_policy="write_around")
+        backend.l1.set("global:a", b"old", collection_name="tiered", ttl=60)
+        backend.set("global:a", b"value", collection_name="tiered", ttl=60)
+        with pytest.raises(CacheMissError):
+            backend.l1.get("global:a", collection_name="tiered")
+        assert backend.get("global:a", collection_name="tiered") == b"value"
+        assert backend.l1.get("global:a", collection_name="tiered") == b"value"
+
+    def test_batch_operations(self, l2):
+        backend = TieredBackend(l2=l2)
+        backend.set_many({"global:a": b"1", "global:b": b"2"}, ttl=60, collection_name="tiered")
+        l2.set("global:c", b"3", collection_name="tiered", ttl=60)
+
+        found = backend.get_many(["global:a", "global:b", "global:c", "global:x"], collection_name="tiered")
+        assert found == {"global:a": b"1", "global:b": b"2", "global:c": b"3"}
+        assert backend.l1.get("global:c", collection_name="tiered") == b"3"
+
+        backend.delete_many(["global:a", "global:c"], collection_name="tiered")
+        assert backend.get_many(["global:a", "global:c"], collection_name="tiered") == {}
+        assert l2.get_many(["global:a", "global:b"], collection_name="tiered") == {"global:b": b"2"}
+
+    def test_scoped_clear(self, l2):
+        backend = TieredBackend(l2=l2)
+        backend.set("org1::a", b"1", collection_name="tiered", ttl=60)
+        backend.set("org1:user1:a", b"2", collection_name="tiered", ttl=60)
+        backend.set("org2::a", b"3", collection_name="tiered", ttl=60)
+
+        ctx = RequestContext(
+            config={}, user_context=UserContext(root_user={"id": "org1"}, user={"id": "user1"})
+        )
+        backend.clear(collection_name="tiered", context=ctx, scope=CacheScope.ORGANIZATION.value)
+        for tier in (backend.l1, l2):
+            for key in ("org1::a", "org1:user1:a"):
+                with pytest.raises(CacheMissError):
+                    tier.get(key, collection_name="tiered")
+            assert tier.get("org2::a", collection_name="tiered") == b"3"
+
+    def test_invalid_options(self, l2):
+        with pytest.raises(ValueError):
+            TieredBackend(l2=l2, write_policy="write_back")
+        with pytest.raises(ValueError):
+            TieredBackend(l2=l2, l1="disk")
+
+    def test_memoize(self, tmp_path):
+        settings.configure(
+            BACKEND="tiered",
+            BACKEND_OPTIONS={"l2": "disk", "l2_options": {"path": str(tmp_path / "cache.sqlite3")}},
+        )
+        calls = []
+
+        @memoize(scope=CacheScope.GLOBAL.value)
+        def my_function(x):
+            calls.append(x)
+            return x * 2
+
+        try:
+            assert my_function(2) == 4
+            settings.backend.l1.clear(scope=CacheScope.GLOBAL.value)
+            assert my_function(2) == 4
+            assert calls == [2]
+        finally:
+            settings.reset()